@@ -0,0 +1,132 @@
+"""
+生データキャプチャ（受信機が送った bytes と到着時刻の記録）
+- 読み取りスレッドが読んだチャンクごとに monotonic_ns / time_ns と一緒に追記する
+- ファイル形式：先頭にマジック、以降はレコード（<QqI = mono_ns, wall_ns, 長さ）+ データ
+- gzip / lzma 圧縮も可（読み込み時はファイル先頭から自動判別）
+常時動かしても負担にならないよう、1チャンクの書き込みはバッファへのコピーだけにしている。
+異常終了でも記録の末尾（現場の不具合調査でいちばん必要な部分）を失わないよう、
+flush_interval 秒ごと、またはバッファが埋まったらファイルへ書き出す。
+"""
+import gzip
+import io
+import lzma
+import os
+import struct
+import time
+from typing import Iterator, NamedTuple
+
+MAGIC = b'CGPSCAP1'
+_RECORD = struct.Struct('<QqI')
+_BUFFER_SIZE = 64 * 1024
+
+COMPRESSIONS = (None, 'gzip', 'lzma')
+
+
+class CaptureRecord(NamedTuple):
+    mono_ns: int
+    wall_ns: int
+    data: bytes
+
+
+class CaptureWriter:
+    def __init__(self, path, compression=None, flush_interval=1.0, clock=time.monotonic):
+        """
+        path に追記する。既存ファイルなら続きから（圧縮ファイルはメンバー/ストリームを追加）。
+        flush_interval 秒ごとに write() の中で flush() する（None なら close() まで溜める）。
+        """
+        if compression not in COMPRESSIONS:
+            raise ValueError(f"unknown compression: {compression}")
+        self.path = path
+        self.compression = compression
+        self.flush_interval = flush_interval
+        self._clock = clock
+        is_new = not os.path.exists(path) or os.path.getsize(path) == 0
+        self._open()
+        if is_new:
+            self._fh.write(MAGIC)
+        self._last_flush = clock()
+
+    def _open(self):
+        if self.compression == 'gzip':
+            # 圧縮レベルは低めにして CPU 負担を抑える
+            raw = gzip.open(self.path, 'ab', compresslevel=1)
+        elif self.compression == 'lzma':
+            raw = lzma.open(self.path, 'ab', preset=1)
+        else:
+            raw = open(self.path, 'ab', buffering=0)
+        self._raw = raw
+        self._fh = io.BufferedWriter(raw, buffer_size=_BUFFER_SIZE)
+
+    def write(self, data, mono_ns=None, wall_ns=None):
+        """
+        1チャンクを記録する。時刻を省略したら今の時刻。
+        mono_ns（読み取り側の到着時刻）だけ渡されたら、壁時計もその時点まで戻して記録する
+        """
+        fh = self._fh
+        if fh is None:
+            return
+        if wall_ns is None:
+            wall_ns = time.time_ns()
+            if mono_ns is not None:
+                wall_ns -= time.monotonic_ns() - mono_ns
+        if mono_ns is None:
+            mono_ns = time.monotonic_ns()
+        fh.write(_RECORD.pack(mono_ns, wall_ns, len(data)))
+        fh.write(data)
+        if self.flush_interval is not None and self._clock() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self):
+        """溜めた分をファイルへ書き出す（gzip は同期フラッシュ、lzma はストリームを閉じて次を始める）"""
+        if self._fh is None:
+            return
+        self._last_flush = self._clock()
+        if self.compression == 'lzma':
+            # LZMAFile は途中まで読める形で書き出せないので、ストリームを区切る（読み込み側は連結を読める）
+            self._fh.close()
+            self._open()
+            return
+        self._fh.flush()
+        self._raw.flush()
+
+    def close(self):
+        fh, self._fh = self._fh, None
+        if fh is not None:
+            fh.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _open_for_read(path):
+    with open(path, 'rb') as f:
+        head = f.read(6)
+    if head[:2] == b'\x1f\x8b':
+        return gzip.open(path, 'rb')
+    if head == b'\xfd7zXZ\x00':
+        return lzma.open(path, 'rb')
+    return open(path, 'rb')
+
+
+def read_capture(path) -> Iterator[CaptureRecord]:
+    """キャプチャファイルのレコードを順に返す。末尾の書きかけレコードは無視する"""
+    with _open_for_read(path) as fh:
+        if fh.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"not a capture file: {path}")
+        size = _RECORD.size
+        while True:
+            try:
+                head = fh.read(size)
+                if len(head) < size:
+                    return
+                mono_ns, wall_ns, length = _RECORD.unpack(head)
+                data = fh.read(length)
+            except EOFError:
+                # 異常終了で圧縮ストリームが途中で切れている
+                return
+            if len(data) < length:
+                return
+            yield CaptureRecord(mono_ns, wall_ns, data)
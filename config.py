@@ -22,6 +22,20 @@ class Config:
                 'auto_sync': False,
                 'sync_mode': 'none',  # 'none', 'instant', 'interval'
                 'sync_interval_index': 2,  # 0=5分, 1=10分, 2=30分, 3=1時間, 4=6時間
+                'satellite_max_age_sec': 30,  # この秒数報告のない衛星は表から消す
+                'output_rate_hz': 1,  # 受信機の出力レート（5/10/20Hz では秒頭エポックだけで時刻同期）
+                'decimate_updates': True,  # 高レート時、位置・衛星表示の更新も秒頭だけにする
+                'ubx_timing': False,  # u-blox 受信機の UBX 時刻（ns・tAcc付き）で同期する
+                'receiver_profile': '',  # '', 'ublox', 'mtk', 'airoha'（開始時に受信機へ設定を書き込む）
+                'receiver_baud_rate': 115200,  # 設定書き込み後に切り替えるボーレート
+                'gsv_divider': 5,  # GSV は N エポックに1回だけ出力させる
+                'source': 'serial',  # 'serial', 'tcp'（ser2net/gpsd リレーへ接続）, 'udp'（待ち受け）
+                'net_host': '',  # TCP 接続先ホスト
+                'net_port': 10110,  # TCP 接続先 / UDP 待ち受けポート（10110 = NMEA-0183 over IP）
+                # 冗長構成の追加受信機（例: {'name': 'rx2', 'source': 'serial', 'port': 'COM4', 'baud_rate': 9600}）
+                'extra_receivers': [],
+                'capture_path': '',  # 空でなければ受信した生データを時刻付きで追記記録する
+                'capture_compression': '',  # '', 'gzip', 'lzma'
             },
 
             # NTP設定
@@ -16,9 +16,17 @@ import serial
 import time
 from datetime import datetime, timezone, timedelta
 import queue
-from nmea_parser import NMEAParser
+from nmea_parser import _MAX_PARTIAL, NMEAParser, TimeFixEvent
+from ubx_parser import UBXParser, UBXTimeFix
+from nmea_source import cancel_serial_read, epoch_arrival, open_source, read_chunk
+from receiver_merger import ReceiverMerger
+from capture import CaptureWriter
+from reconnect import CONNECTED, LOST, ReconnectingReader
+from port_probe import probe_ports
+from receiver_config import PROFILES as RECEIVER_PROFILES, ReceiverSettings, open_receiver
 from ntp_client import NTPClient
 from time_sync import TimeSynchronizer
+from sync_worker import SyncWorker
 from locales import Localization
 from config import Config
 from tray_icon import TrayIcon
@@ -36,6 +44,9 @@ try:
 except Exception:
     admin = None  # テスト/段階導入用
 
+# gps.ubx_timing 時、有効な UBX 時刻がこの秒数以上届かなければ NMEA の時刻で同期する
+_UBX_STALE_SEC = 3.0
+
 
 def get_resource_path(relative_path):
     """PyInstallerのバンドルリソースへのパスを取得（デバッグ出力なし）"""
@@ -178,12 +189,43 @@ class GPSTimeSyncGUI:
 
         self.root.minsize(820, 650)
 
-        self.parser = NMEAParser()
+        try:
+            sat_max_age = float(self.config.get('gps', 'satellite_max_age_sec') or 30)
+        except (ValueError, TypeError):
+            sat_max_age = 30.0
+        try:
+            output_rate_hz = int(self.config.get('gps', 'output_rate_hz') or 1)
+        except (ValueError, TypeError):
+            output_rate_hz = 1
+        decimate = self.config.get('gps', 'decimate_updates')
+        self.parser = NMEAParser(
+            satellite_max_age=sat_max_age,
+            output_rate_hz=output_rate_hz,
+            decimate_updates=True if decimate is None else bool(decimate),
+        )
+        # UBX 時刻（NAV-PVT / NAV-TIMEUTC）を同期に使う場合は UBX パーサー経由で NMEA も処理する
+        self.ubx = UBXParser(self.parser) if self.config.get('gps', 'ubx_timing') else None
+        self._ubx_last_fix_mono = None  # 最後に有効な UBX 時刻を受けた monotonic 時刻
+        self._gps_time_source = None    # 'UBX' / 'NMEA'（切り替わった時だけログに出す）
         self.ntp_client = NTPClient()
         self.sync = TimeSynchronizer(self.loc)  # localizationを渡す
+        # 時刻設定・ログは専用スレッドで行い、読み取りスレッドは受信時刻の記録と解析だけにする
+        self.sync_worker = SyncWorker(self._apply_gps_sync,
+                                      on_error=lambda e: self.ui_queue.put(('log', f"✗ GPS sync: {e}"))).start()
 
         self.serial_port = None
+        self.net_source = None  # TCP/UDP 入力時のソース（nmea_source）
+        # 追加受信機（冗長構成）：[(名前, ソース, パーサー)]。1台以上あれば merger で統合する
+        self.extra_receivers = []
+        self.merger = None
+        self._merge_lock = threading.Lock()
+        self._last_disagreeing = frozenset()
+        self.capture = None  # 生データキャプチャ（gps.capture_path が設定されている時だけ）
         self.is_running = False
+        self._reader_stop = threading.Event()  # 停止時にバックオフ待ちから即座に抜けるため
+        self._debug_partial = b""
+        self._reopen_primary = None
+        self._close_primary = None
         self.ntp_sync_timer = None
         self.gps_sync_timer = None
         self._gps_next_sync_mono = None  # interval sync: 次回同期期限（monotonic）
@@ -216,7 +258,10 @@ class GPSTimeSyncGUI:
 
         # GPS時刻追従表示用（monotonic で受信時刻を記録）
         self._gps_rx_dt = None   # 最後に受信したGPS時刻（datetime）
-        self._gps_rx_mono = None   # その時の time.monotonic()
+        self._gps_rx_mono = None   # その受信時刻（monotonic 秒。シリアルならエポック先頭バイトの到着時刻）
+
+        # 衛星表示：最後に描画した parser.satellite_version
+        self._sat_view_version = None
 
         # システムトレイ
         self.tray = TrayIcon(
@@ -727,6 +772,8 @@ class GPSTimeSyncGUI:
         # その他ボタン・チェックボックス
         if 'refresh_btn' in self.widgets:
             self.widgets['refresh_btn'].config(text=self.loc.get('refresh') or "Refresh")
+        if 'auto_detect_btn' in self.widgets:
+            self.widgets['auto_detect_btn'].config(text=self.loc.get('auto_detect') or "Auto Detect")
         if 'ntp_auto_check' in self.widgets:
             self.widgets['ntp_auto_check'].config(text=self.loc.get('ntp_auto_sync') or "NTP Auto Sync")
 
@@ -893,6 +940,11 @@ class GPSTimeSyncGUI:
         self.baud_combo.current(1)
         self.baud_combo.grid(row=0, column=4, padx=5)
 
+        auto_detect_btn = ttk.Button(gps_frame, text=self.loc.get('auto_detect') or "Auto Detect",
+                                     command=self._auto_detect_port)
+        auto_detect_btn.grid(row=0, column=5, padx=5)
+        self.widgets['auto_detect_btn'] = auto_detect_btn
+
         # 第2行：GPS同期モード選択
         self.gps_sync_mode_label = ttk.Label(
             gps_frame, text=self.loc.get('gps_sync_mode') or "GPS Sync Mode / GPS同期モード")
@@ -1744,6 +1796,28 @@ class GPSTimeSyncGUI:
                             if not self.ntp_auto_sync_var.get():
                                 messagebox.showerror(self.loc.get('app_title') or "Error", msg)
 
+                elif tag == 'reader_state':
+                    _, state, detail = item
+                    if state == LOST:
+                        self._log(f"⚠ {self.loc.get('gps_port_lost') or 'GPS connection lost, retrying'}: {detail}")
+                    elif state == CONNECTED:
+                        suffix = f": {detail}" if detail else ""
+                        self._log(f"✓ {self.loc.get('gps_port_reconnected') or 'GPS reconnected'}{suffix}")
+
+                elif tag == 'probe_result':
+                    _, result = item
+                    self.widgets['auto_detect_btn'].config(state='normal')
+                    if result is None:
+                        self._log(f"✗ {self.loc.get('auto_detect_failed') or 'No GPS receiver found'}")
+                    else:
+                        ports = list(self.port_combo['values'])
+                        if result.port not in ports:
+                            self.port_combo['values'] = ports + [result.port]
+                        self.port_combo.set(result.port)
+                        self.baud_combo.set(str(result.baud_rate))
+                        self._log(f"✓ {self.loc.get('auto_detect_found') or 'GPS receiver found'}: "
+                                  f"{result.port} @ {result.baud_rate}bps")
+
                 elif tag == 'ntp_error':
                     _, err = item
                     self._log(f"✗ NTP error: {err}")
@@ -1931,6 +2005,21 @@ class GPSTimeSyncGUI:
             except Exception:
                 pass
 
+    def _auto_detect_port(self):
+        """全 COM ポートを並列に試し、NMEA が読めるポートとボーレートを選ぶ"""
+        if self.is_running:
+            return
+        self.widgets['auto_detect_btn'].config(state='disabled')
+
+        def worker():
+            try:
+                result = probe_ports()
+            except Exception:
+                result = None
+            self.ui_queue.put(('probe_result', result))
+
+        threading.Thread(target=worker, daemon=True).start()
+
     def _log(self, message):
         self.log_text.config(state='normal')
         timestamp = datetime.now().strftime("%H:%M:%S")
@@ -1969,52 +2058,47 @@ class GPSTimeSyncGUI:
     def _update_position_info(self):
         """位置情報を更新"""
         if self.is_running:
-            if self.parser.grid_locator:
-                self.grid_value.config(text=self.parser.grid_locator)
+            # reader スレッドが公開した不変スナップショットを1回だけ読む（途中で値が変わらない）
+            snap = self.parser.snapshot
+            if snap.grid_locator:
+                self.grid_value.config(text=snap.grid_locator)
 
-            if self.parser.latitude is not None:
-                lat_str = f"{abs(self.parser.latitude):.6f}° {'N' if self.parser.latitude >= 0 else 'S'}"
+            if snap.latitude is not None:
+                lat_str = f"{abs(snap.latitude):.6f}° {'N' if snap.latitude >= 0 else 'S'}"
                 self.lat_value.config(text=lat_str)
 
-            if self.parser.longitude is not None:
-                lon_str = f"{abs(self.parser.longitude):.6f}° {'E' if self.parser.longitude >= 0 else 'W'}"
+            if snap.longitude is not None:
+                lon_str = f"{abs(snap.longitude):.6f}° {'E' if snap.longitude >= 0 else 'W'}"
                 self.lon_value.config(text=lon_str)
 
-            if self.parser.altitude is not None:
-                alt_str = f"{self.parser.altitude:.1f} m"
+            if snap.altitude is not None:
+                alt_str = f"{snap.altitude:.1f} m"
                 self.alt_value.config(text=alt_str)
 
         self.root.after(1000, self._update_position_info)
 
     def _update_satellite_info(self):
         """衛星情報表示を更新（正確なカウント）"""
-        if self.is_running:
-            by_system = self.parser.get_satellites_by_system()
-
-            # 正確なカウント（SNR閾値を考慮）
-            strong = 0     # SNR >= 20（GNSS主星）
-            weak = 0       # 10 <= SNR < 20（GNSS主星）
-            sbas_used = 0  # SBAS使用中
-            total = 0
-
-            for system, sats in by_system.items():
-                for sat in sats:
-                    total += 1
-                    if sat['in_use']:
-                        if system == 'SBAS':
-                            sbas_used += 1
-                        elif sat['snr'] >= 20:
-                            strong += 1
-                        elif sat['snr'] >= 10:
-                            weak += 1
+        snap = self.parser.snapshot
+        if self.is_running and snap.version != self._sat_view_version:
+            # parser が公開した不変スナップショットを使う（前回から変化がなければ何もしない）
+            self._sat_view_version = snap.version
+            by_system = snap.satellites
+            counts = snap.counts
+
+            strong = counts.strong        # SNR >= 20（GNSS主星）
+            weak = counts.weak            # 10 <= SNR < 20（GNSS主星）
+            sbas_used = counts.sbas_used  # SBAS使用中
+            total = counts.total
 
             in_use = strong + weak
 
             # デバッグ出力
             if self.debug_var.get():
                 print(f"[DEBUG] 衛星数: 使用中={in_use} (強:{strong}, 弱:{weak}), SBAS={sbas_used}, 合計={total}")
-                print(f"[DEBUG] satellites辞書: {len(self.parser.satellites)}個")
-                print(f"[DEBUG] satellites_in_use: {self.parser.satellites_in_use}")
+                print(f"[DEBUG] satellites辞書: {total}個")
+                print(f"[DEBUG] satellites_in_use: {set(snap.satellites_in_use)}")
+                print(f"[DEBUG] sentence stats: {self.parser.get_sentence_stats()}")
 
             # 表示更新（GNSS主星 / SBAS補強を分けて表示）
             if sbas_used > 0:
@@ -2050,12 +2134,12 @@ class GPSTimeSyncGUI:
             tree.delete(item)
 
         for sat in satellites:
-            values = (sat.get('id'), sat.get('snr'), sat.get('elevation'), sat.get('azimuth'))
+            values = (sat.id, sat.snr, sat.elevation, sat.azimuth)
 
-            if sat.get('in_use') and sat.get('snr', 0) >= 20:
+            if sat.in_use and sat.snr >= 20:
                 # 強い信号で使用中（濃い緑）
                 item = tree.insert('', tk.END, values=values, tags=('strong',))
-            elif sat.get('in_use') and sat.get('snr', 0) >= 10:
+            elif sat.in_use and sat.snr >= 10:
                 # 弱い信号で使用中（薄い緑）
                 item = tree.insert('', tk.END, values=values, tags=('weak',))
             else:
@@ -2067,6 +2151,11 @@ class GPSTimeSyncGUI:
         tree.tag_configure('weak', background='#D0F0D0')    # 薄い緑（ペールグリーン）
 
     def _start(self):
+        source = self.config.get('gps', 'source') or 'serial'
+        if source in ('tcp', 'udp'):
+            self._start_network(source)
+            return
+
         port = self.port_combo.get()
         try:
             baud = int(self.baud_combo.get())
@@ -2080,8 +2169,22 @@ class GPSTimeSyncGUI:
             return
 
         try:
-            self.serial_port = serial.Serial(port, baud, timeout=1)
+            self.serial_port, opened_baud, profile = self._open_serial(port, baud)
+            if profile:
+                if str(opened_baud) in self.baud_combo['values']:
+                    self.baud_combo.set(str(opened_baud))
+                self._log(f"{self.loc.get('receiver_configured_log') or 'Receiver configured'}: "
+                          f"{profile} @ {opened_baud}bps")
+
+            # 切断後の再接続は、最初に選んだボーレートで開いて受信機設定からやり直す
+            # （下で baud を書き換えるので、既定引数で今の値を固定する）
+            self._reopen_primary = lambda port=port, baud=baud: setattr(
+                self, 'serial_port', self._open_serial(port, baud)[0])
+            self._close_primary = lambda: self.serial_port.close()
+            baud = opened_baud
+
             self.is_running = True
+            self._reader_stop.clear()
             self.widgets['start_btn'].config(state='disabled')
             self.widgets['stop_btn'].config(state='normal')
             self.widgets['sync_gps_btn'].config(state='normal')
@@ -2094,16 +2197,88 @@ class GPSTimeSyncGUI:
 
             self.gps_thread = threading.Thread(target=self._read_gps, daemon=True)
             self.gps_thread.start()
+            self._open_capture()
+            self._start_extra_receivers()
+
+        except Exception as e:
+            port_err = self.loc.get('port_error') or 'Port error'
+            messagebox.showerror(
+                self.loc.get('app_title') or "Error", f"{port_err}: {e}")
 
+    def _open_serial(self, port, baud):
+        """
+        シリアルポートを開き、受信機プロファイルがあれば設定を書き込む（読み取りスレッドからも呼ぶので UI は触らない）。
+        (ポート, 実際のボーレート, 適用したプロファイル or None) を返す。
+        """
+        # 受信機プロファイルが設定されていれば、不要センテンスを止めてボーレートを上げる
+        profile = self.config.get('gps', 'receiver_profile')
+        if profile not in RECEIVER_PROFILES:
+            ser, baud = open_receiver(port, baud)
+            return ser, baud, None
+        try:
+            new_baud = int(self.config.get('gps', 'receiver_baud_rate') or 115200)
+            gsv_divider = int(self.config.get('gps', 'gsv_divider') or 5)
+        except (ValueError, TypeError):
+            new_baud, gsv_divider = 115200, 5
+        settings = ReceiverSettings(gsv_divider=gsv_divider, baud_rate=new_baud, ubx_timing=self.ubx is not None)
+        ser, baud = open_receiver(port, baud, profile, settings)
+        return ser, baud, profile
+
+    def _start_network(self, source):
+        """ser2net / gpsd リレー等から TCP・UDP で NMEA を受ける"""
+        host = self.config.get('gps', 'net_host') or ''
+        net_port = self.config.get('gps', 'net_port') or 10110
+        try:
+            self.net_source = open_source(source, host, net_port)
         except Exception as e:
             port_err = self.loc.get('port_error') or 'Port error'
             messagebox.showerror(
                 self.loc.get('app_title') or "Error", f"{port_err}: {e}")
+            return
+        self._reopen_primary = lambda: setattr(self, 'net_source', open_source(source, host, net_port))
+        self._close_primary = lambda: self.net_source.close()
+
+        self.is_running = True
+        self._reader_stop.clear()
+        self.widgets['start_btn'].config(state='disabled')
+        self.widgets['stop_btn'].config(state='normal')
+        self.widgets['sync_gps_btn'].config(state='normal')
+
+        if self.gps_sync_mode.get() != 'none':
+            self._log(f"{self.loc.get('gps_started_log') or 'GPS started'}: {source}://{host}:{net_port}")
+
+        if self.gps_sync_mode.get() == 'interval':
+            self._start_gps_interval_sync()
+
+        self.gps_thread = threading.Thread(target=self._read_gps, daemon=True)
+        self.gps_thread.start()
+        self._open_capture()
+        self._start_extra_receivers()
 
     def _stop(self):
         self.is_running = False
+        self._reader_stop.set()
+        # 読み取りの待ちを起こしてからスレッドの終了を少しだけ待ち、その後でポートを閉じる
+        if self.serial_port:
+            cancel_serial_read(self.serial_port)
+        if self.net_source:
+            self.net_source.cancel()
+        for _, source, _ in self.extra_receivers:
+            source.cancel()
+        if getattr(self, "gps_thread", None) and self.gps_thread.is_alive():
+            self.gps_thread.join(timeout=0.5)
         if self.serial_port:
             self.serial_port.close()
+        if self.net_source:
+            self.net_source.close()
+            self.net_source = None
+        for _, source, _ in self.extra_receivers:
+            source.close()
+        self.extra_receivers = []
+        self.merger = None
+        if self.capture:
+            self.capture.close()
+            self.capture = None
 
         self._stop_gps_auto_sync()
 
@@ -2113,91 +2288,241 @@ class GPSTimeSyncGUI:
         self._log(self.loc.get('gps_stopped_log') or "GPS stopped")
 
     def _read_gps(self):
-        last_log_msg = ""
-        last_sync_system_second = None  # 最後に同期したシステム時刻の秒を記録
+        """主受信機の読み取りスレッド。切断したらバックオフしながら開き直す"""
+        self._last_sync_log_msg = ""
+        reader = ReconnectingReader(
+            open_port=self._reopen_primary,
+            read_once=self._read_primary_once,
+            close_port=self._close_primary,
+            on_state=lambda state, detail: self.ui_queue.put(('reader_state', state, detail)),
+            wait=self._reader_stop.wait,
+            on_error=lambda e: self.ui_queue.put(('log', f"⚠ GPS: {type(e).__name__}: {e}")),
+        )
+        reader.run(lambda: self.is_running)
+
+    def _read_primary_once(self):
+        """主受信機から1回分読んで処理する。ポートが失われたら例外のまま呼び出し元へ返す"""
+        # 行単位の readline() ではなく、届いた分をまとめて読み、行への切り出しは parser.feed() に任せる
+        if self.net_source is not None:
+            chunk, rx_mono = self.net_source.read()
+            baud_rate = None
+        else:
+            chunk, rx_mono = read_chunk(self.serial_port)
+            baud_rate = self.serial_port.baudrate
+        if not chunk:
+            return
+        if self.capture is not None:
+            # パイプラインが使うのと同じ到着時刻で記録する（書き出しは CaptureWriter が1秒ごとに行う）
+            self.capture.write(chunk, mono_ns=None if rx_mono is None else int(rx_mono * 1e9))
+        if self.debug_enabled:
+            self._debug_chunk(chunk)
+        self._handle_chunk(chunk, rx_mono, baud_rate)
+
+    def _debug_chunk(self, chunk):
+        """デバッグ出力（GSA, GSV, RMC, GGAメッセージ）。チャンク境界をまたぐ行はつないでから出す"""
+        lines = (self._debug_partial + chunk).split(b'\n')
+        partial = lines.pop()
+        # 改行のない UBX などが続いても溜め込み続けないよう、パーサーと同じ上限で捨てる
+        self._debug_partial = partial if len(partial) <= _MAX_PARTIAL else b''
+        for raw in lines:
+            line = raw.decode('ascii', errors='ignore').strip()
+            if 'GSA' in line:
+                self.ui_queue.put(('log', f"🔍 GSA: {line}"))
+            elif 'GSV' in line:
+                print(f"[DEBUG-GSV] {line}")
+            elif 'RMC' in line:
+                self.ui_queue.put(('log', f"🕐 RMC: {line}"))
+            elif 'GGA' in line:
+                self.ui_queue.put(('log', f"📍 GGA: {line}"))
+
+    def _handle_chunk(self, chunk, rx_mono, baud_rate=None):
+        """
+        チャンクを feed() し、秒頭の時刻イベントだけを同期処理へ回す。
+        rx_mono はチャンク先頭バイトの到着時刻。シリアル（baud_rate あり）の NMEA は、
+        時刻センテンスより前に送られたバイトの分だけ戻してエポック先頭の到着時刻にそろえる
+        """
+        max_burst = 1.0 / self.parser.output_rate_hz
+        if self.ubx is None:
+            for event in self.parser.feed(chunk):
+                if isinstance(event, TimeFixEvent) and event.top_of_second:
+                    self._submit_time('primary', self.parser, event.time, event.ns,
+                                      epoch_arrival(rx_mono, event, baud_rate, max_burst))
+            return
 
-        while self.is_running:
-            try:
-                line = self.serial_port.readline().decode('ascii', errors='ignore').strip()
-                if line:
-                    # デバッグ出力（GSA, GSV, RMC, GGAメッセージ）
-                    if self.debug_enabled:
-                        if 'GSA' in line:
-                            self._log(f"🔍 GSA: {line}")
-                        elif 'GSV' in line:
-                            print(f"[DEBUG-GSV] {line}")
-                        elif 'RMC' in line:
-                            self._log(f"🕐 RMC: {line}")
-                        elif 'GGA' in line:
-                            self._log(f"📍 GGA: {line}")
-
-                    gps_time = self.parser.parse(line)
-                    if gps_time:
-                        self.ui_queue.put(('gps_time', gps_time, time.monotonic()))
-
-                        if self._gps_sync_mode == 'instant':
-                            current_system_second = datetime.now().replace(microsecond=0)
-
-                            if last_sync_system_second == current_system_second:
-                                continue
-
-                            if self.sync.is_admin:
-                                success, msg = self.sync.sync_time(gps_time)
-
-                                if success:
-                                    last_sync_system_second = current_system_second
-
-                                    if "大幅修正" in msg:
-                                        self.ui_queue.put(('log', f"⏰ {msg}"))
-                                        last_log_msg = msg
-                                    elif "微調整" in msg and msg != last_log_msg:
-                                        self.ui_queue.put(('log', f"⏰ {msg}"))
-                                        last_log_msg = msg
-                                    elif "正確" in msg:
-                                        if "正確" not in last_log_msg:
-                                            self.ui_queue.put(('log', f"✓ {msg}"))
-                                        last_log_msg = msg
-                                else:
-                                    self.ui_queue.put(('log',
-                                                       f"✗ {self.loc.get('sync_failed') or 'Sync failed'}: {msg}"))
-                            else:
-                                self.ui_queue.put(('log',
-                                                   f"⚠ {self.loc.get('admin_required') or 'Administrator required'}"))
-                                self._gps_sync_mode = 'none'
-                                self.ui_queue.put(('gps_mode_reset', None))
-
-                        elif self._gps_sync_mode == 'interval':
-                            # 期限が未設定なら今すぐ許可
-                            if self._gps_next_sync_mono is None:
-                                self._gps_next_sync_mono = time.monotonic()
-
-                            if self.sync.is_admin:
-                                # 毎秒サンプルを蓄積（期限に関係なく常時）
-                                self.sync.add_sample(gps_time)
-
-                                # 期限到達時のみ判断・ログ・期限更新
-                                if time.monotonic() >= self._gps_next_sync_mono:
-                                    success, msg = self.sync.sync_time_weak(gps_time, append_sample=False)
-                                    if success:
-                                        self.ui_queue.put(('log', f"⏰ GPS {self.loc.get('sync_success') or 'Sync success'}: {msg}"))
-                                    else:
-                                        self.ui_queue.put(('log',
-                                                           f"✗ GPS {self.loc.get('sync_failed') or 'Sync failed'}: {msg}"))
-
-                                    # 次回期限を更新
-                                    try:
-                                        interval_minutes = [5, 10, 30, 60, 360][self._gps_interval_index]
-                                    except Exception:
-                                        interval_minutes = 30
-                                    self._gps_next_sync_mono = time.monotonic() + interval_minutes * 60.0
-                            else:
-                                self.ui_queue.put(('log',
-                                                   f"⚠ {self.loc.get('admin_required') or 'Administrator required'}"))
-                                self._gps_sync_mode = 'none'
-                                self.ui_queue.put(('gps_mode_reset', None))
+        # UBX 時刻を使う時は、有効な UBX 時刻が届いている間は NMEA 側の時刻を同期に使わない。
+        # NAV-PVT と NAV-TIMEUTC が両方有効でも、秒頭になるのは UBXParser が1秒につき1件だけ
+        for event in self.ubx.feed(chunk):
+            if isinstance(event, UBXTimeFix):
+                if event.valid and event.top_of_second:
+                    self._ubx_last_fix_mono = time.monotonic()
+                    self._set_gps_time_source('UBX')
+                    self._submit_time('primary', self.parser, event.time, event.ns, rx_mono)
+            elif isinstance(event, TimeFixEvent) and event.top_of_second and self._ubx_time_stale():
+                # 受信機が NAV-PVT / NAV-TIMEUTC を出していない（未設定・非 u-blox）間は NMEA で代用する
+                self._set_gps_time_source('NMEA')
+                self._submit_time('primary', self.parser, event.time, event.ns,
+                                  epoch_arrival(rx_mono, event, baud_rate, max_burst))
+
+    def _ubx_time_stale(self):
+        """有効な UBX 時刻が _UBX_STALE_SEC 秒以上届いていないか"""
+        last = self._ubx_last_fix_mono
+        return last is None or time.monotonic() - last > _UBX_STALE_SEC
+
+    def _set_gps_time_source(self, source):
+        """同期に使う時刻の出どころ（UBX / NMEA）が変わったらログに出す"""
+        if source != self._gps_time_source:
+            self._gps_time_source = source
+            self.ui_queue.put(('log', f"🛰 {self.loc.get('gps_time_source_log') or 'GPS time source'}: {source}"))
+
+    def _open_capture(self):
+        """gps.capture_path が設定されていれば、主受信機の生データを追記記録する"""
+        path = self.config.get('gps', 'capture_path')
+        if not path:
+            return
+        try:
+            self.capture = CaptureWriter(path, self.config.get('gps', 'capture_compression') or None)
+            self._log(f"{self.loc.get('capture_started_log') or 'Recording raw data'}: {path}")
+        except Exception as e:
+            self._log(f"❌ Capture: {e}")
 
+    def _start_extra_receivers(self):
+        """gps.extra_receivers の受信機を、それぞれ専用のパーサーとスレッドで開く"""
+        for i, conf in enumerate(self.config.get('gps', 'extra_receivers') or []):
+            name = conf.get('name') or f"rx{i + 2}"
+
+            def open_rx(conf=conf):
+                return open_source(conf.get('source') or 'serial', conf.get('host') or '',
+                                   conf.get('port'), baud_rate=int(conf.get('baud_rate') or 9600))
+            try:
+                source = open_rx()
             except Exception as e:
-                self._log(f"❌ Error: {e}")
+                self._log(f"❌ {name}: {e}")
+                continue
+            # [名前, ソース, パーサー]（再接続でソースを差し替えるので list）
+            entry = [name, source, NMEAParser(output_rate_hz=self.parser.output_rate_hz)]
+            self.extra_receivers.append(entry)
+            threading.Thread(target=self._read_extra_receiver, args=(entry, open_rx), daemon=True).start()
+        if self.extra_receivers:
+            self.merger = ReceiverMerger()
+            self._last_disagreeing = frozenset()
+
+    def _read_extra_receiver(self, entry, open_rx):
+        """追加受信機の読み取りスレッド。時刻は merger へ送るだけで、表示には使わない"""
+        name, _, parser = entry
+
+        def read_once():
+            source = entry[1]
+            chunk, rx_mono = source.read()
+            if not chunk:
+                return
+            for event in parser.feed(chunk):
+                if isinstance(event, TimeFixEvent) and event.top_of_second:
+                    self._submit_time(name, parser, event.time, event.ns,
+                                      epoch_arrival(rx_mono, event, source.baud_rate, 1.0 / parser.output_rate_hz))
+
+        reader = ReconnectingReader(
+            open_port=lambda: entry.__setitem__(1, open_rx()),
+            read_once=read_once,
+            close_port=lambda: entry[1].close(),
+            on_state=lambda state, detail: self.ui_queue.put(
+                ('reader_state', state, f"{name}: {detail}" if detail else name)),
+            wait=self._reader_stop.wait,
+            on_error=lambda e: self.ui_queue.put(('log', f"⚠ {name}: {type(e).__name__}: {e}")),
+        )
+        reader.run(lambda: self.is_running)
+
+    def _submit_time(self, name, parser, gps_time, gps_ns, rx_mono):
+        """受信機1台分の秒頭時刻を受け取り、複数台なら統合してから同期処理へ回す"""
+        if rx_mono is None:
+            rx_mono = time.monotonic()
+        merger = self.merger
+        if merger is None:
+            self._handle_gps_time(gps_time, rx_mono)
+            return
+        # 各受信機のスレッドから呼ばれるので、統合と同期処理をまとめて直列化する
+        with self._merge_lock:
+            merged = merger.add(name, gps_time, gps_ns, rx_mono, quality=len(parser.satellites_in_use))
+            if merger.disagreeing != self._last_disagreeing:
+                self._last_disagreeing = merger.disagreeing
+                if merger.disagreeing:
+                    names = ', '.join(sorted(merger.disagreeing))
+                    self.ui_queue.put(('log', f"⚠ {self.loc.get('receiver_disagree_log') or 'Receiver time disagrees'}: {names}"))
+            if merged is not None:
+                self._handle_gps_time(merged.time, merged.rx_mono)
+
+    def _handle_gps_time(self, gps_time, rx_mono=None):
+        """
+        秒頭エポックの GPS 時刻1件を表示と同期ワーカーへ渡す（_read_gps スレッドから呼ぶ）
+        rx_mono は受信時刻（monotonic 秒）。分からなければ今の時刻
+        """
+        if rx_mono is None:
+            rx_mono = time.monotonic()
+        self.ui_queue.put(('gps_time', gps_time, rx_mono))
+        if self._gps_sync_mode in ('instant', 'interval'):
+            # 待たずに戻る（ワーカーが処理中なら古いサンプルは捨てられ、最新だけが使われる）
+            self.sync_worker.submit(gps_time, rx_mono)
+
+    def _apply_gps_sync(self, sample, now_mono):
+        """
+        同期モードに従って GPS 時刻を適用する（sync_worker のスレッドで呼ばれる）
+        受信から今までの経過分だけ GPS 時刻を進めてから比較・設定する
+        """
+        gps_time = sample.at(now_mono)
+
+        # NMEA/UBX とも秒頭エポックの時刻だけが来るので、GPS 1秒につき最大1回だけここに来る
+        if self._gps_sync_mode == 'instant':
+            if self.sync.is_admin:
+                success, msg = self.sync.sync_time(gps_time)
+
+                if success:
+                    if "大幅修正" in msg:
+                        self.ui_queue.put(('log', f"⏰ {msg}"))
+                        self._last_sync_log_msg = msg
+                    elif "微調整" in msg and msg != self._last_sync_log_msg:
+                        self.ui_queue.put(('log', f"⏰ {msg}"))
+                        self._last_sync_log_msg = msg
+                    elif "正確" in msg:
+                        if "正確" not in self._last_sync_log_msg:
+                            self.ui_queue.put(('log', f"✓ {msg}"))
+                        self._last_sync_log_msg = msg
+                else:
+                    self.ui_queue.put(('log',
+                                       f"✗ {self.loc.get('sync_failed') or 'Sync failed'}: {msg}"))
+            else:
+                self.ui_queue.put(('log',
+                                   f"⚠ {self.loc.get('admin_required') or 'Administrator required'}"))
+                self._gps_sync_mode = 'none'
+                self.ui_queue.put(('gps_mode_reset', None))
+
+        elif self._gps_sync_mode == 'interval':
+            # 期限が未設定なら今すぐ許可
+            if self._gps_next_sync_mono is None:
+                self._gps_next_sync_mono = now_mono
+
+            if self.sync.is_admin:
+                # 毎秒サンプルを蓄積（期限に関係なく常時）
+                self.sync.add_sample(gps_time)
+
+                # 期限到達時のみ判断・ログ・期限更新
+                if now_mono >= self._gps_next_sync_mono:
+                    success, msg = self.sync.sync_time_weak(gps_time, append_sample=False)
+                    if success:
+                        self.ui_queue.put(('log', f"⏰ GPS {self.loc.get('sync_success') or 'Sync success'}: {msg}"))
+                    else:
+                        self.ui_queue.put(('log',
+                                           f"✗ GPS {self.loc.get('sync_failed') or 'Sync failed'}: {msg}"))
+
+                    # 次回期限を更新
+                    try:
+                        interval_minutes = [5, 10, 30, 60, 360][self._gps_interval_index]
+                    except Exception:
+                        interval_minutes = 30
+                    self._gps_next_sync_mono = now_mono + interval_minutes * 60.0
+            else:
+                self.ui_queue.put(('log',
+                                   f"⚠ {self.loc.get('admin_required') or 'Administrator required'}"))
+                self._gps_sync_mode = 'none'
+                self.ui_queue.put(('gps_mode_reset', None))
 
     def _sync_gps(self):
         if not self.parser.last_time:
@@ -2398,6 +2723,8 @@ class GPSTimeSyncGUI:
                 pass
             self._ui_queue_timer_id = None
 
+        self.sync_worker.stop()
+
         # システムトレイ停止
         self.tray.stop()
 
@@ -84,6 +84,15 @@ class Localization:
                 'ft8_quick_adjust_label': 'クイック調整:',  # 表示用キーが必要なら分けておく
                 'ft8_note': '※ 0.1秒刻みで調整可能。正の値で時計を進める、負の値で時計を遅らせる',
                 'refresh': '更新',
+                'receiver_disagree_log': '受信機の時刻が一致しません',
+                'capture_started_log': '生データを記録中',
+                'receiver_configured_log': '受信機を設定しました',
+                'gps_port_lost': 'GPS接続が切れました。再接続中',
+                'gps_port_reconnected': 'GPSに再接続しました',
+                'auto_detect': '自動検出',
+                'auto_detect_found': 'GPS受信機を検出',
+                'auto_detect_failed': 'GPS受信機が見つかりません',
+                'gps_time_source_log': 'GPS同期の時刻源',
                 'summary': 'サマリー',
                 'log': 'ログ',
                 'gps_started': 'GPS受信を開始しました',
@@ -209,6 +218,15 @@ class Localization:
                 'ft8_quick_adjust': 'Quick Adjust',
                 'ft8_current_offset': 'Current Offset',
                 'refresh': 'Refresh',
+                'receiver_disagree_log': 'Receiver time disagrees',
+                'capture_started_log': 'Recording raw data',
+                'receiver_configured_log': 'Receiver configured',
+                'gps_port_lost': 'GPS connection lost, retrying',
+                'gps_port_reconnected': 'GPS reconnected',
+                'auto_detect': 'Auto Detect',
+                'auto_detect_found': 'GPS receiver found',
+                'auto_detect_failed': 'No GPS receiver found',
+                'gps_time_source_log': 'GPS time source',
                 'summary': 'Summary',
                 'options_tab': 'Options',
                 'log': 'Log',
@@ -341,6 +359,15 @@ class Localization:
                 'ft8_quick_adjust': 'Ajustement rapide',
                 'ft8_current_offset': 'Décalage actuel',
                 'refresh': 'Actualiser',
+                'receiver_disagree_log': "Désaccord d'heure entre récepteurs",
+                'capture_started_log': 'Enregistrement des données brutes',
+                'receiver_configured_log': 'Récepteur configuré',
+                'gps_port_lost': 'Connexion GPS perdue, nouvelle tentative',
+                'gps_port_reconnected': 'GPS reconnecté',
+                'auto_detect': 'Détection auto',
+                'auto_detect_found': 'Récepteur GPS trouvé',
+                'auto_detect_failed': 'Aucun récepteur GPS trouvé',
+                'gps_time_source_log': "Source de l'heure GPS",
                 'summary': 'Résumé',
                 'options_tab': 'Options',
                 'log': 'Journal',
@@ -469,6 +496,15 @@ class Localization:
                 'ft8_quick_adjust': 'Ajuste rápido',
                 'ft8_current_offset': 'Desplazamiento actual',
                 'refresh': 'Actualizar',
+                'receiver_disagree_log': 'La hora del receptor no coincide',
+                'capture_started_log': 'Grabando datos sin procesar',
+                'receiver_configured_log': 'Receptor configurado',
+                'gps_port_lost': 'Conexión GPS perdida, reintentando',
+                'gps_port_reconnected': 'GPS reconectado',
+                'auto_detect': 'Detección automática',
+                'auto_detect_found': 'Receptor GPS encontrado',
+                'auto_detect_failed': 'No se encontró ningún receptor GPS',
+                'gps_time_source_log': 'Fuente de hora GPS',
                 'summary': 'Resumen',
                 'options_tab': 'Opciones',
                 'log': 'Registro',
@@ -597,6 +633,15 @@ class Localization:
                 'ft8_quick_adjust': 'Schnellanpassung',
                 'ft8_current_offset': 'Aktueller Versatz',
                 'refresh': 'Aktualisieren',
+                'receiver_disagree_log': 'Empfängerzeit weicht ab',
+                'capture_started_log': 'Rohdaten werden aufgezeichnet',
+                'receiver_configured_log': 'Empfänger konfiguriert',
+                'gps_port_lost': 'GPS-Verbindung verloren, neuer Versuch',
+                'gps_port_reconnected': 'GPS wieder verbunden',
+                'auto_detect': 'Automatisch erkennen',
+                'auto_detect_found': 'GPS-Empfänger gefunden',
+                'auto_detect_failed': 'Kein GPS-Empfänger gefunden',
+                'gps_time_source_log': 'GPS-Zeitquelle',
                 'summary': 'Zusammenfassung',
                 'options_tab': 'Optionen',
                 'log': 'Protokoll',
@@ -725,6 +770,15 @@ class Localization:
                 'ft8_quick_adjust': '快速调整',
                 'ft8_current_offset': '当前偏移',
                 'refresh': '刷新',
+                'receiver_disagree_log': '接收机时间不一致',
+                'capture_started_log': '正在记录原始数据',
+                'receiver_configured_log': '接收机已配置',
+                'gps_port_lost': 'GPS连接中断，正在重试',
+                'gps_port_reconnected': 'GPS已重新连接',
+                'auto_detect': '自动检测',
+                'auto_detect_found': '已找到GPS接收机',
+                'auto_detect_failed': '未找到GPS接收机',
+                'gps_time_source_log': 'GPS 时间源',
                 'summary': '摘要',
                 'options_tab': '选项',
                 'log': '日志',
@@ -853,6 +907,15 @@ class Localization:
                 'ft8_quick_adjust': '快速調整',
                 'ft8_current_offset': '目前偏移',
                 'refresh': '重新整理',
+                'receiver_disagree_log': '接收器時間不一致',
+                'capture_started_log': '正在記錄原始資料',
+                'receiver_configured_log': '接收器已設定',
+                'gps_port_lost': 'GPS連線中斷，正在重試',
+                'gps_port_reconnected': 'GPS已重新連線',
+                'auto_detect': '自動偵測',
+                'auto_detect_found': '已找到GPS接收器',
+                'auto_detect_failed': '找不到GPS接收器',
+                'gps_time_source_log': 'GPS 時間來源',
                 'summary': '摘要',
                 'options_tab': '選項',
                 'log': '記錄',
@@ -981,6 +1044,15 @@ class Localization:
                 'ft8_quick_adjust': '빠른 조정',
                 'ft8_current_offset': '현재 오프셋',
                 'refresh': '새로 고침',
+                'receiver_disagree_log': '수신기 시각 불일치',
+                'capture_started_log': '원시 데이터 기록 중',
+                'receiver_configured_log': '수신기 설정 완료',
+                'gps_port_lost': 'GPS 연결 끊김, 재시도 중',
+                'gps_port_reconnected': 'GPS 재연결됨',
+                'auto_detect': '자동 감지',
+                'auto_detect_found': 'GPS 수신기 발견',
+                'auto_detect_failed': 'GPS 수신기를 찾을 수 없습니다',
+                'gps_time_source_log': 'GPS 시간 소스',
                 'summary': '요약',
                 'options_tab': '옵션',
                 'log': '로그',
@@ -1049,6 +1121,15 @@ class Localization:
                 'com_port': 'Porta COM',
                 'baud_rate': 'Taxa de Transmissao',
                 'refresh': 'Atualizar',
+                'receiver_disagree_log': 'Hora do receptor diverge',
+                'capture_started_log': 'Gravando dados brutos',
+                'receiver_configured_log': 'Receptor configurado',
+                'gps_port_lost': 'Conexão GPS perdida, tentando novamente',
+                'gps_port_reconnected': 'GPS reconectado',
+                'auto_detect': 'Detecção automática',
+                'auto_detect_found': 'Receptor GPS encontrado',
+                'auto_detect_failed': 'Nenhum receptor GPS encontrado',
+                'gps_time_source_log': 'Fonte de hora GPS',
                 'ntp_server': 'Servidor NTP',
                 'ntp_auto_sync': 'Sincronizacao Automatica NTP',
                 'sync_interval': 'Intervalo de Sincronizacao',
@@ -1226,6 +1307,15 @@ class Localization:
                 'ft8_quick_adjust': 'Regolazione rapida',
                 'ft8_current_offset': 'Offset corrente',
                 'refresh': 'Aggiorna',
+                'receiver_disagree_log': 'Orario del ricevitore discordante',
+                'capture_started_log': 'Registrazione dati grezzi',
+                'receiver_configured_log': 'Ricevitore configurato',
+                'gps_port_lost': 'Connessione GPS persa, nuovo tentativo',
+                'gps_port_reconnected': 'GPS riconnesso',
+                'auto_detect': 'Rilevamento automatico',
+                'auto_detect_found': 'Ricevitore GPS trovato',
+                'auto_detect_failed': 'Nessun ricevitore GPS trovato',
+                'gps_time_source_log': 'Sorgente ora GPS',
                 'summary': 'Riepilogo',
                 'options_tab': 'Opzioni',
                 'log': 'Registro',
@@ -1354,6 +1444,15 @@ class Localization:
                 'ft8_quick_adjust': 'Snelle aanpassing',
                 'ft8_current_offset': 'Huidige offset',
                 'refresh': 'Vernieuwen',
+                'receiver_disagree_log': 'Ontvangertijd wijkt af',
+                'capture_started_log': 'Ruwe gegevens worden opgenomen',
+                'receiver_configured_log': 'Ontvanger geconfigureerd',
+                'gps_port_lost': 'GPS-verbinding verbroken, opnieuw proberen',
+                'gps_port_reconnected': 'GPS opnieuw verbonden',
+                'auto_detect': 'Automatisch detecteren',
+                'auto_detect_found': 'GPS-ontvanger gevonden',
+                'auto_detect_failed': 'Geen GPS-ontvanger gevonden',
+                'gps_time_source_log': 'GPS-tijdbron',
                 'summary': 'Samenvatting',
                 'options_tab': 'Opties',
                 'log': 'Logboek',
@@ -1482,6 +1581,15 @@ class Localization:
                 'ft8_quick_adjust': 'Быстрая настройка',
                 'ft8_current_offset': 'Текущее смещение',
                 'refresh': 'Обновить',
+                'receiver_disagree_log': 'Время приёмника расходится',
+                'capture_started_log': 'Запись необработанных данных',
+                'receiver_configured_log': 'Приёмник настроен',
+                'gps_port_lost': 'Соединение с GPS потеряно, повторная попытка',
+                'gps_port_reconnected': 'GPS переподключён',
+                'auto_detect': 'Автопоиск',
+                'auto_detect_found': 'GPS-приёмник найден',
+                'auto_detect_failed': 'GPS-приёмник не найден',
+                'gps_time_source_log': 'Источник времени GPS',
                 'summary': 'Сводка',
                 'options_tab': 'Опции',
                 'log': 'Журнал',
@@ -1609,6 +1717,15 @@ class Localization:
                 'ft8_quick_adjust': 'Szybka regulacja',
                 'ft8_current_offset': 'Bieżące przesunięcie',
                 'refresh': 'Odśwież',
+                'receiver_disagree_log': 'Niezgodny czas odbiornika',
+                'capture_started_log': 'Zapisywanie surowych danych',
+                'receiver_configured_log': 'Odbiornik skonfigurowany',
+                'gps_port_lost': 'Utracono połączenie GPS, ponawianie',
+                'gps_port_reconnected': 'Ponownie połączono z GPS',
+                'auto_detect': 'Wykryj automatycznie',
+                'auto_detect_found': 'Znaleziono odbiornik GPS',
+                'auto_detect_failed': 'Nie znaleziono odbiornika GPS',
+                'gps_time_source_log': 'Źródło czasu GPS',
                 'summary': 'Podsumowanie',
                 'options_tab': 'Opcje',
                 'log': 'Dziennik',
@@ -1737,6 +1854,15 @@ class Localization:
                 'ft8_quick_adjust': 'Hızlı Ayar',
                 'ft8_current_offset': 'Geçerli Kayma',
                 'refresh': 'Yenile',
+                'receiver_disagree_log': 'Alıcı saati uyuşmuyor',
+                'capture_started_log': 'Ham veri kaydediliyor',
+                'receiver_configured_log': 'Alıcı yapılandırıldı',
+                'gps_port_lost': 'GPS bağlantısı koptu, yeniden deneniyor',
+                'gps_port_reconnected': 'GPS yeniden bağlandı',
+                'auto_detect': 'Otomatik algıla',
+                'auto_detect_found': 'GPS alıcısı bulundu',
+                'auto_detect_failed': 'GPS alıcısı bulunamadı',
+                'gps_time_source_log': 'GPS zaman kaynağı',
                 'summary': 'Özet',
                 'options_tab': 'Seçenekler',
                 'log': 'Günlük',
@@ -1864,6 +1990,15 @@ class Localization:
                 'ft8_quick_adjust': 'Snabbjustering',
                 'ft8_current_offset': 'Aktuell offset',
                 'refresh': 'Uppdatera',
+                'receiver_disagree_log': 'Mottagarens tid avviker',
+                'capture_started_log': 'Spelar in rådata',
+                'receiver_configured_log': 'Mottagaren konfigurerad',
+                'gps_port_lost': 'GPS-anslutningen bröts, försöker igen',
+                'gps_port_reconnected': 'GPS återansluten',
+                'auto_detect': 'Identifiera automatiskt',
+                'auto_detect_found': 'GPS-mottagare hittad',
+                'auto_detect_failed': 'Ingen GPS-mottagare hittades',
+                'gps_time_source_log': 'GPS-tidskälla',
                 'summary': 'Sammanfattning',
                 'options_tab': 'Alternativ',
                 'log': 'Logg',
@@ -1992,6 +2127,15 @@ class Localization:
                 'ft8_quick_adjust': 'Penyesuaian Cepat',
                 'ft8_current_offset': 'Ofset Saat Ini',
                 'refresh': 'Perbarui',
+                'receiver_disagree_log': 'Waktu penerima tidak cocok',
+                'capture_started_log': 'Merekam data mentah',
+                'receiver_configured_log': 'Penerima dikonfigurasi',
+                'gps_port_lost': 'Koneksi GPS terputus, mencoba lagi',
+                'gps_port_reconnected': 'GPS tersambung kembali',
+                'auto_detect': 'Deteksi otomatis',
+                'auto_detect_found': 'Penerima GPS ditemukan',
+                'auto_detect_failed': 'Penerima GPS tidak ditemukan',
+                'gps_time_source_log': 'Sumber waktu GPS',
                 'summary': 'Ringkasan',
                 'options_tab': 'Opsi',
                 'log': 'Log',
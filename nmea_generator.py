@@ -0,0 +1,338 @@
+"""
+合成 NMEA ストリーム生成器（負荷試験・回帰試験用）
+- RMC / GGA / GSA / GSV / ZDA を、系統・衛星数・出力レート（1〜20Hz）を指定して生成する
+- 2周波（NMEA 4.10 の signal ID 付き GSV）、チェックサム誤り・途中切れ・時刻オフセットを注入できる
+- 使い方は3通り
+  - NMEAGenerator(...).epochs() / iter(NMEAGenerator(...)) : Python のイテレータ
+  - PseudoSerial : ボーレートで転送速度を制限した serial.Serial 互換の疑似ポート
+  - NMEATCPServer : ループバックで NMEA を流す TCP サーバー（TCPSource の相手）
+"""
+import random
+import socket
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Iterator, Tuple
+
+from nmea_parser import nmea_checksum
+
+_NS_PER_SEC = 1_000_000_000
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+# talker → (NMEA system ID, PRN の開始番号, 2周波時の signal ID ペア)
+_CONSTELLATIONS = {
+    'GP': ('1', 1, ('1', '8')),     # L1 C/A, L5 Q
+    'GL': ('2', 65, ('1', '3')),    # G1 C/A, G2 C/A
+    'GA': ('3', 1, ('7', '1')),     # E1, E5a
+    'GB': ('4', 1, ('1', '5')),     # B1I, B2a
+    'GQ': ('5', 1, ('1', '8')),     # L1 C/A, L5 Q
+}
+
+
+@dataclass
+class GeneratorConfig:
+    start: datetime = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    rate_hz: int = 1
+    # talker → 可視衛星数
+    constellations: dict = field(default_factory=lambda: {'GP': 10, 'GL': 6, 'GA': 6, 'GB': 6})
+    dual_band: bool = False
+    latitude: float = 35.681236
+    longitude: float = 139.767125
+    altitude: float = 40.0
+    zda: bool = True
+    # 1センテンスあたりの注入確率
+    checksum_error_rate: float = 0.0
+    truncation_rate: float = 0.0
+    # センテンス上の時刻を真の時刻からずらす（秒）
+    clock_offset: float = 0.0
+    seed: int = 0
+
+
+def sentence(body):
+    """'$' と '*' の間の文字列から、チェックサム付きの1行（bytes）を作る"""
+    raw = body.encode('ascii')
+    return b'$' + raw + b'*%02X\r\n' % nmea_checksum(raw)
+
+
+def _coord(value, width):
+    """度 → NMEA の dddmm.mmmm"""
+    value = abs(value)
+    deg = int(value)
+    return f"{deg:0{width}d}{(value - deg) * 60:07.4f}"
+
+
+class NMEAGenerator:
+    def __init__(self, config=None, **overrides):
+        self.config = config or GeneratorConfig(**overrides)
+        cfg = self.config
+        self._rng = random.Random(cfg.seed)
+        self.rate_hz = max(1, min(20, int(cfg.rate_hz)))
+        # 衛星ごとの (talker, prn, 仰角, 方位角, SNR) — 時間とともにゆっくり動かす
+        self.satellites = []
+        for talker, count in cfg.constellations.items():
+            _, first, _ = _CONSTELLATIONS[talker]
+            for i in range(count):
+                self.satellites.append([talker, first + i, self._rng.randint(5, 85),
+                                        self._rng.randint(0, 359), self._rng.randint(15, 48)])
+        self.talker = 'GN' if len(cfg.constellations) > 1 else next(iter(cfg.constellations), 'GP')
+
+    def __iter__(self):
+        for _, data in self.epochs():
+            yield data
+
+    def epochs(self, count=None) -> Iterator[Tuple[int, bytes]]:
+        """
+        (真のエポック時刻 ns, そのエポックの全センテンス bytes) を順に返す。
+        count を省略すると無限に続く。
+        """
+        cfg = self.config
+        start_ns = int((cfg.start - _EPOCH) / timedelta(microseconds=1)) * 1000
+        step_ns = _NS_PER_SEC // self.rate_hz
+        offset_ns = int(cfg.clock_offset * _NS_PER_SEC)
+        n = 0
+        while count is None or n < count:
+            true_ns = start_ns + n * step_ns
+            yield true_ns, self._epoch(true_ns + offset_ns, n)
+            n += 1
+
+    def _epoch(self, ns, n):
+        cfg = self.config
+        t = _EPOCH + timedelta(microseconds=ns // 1000)
+        hms = f"{t:%H%M%S}.{t.microsecond // 10000:02d}"
+        lat = f"{_coord(cfg.latitude, 2)},{'N' if cfg.latitude >= 0 else 'S'}"
+        lon = f"{_coord(cfg.longitude, 3)},{'E' if cfg.longitude >= 0 else 'W'}"
+        in_use = [s for s in self.satellites if s[2] >= 10 and s[4] >= 20]
+        tk = self.talker
+
+        bodies = [
+            f"{tk}RMC,{hms},A,{lat},{lon},0.02,0.00,{t:%d%m%y},,,A,V",
+            f"{tk}GGA,{hms},{lat},{lon},1,{min(len(in_use), 99):02d},0.8,{cfg.altitude:.1f},M,39.4,M,,",
+        ]
+        # 秒頭エポックだけ衛星情報を出す（実機と同じく高レート時は 1Hz）
+        if n % self.rate_hz == 0:
+            self._drift()
+            bodies.extend(self._gsa(in_use))
+            bodies.extend(self._gsv())
+            if cfg.zda:
+                bodies.append(f"{tk}ZDA,{hms},{t:%d},{t:%m},{t:%Y},00,00")
+        return b''.join(self._damage(sentence(b)) for b in bodies)
+
+    def _drift(self):
+        rng = self._rng
+        for sat in self.satellites:
+            sat[2] = max(0, min(90, sat[2] + rng.choice((-1, 0, 0, 1))))
+            sat[3] = (sat[3] + rng.choice((0, 0, 1))) % 360
+            sat[4] = max(0, min(55, sat[4] + rng.randint(-2, 2)))
+
+    def _gsa(self, in_use):
+        out = []
+        for talker in self.config.constellations:
+            system_id = _CONSTELLATIONS[talker][0]
+            prns = [s[1] for s in in_use if s[0] == talker]
+            for i in range(0, max(len(prns), 1), 12):
+                chunk = [str(p) for p in prns[i:i + 12]]
+                chunk += [''] * (12 - len(chunk))
+                out.append(f"{self.talker}GSA,A,3,{','.join(chunk)},1.4,0.8,1.1,{system_id}")
+        return out
+
+    def _gsv(self):
+        out = []
+        for talker in self.config.constellations:
+            signal_ids = _CONSTELLATIONS[talker][2]
+            sats = [s for s in self.satellites if s[0] == talker]
+            signals = signal_ids if self.config.dual_band else (signal_ids[0],)
+            total = max(1, (len(sats) + 3) // 4)
+            for band, signal in enumerate(signals):
+                for msg in range(total):
+                    group = sats[msg * 4:msg * 4 + 4]
+                    # 2周波目は少し弱めの SNR
+                    fields = ''.join(f",{s[1]:02d},{s[2]:02d},{s[3]:03d},{max(0, s[4] - 3 * band):02d}"
+                                     for s in group)
+                    out.append(f"{talker}GSV,{total},{msg + 1},{len(sats):02d}{fields},{signal}")
+        return out
+
+    def _damage(self, line):
+        cfg = self.config
+        rng = self._rng
+        if cfg.checksum_error_rate and rng.random() < cfg.checksum_error_rate:
+            # チェックサムの下位桁だけ変える
+            last = line[-3:-2]
+            line = line[:-3] + (b'0' if last != b'0' else b'1') + line[-2:]
+        if cfg.truncation_rate and rng.random() < cfg.truncation_rate:
+            # 行末（CRLF を含む）ごと失われた途中切れ
+            line = line[:rng.randint(1, len(line) - 3)]
+        return line
+
+
+class PseudoSerial:
+    """
+    serial.Serial 互換（read / readline / in_waiting / write / cancel_read / close）の疑似ポート。
+    各エポックはその時刻に送信を始め、baudrate/10 バイト毎秒で届く（回線が詰まれば次のエポックは遅れる）。
+    inter_byte_timeout を設定すると、read() はバイトの間隔がそれ以上あいた時点で届いた分を返す。
+    clock / sleep を差し替えれば実時間を待たずに試験できる。
+    """
+
+    def __init__(self, epochs, baudrate=9600, timeout=1.0, clock=time.monotonic, sleep=time.sleep):
+        self._epochs = iter(epochs)
+        self.baudrate = baudrate
+        self.timeout = timeout
+        self._clock = clock
+        self._sleep = sleep
+        self._t0 = clock()
+        self._first_ns = None
+        self._buf = bytearray()
+        self._cur = None          # 送信中のエポック bytes
+        self._cur_start = 0.0     # その送信開始時刻（clock 基準）
+        self._cur_sent = 0
+        self._line_free = self._t0  # 回線が空く時刻
+        self.is_open = True
+        self._cancelled = False
+        self.inter_byte_timeout = None
+        self._last_arrival = self._t0  # 最後に届いたバイトの到着時刻
+        self.reads = 0                 # read() の呼び出し回数（試験用）
+        self.written = bytearray()
+
+    @property
+    def _bytes_per_sec(self):
+        return self.baudrate / 10.0
+
+    def _next_epoch(self):
+        try:
+            ns, data = next(self._epochs)
+        except StopIteration:
+            return False
+        if self._first_ns is None:
+            self._first_ns = ns
+        due = self._t0 + (ns - self._first_ns) / _NS_PER_SEC
+        self._cur = data
+        self._cur_start = max(due, self._line_free)
+        self._cur_sent = 0
+        return True
+
+    def _pump(self):
+        """今の時刻までに届いたバイトを受信バッファへ移し、次のバイトが届く時刻を返す（終端なら None）"""
+        now = self._clock()
+        bps = self._bytes_per_sec
+        while True:
+            if self._cur is None and not self._next_epoch():
+                return None
+            # 次のバイトの到着時刻ちょうどまで sleep した時に切り捨てで取りこぼさないよう、わずかに丸める
+            n = min(len(self._cur), int((now - self._cur_start) * bps + 1e-6)) if now >= self._cur_start else 0
+            if n > self._cur_sent:
+                self._buf += self._cur[self._cur_sent:n]
+                self._cur_sent = n
+                self._last_arrival = self._cur_start + n / bps
+            if n < len(self._cur):
+                return self._cur_start + (self._cur_sent + 1) / bps
+            self._line_free = self._cur_start + len(self._cur) / bps
+            self._cur = None
+
+    @property
+    def in_waiting(self):
+        self._pump()
+        return len(self._buf)
+
+    def _wait(self, done):
+        deadline = None if self.timeout is None else self._clock() + self.timeout
+        self._cancelled = False
+        while self.is_open and not self._cancelled:
+            next_at = self._pump()
+            if done() or next_at is None:
+                return
+            now = self._clock()
+            if deadline is not None and now >= deadline:
+                return
+            # 高ボーレートで1バイトごとに起きないよう最短 0.5ms、cancel_read() に気づけるよう最長 50ms ずつ待つ
+            until = min(max(next_at, now + 0.0005), now + 0.05)
+            if self.inter_byte_timeout is not None and self._buf:
+                until = min(until, max(self._last_arrival + self.inter_byte_timeout, now + 0.0005))
+            if deadline is not None:
+                until = min(until, deadline)
+            self._sleep(max(0.0, until - now))
+
+    def read(self, size=1):
+        self.reads += 1
+        ibt = self.inter_byte_timeout
+        if ibt is None:
+            self._wait(lambda: len(self._buf) >= size)
+        else:
+            self._wait(lambda: len(self._buf) >= size
+                       or (self._buf and self._clock() - self._last_arrival >= ibt))
+        data = bytes(self._buf[:size])
+        del self._buf[:size]
+        return data
+
+    def readline(self):
+        self._wait(lambda: b'\n' in self._buf)
+        end = self._buf.find(b'\n') + 1 or len(self._buf)
+        data = bytes(self._buf[:end])
+        del self._buf[:end]
+        return data
+
+    def write(self, data):
+        self.written += data
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def reset_input_buffer(self):
+        self._pump()
+        self._buf.clear()
+
+    def cancel_read(self):
+        self._cancelled = True
+
+    def close(self):
+        self.is_open = False
+
+
+class NMEATCPServer:
+    """
+    ループバック用 TCP サーバー。接続してきたクライアント1台に epochs を順に送る。
+    realtime=True ならエポック時刻どおりに、False なら続けて送る。送り終えたら切断する。
+    """
+
+    def __init__(self, epochs, host='127.0.0.1', port=0, realtime=True):
+        self._epochs = epochs
+        self._realtime = realtime
+        self._sock = socket.create_server((host, port))
+        self.host, self.port = self._sock.getsockname()[:2]
+        self._thread = threading.Thread(target=self._serve, daemon=True)
+        self.sent = 0
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def _serve(self):
+        try:
+            conn, _ = self._sock.accept()
+        except OSError:
+            return
+        with conn:
+            t0 = time.monotonic()
+            first_ns = None
+            try:
+                for ns, data in self._epochs:
+                    if self._realtime:
+                        if first_ns is None:
+                            first_ns = ns
+                        wait = t0 + (ns - first_ns) / _NS_PER_SEC - time.monotonic()
+                        if wait > 0:
+                            time.sleep(wait)
+                    conn.sendall(data)
+                    self.sent += len(data)
+            except OSError:
+                pass
+        self.close()
+
+    def close(self):
+        try:
+            self._sock.close()
+        except OSError:
+            pass
+
+    def join(self, timeout=None):
+        self._thread.join(timeout)
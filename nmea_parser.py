@@ -2,174 +2,880 @@
 NMEA 0183パーサー（論理再構築版）
 - 10桁高精度グリッドロケーター維持
 - Talker IDを絶対優先し、衛星番号による誤判定を排除
+- bytes のまま受け取り、3文字のセンテンス識別子でハンドラを直接引く
+- フィールド分割の前に *hh チェックサムを検証し、不正フレームを安価に破棄する
+- feed() で任意の bytes チャンクを受け取り、型付きイベントのバッチを返す
+  （TimeFixEvent はチャンク内とエポック先頭からのバイト位置を持ち、受信時刻の補正に使える）
+- GSA/GSV はエポック単位で組み立て、使用中衛星はエポック確定時に丸ごと差し替える
+  （一定時間報告のない衛星は破棄し、長期運用でも表とメモリを一定に保つ）
+- Talker ID / NMEA 4.10 System ID / PRN 範囲は事前計算した表で引き、
+  衛星は (系統, PRN) ごとに信号ID（L1/L5, E1/E5 など）別の SNR を持つ
+- 衛星の系統別ソート済みビューと集計値は差分更新し、変更があった時だけ版番号を進める
+- エポックごとに不変スナップショット（ParserSnapshot）を参照1回の代入で公開する
+  （GUIスレッドはロックもコピーもせずに一貫した値を読める）
+- RMC 時刻は strptime を使わず整数演算で復号し、小数秒（10/20Hz受信機）も保持する
+- センテンスハンドラは識別子ごとの登録制（register_handler）。
+  組み込みで RMC/GGA/GSA/GSV に加え ZDA（4桁年・現地時差）、GNS（複数系統測位）、
+  GST（擬似距離誤差統計）、GBS（RAIM 異常検出）を扱う
+- 高レート受信機（5/10/20Hz）では秒頭のエポックだけを時計合わせ用の時刻として返し、
+  位置・衛星の更新も秒頭だけに間引ける（output_rate_hz / decimate_updates）
+- ハンドラは例外に頼らず長さ・数字・有無を先に検証し、捨てた理由をカウンタに残す
 """
-from datetime import datetime, timezone
+import time
+from bisect import insort
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from types import MappingProxyType
+from typing import NamedTuple, Optional
+
+# XOR 畳み込み用マスク表：_FOLD_MASKS[k] は下位 2**k バイト分のマスク
+_FOLD_MASKS = [(1 << (8 << k)) - 1 for k in range(12)]
+
+# '*hh' の 2桁16進（大文字・小文字）→ 値
+_HEX_PAIR = {f'{i:02X}'.encode('ascii'): i for i in range(256)}
+_HEX_PAIR.update({f'{i:02x}'.encode('ascii'): i for i in range(256)})
+
+
+def nmea_checksum(body):
+    """
+    '$' と '*' の間の bytes の XOR チェックサムを返す。
+    1バイトずつ回す代わりに、整数化して半分ずつ畳み込む（O(log n) 回の演算）。
+    """
+    x = int.from_bytes(body, 'little')
+    k = (len(body) - 1).bit_length()  # 2**k >= len(body)
+    while k:
+        k -= 1
+        mask = _FOLD_MASKS[k] if k < len(_FOLD_MASKS) else (1 << (8 << k)) - 1
+        x = (x >> (8 << k)) ^ (x & mask)
+    return x
+
+
+# system_id → 表示用の系統名（get_satellites_by_system のキー順もこの並び）
+SYSTEM_NAMES = {1: 'GPS', 5: 'SBAS', 2: 'GLONASS', 4: 'BeiDou', 3: 'Galileo', 6: 'QZSS'}
+
+# Talker ID → system_id（GN は複数系統混在のため None：System ID や PRN で判定）
+TALKER_SYSTEMS = {
+    'GP': 1, 'GL': 2, 'GA': 3, 'GB': 4, 'BD': 4, 'GQ': 6, 'QZ': 6, 'GN': None,
+}
+
+# NMEA 4.10 の System ID（GSA 末尾フィールド）→ system_id（5 は QZSS）
+NMEA_SYSTEM_IDS = {'1': 1, '2': 2, '3': 3, '4': 4, '5': 6}
+
+
+def _build_prn_tables():
+    """
+    PRN → system_id の表を作る。
+    - gps:  GPS Talker 内で SBAS（33-64, 120-158）だけを分離する表
+    - mixed: $GN など系統が分からない時に NMEA 拡張番号から推定する表
+    """
+    gps = [1] * 400
+    mixed = [1] * 400
+    for lo, hi, sys_id in ((33, 64, 5), (120, 158, 5)):
+        for prn in range(lo, hi + 1):
+            gps[prn] = sys_id
+            mixed[prn] = sys_id
+    for lo, hi, sys_id in ((65, 96, 2), (193, 199, 6), (201, 263, 4), (301, 336, 3)):
+        for prn in range(lo, hi + 1):
+            mixed[prn] = sys_id
+    return tuple(gps), tuple(mixed)
+
+
+_GPS_PRN_SYSTEM, _MIXED_PRN_SYSTEM = _build_prn_tables()
+
+
+def _system_for_prn(talker_sys, prn):
+    """Talker から決まった system_id と PRN から、最終的な system_id を返す"""
+    if talker_sys is None:
+        return _MIXED_PRN_SYSTEM[prn] if prn < 400 else 1
+    if talker_sys == 1 and prn < 400:
+        return _GPS_PRN_SYSTEM[prn]
+    return talker_sys
+
+
+# 使用中衛星の強弱を分ける SNR 閾値（dB-Hz）
+SNR_STRONG = 20
+SNR_WEAK = 10
+
+_NS_PER_SEC = 1_000_000_000
+_EPOCH_ORDINAL = datetime(1970, 1, 1).toordinal()
+
+# 改行が来ないまま溜め込む最大バイト数（バイナリ混入時の暴走防止）
+_MAX_PARTIAL = 4096
+# 1行の最大長。規格は 82 文字だが、独自拡張で超える受信機もあるので余裕を持たせる。
+# これより長い行はバイナリ混入などの壊れた行として、チェックサム計算の前に捨てる
+_MAX_SENTENCE = 256
+
+
+@dataclass(frozen=True)
+class TimeFixEvent:
+    """
+    新しいGPS時刻を得た（RMC / ZDA）。ns は 1970-01-01 UTC からの整数ナノ秒。
+    top_of_second は秒頭に揃ったエポックか（時計合わせにはこれだけを使う）。
+    offset はこのセンテンスの '$' が feed() に渡したチャンクの何バイト目か（前のチャンクから続く行なら負）、
+    epoch_bytes はエポック先頭のセンテンスからこのセンテンスまでのバイト数。
+    受信時刻をエポック先頭の到着時刻にそろえるのに使う（parse() 単体なら両方 0）。
+    """
+    time: datetime
+    source: str
+    ns: int
+    top_of_second: bool = True
+    offset: int = 0
+    epoch_bytes: int = 0
+
+
+@dataclass(frozen=True)
+class PositionEvent:
+    """位置が更新された（RMC / GGA / GNS）"""
+    latitude: Optional[float]
+    longitude: Optional[float]
+    altitude: Optional[float]
+    grid_locator: Optional[str]
+
+
+@dataclass(frozen=True)
+class ErrorStatsEvent:
+    """GST：擬似距離残差の RMS と位置誤差の標準偏差（m）"""
+    rms: Optional[float]
+    sd_lat: Optional[float]
+    sd_lon: Optional[float]
+    sd_alt: Optional[float]
+
+
+@dataclass(frozen=True)
+class IntegrityEvent:
+    """GBS：RAIM の推定誤差（m）と異常と判定された衛星（なければ None）"""
+    err_lat: Optional[float]
+    err_lon: Optional[float]
+    err_alt: Optional[float]
+    failed_sat: Optional[str]
+    prob_missed: Optional[float]
+    bias: Optional[float]
+    bias_sd: Optional[float]
+
+
+@dataclass(frozen=True)
+class SatelliteEpochEvent:
+    """1エポック分の GSA/GSV がそろった"""
+    in_use: int
+    visible: int
+
+
+@dataclass(frozen=True)
+class SatelliteCounts:
+    """確定済みエポックの衛星集計（strong/weak は SBAS を除く使用中衛星）"""
+    strong: int = 0
+    weak: int = 0
+    sbas_used: int = 0
+    total: int = 0
+
+
+_EMPTY_SATELLITES = MappingProxyType({name: () for name in SYSTEM_NAMES.values()})
+
+
+class SatelliteView(NamedTuple):
+    """スナップショット用の衛星1機分（不変）。signals は (信号ID, SNR) のタプル"""
+    system_id: int
+    id: str
+    prn: int
+    elevation: int
+    azimuth: int
+    snr: int
+    in_use: bool
+    signals: tuple = ()
+
+
+@dataclass(frozen=True)
+class ParserSnapshot:
+    """
+    エポック確定時点の parser 状態（不変）。
+    satellites は 系統名 → prn 順の SatelliteView タプル（読み取り専用マッピング）。
+    """
+    last_time: Optional[datetime] = None
+    last_time_ns: Optional[int] = None
+    latitude: Optional[float] = None
+    longitude: Optional[float] = None
+    altitude: Optional[float] = None
+    grid_locator: Optional[str] = None
+    satellites: MappingProxyType = field(default_factory=lambda: _EMPTY_SATELLITES)
+    satellites_in_use: frozenset = frozenset()
+    counts: SatelliteCounts = SatelliteCounts()
+    version: int = 0
+    error_stats: Optional[ErrorStatsEvent] = None
+    integrity: Optional[IntegrityEvent] = None
+
+
+class Satellite:
+    """
+    衛星1機分のレコード。GSV のたびに作り直さず、同じオブジェクトをその場で更新する。
+    parser 以外からは読み取り専用として扱うこと。
+    """
+    __slots__ = ('system_id', 'id', 'prn', 'elevation', 'azimuth', 'snr', 'in_use', 'last_seen',
+                 'signals', 'signal_epoch')
+
+    def __init__(self, system_id, sat_id):
+        self.system_id = system_id
+        self.id = sat_id          # 表示用（2桁ゼロ埋め文字列）
+        self.prn = int(sat_id)    # 並べ替え用
+        self.elevation = 0
+        self.azimuth = 0
+        self.snr = 0              # 最新エポックで報告された信号のうち最大の SNR
+        self.in_use = False
+        self.last_seen = 0.0
+        # 信号ID（NMEA 4.10 GSV 末尾、旧形式は ''）→ SNR。エポックが変わったら入れ直す
+        self.signals = {}
+        self.signal_epoch = -1
+
+    def __repr__(self):
+        return (f"Satellite(system_id={self.system_id}, id={self.id!r}, elevation={self.elevation}, "
+                f"azimuth={self.azimuth}, snr={self.snr}, in_use={self.in_use})")
+
+
+def _prn_key(sat):
+    return sat.prn
+
+
+def _to_int(s):
+    """'-3' のような整数文字列を int に変換。空・不正なら None（例外を使わない）"""
+    t = s[1:] if s[:1] in ('-', '+') else s
+    if not t.isdigit():
+        return None
+    return int(s)
+
+
+# 月ごとの日数（2月はうるう年で +1）
+_MONTH_DAYS = (0, 31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+
+
+def _days_in_month(year, month):
+    if month == 2 and year % 4 == 0 and (year % 100 != 0 or year % 400 == 0):
+        return 29
+    return _MONTH_DAYS[month]
+
+
+def _parse_coordinate(s, d):
+    """ddmm.mmmm / dddmm.mmmm と N/S/E/W を10進数の度に変換。不正なら None"""
+    dot = s.find('.')
+    if dot < 0:
+        dot = len(s)
+    if dot < 3 or not s[:dot].isdigit() or (dot + 1 < len(s) and not s[dot + 1:].isdigit()):
+        return None
+    dec = int(s[:dot - 2]) + float(s[dot - 2:]) / 60.0
+    return -dec if d in ('S', 'W') else dec
+
+
+def _frac_ns(field):
+    """hhmmss.sss の小数秒をナノ秒で返す（小数部がない・不正なら 0）"""
+    if len(field) > 7 and field[6] == '.':
+        frac = field[7:16]
+        if frac.isdigit():
+            return int(frac) * 10 ** (9 - len(frac))
+    return 0
+
+
+def _to_float(s):
+    """'-12.5' のような10進数文字列を float に変換。空・不正なら None（例外を使わない）"""
+    t = s[1:] if s[:1] in ('-', '+') else s
+    if not t or not t.replace('.', '', 1).isdigit():
+        return None
+    return float(s)
 
 
 class NMEAParser:
-    def __init__(self):
+    # センテンス識別子（Talker IDの後ろ3文字） → (ハンドラ名, 分割するフィールド数)
+    # フィールド数が -1 のものは全フィールドを分割する
+    SENTENCE_TABLE = {
+        b'RMC': ('_parse_rmc', 10),
+        b'GGA': ('_parse_gga', 10),
+        b'GSA': ('_parse_gsa', -1),
+        b'GSV': ('_parse_gsv', -1),
+        b'ZDA': ('_parse_zda', -1),
+        b'GNS': ('_parse_gns', 10),
+        b'GST': ('_parse_gst', -1),
+        b'GBS': ('_parse_gbs', -1),
+    }
+
+    def __init__(self, satellite_max_age=30.0, clock=time.monotonic, output_rate_hz=1, decimate_updates=False):
         self.last_time = None
         self.latitude = None
         self.longitude = None
         self.altitude = None
         self.grid_locator = None
-        # (system_id, sat_id) のセットで管理
+        # (system_id, sat_id) のセットで管理。エポック確定時に丸ごと差し替える
         self.satellites_in_use = set()
-        self.satellites = {}
+        # (system_id, sat_id) → Satellite。外部には読み取り専用ビューだけを見せる
+        self._satellites = {}
+        self.satellites = MappingProxyType(self._satellites)
+        # 系統名 → prn 順に並んだ Satellite のリスト（追加・削除時だけ差分更新）
+        self._views = {name: [] for name in SYSTEM_NAMES.values()}
+        self._views_cache = None
+        self._views_cache_version = -1
+        self.satellite_counts = SatelliteCounts()
+        # 衛星表示に関わる変更があるたびに増える。読み手は前回値と比べて処理を省ける
+        self.satellite_version = 0
+        self._sat_changed = False
+        # 他スレッドからはこれだけを読む。エポックごとに丸ごと差し替える
+        self.snapshot = ParserSnapshot()
+        # この秒数以上 GSV に現れない衛星は表から消す
+        self.satellite_max_age = satellite_max_age
+        self._clock = clock
         self.last_time_update = None
+        self.last_time_ns = None
+        # 受信機の出力レート。2Hz以上では小数秒が半周期未満のエポックだけを秒頭とみなす
+        self.output_rate_hz = max(1, int(output_rate_hz))
+        self._top_window_ns = _NS_PER_SEC // (2 * self.output_rate_hz) if self.output_rate_hz > 1 else _NS_PER_SEC
+        # True なら位置・衛星の更新（イベントとスナップショット）も秒頭エポックだけにする
+        self.decimate_updates = decimate_updates
+        self._epoch_top = True
+        # 日付文字列 → (その日0時のdatetime, エポック秒)。日付が変わるまで再計算しない
+        self._days = {}
+        # 直近の RMC/GGA/GNS が測位中か（ZDA は測位前でも RTC 時刻を出すので、これで守る）
+        self._fix_valid = False
+        # ZDA の現地時差（timedelta）、GST/GBS の最新値
+        self.local_zone_offset = None
+        self.last_error_stats = None
+        self.last_integrity = None
+        # 識別子 → (バインド済みハンドラ, 分割数)。毎回の getattr を避ける
+        self._handlers = {
+            key: (getattr(self, name), maxsplit)
+            for key, (name, maxsplit) in self.SENTENCE_TABLE.items()
+        }
+        # 識別子 → Counter（accepted / bad_checksum / truncated）
+        self._stats = {key: Counter() for key in self.SENTENCE_TABLE}
+        # 解析中のセンテンスのカウンタ（ハンドラが破棄理由を数える先）
+        self._current_stats = Counter()
+
+        # feed() 用：行の途中で切れたチャンクの残り
+        self._partial = b''
+        # feed() で受けた累計バイト数、解析中の行とエポック先頭の行のストリーム上の位置
+        self._fed = 0
+        self._chunk_pos = 0
+        self._line_pos = None
+        self._epoch_pos = None
+        # feed() 実行中だけイベントを集める（parse() 単体利用時は溜めない）
+        self._events = None
+        # エポック境界検出：現在のエポックの時刻フィールドと、GSA/GSV を受けたか
+        self._epoch_tag = None
+        self._epoch_dirty = False
+        # 組み立て中エポックの使用中衛星（GSA）
+        self._pending_in_use = set()
+        self._epoch_seq = 0
+        # エポック最後の衛星センテンス（例 'GLGSV'）を学習し、届いた時点で確定させる
+        self._last_sat_sentence = None
+        self._cycle_ender = None
+        # 現在のエポックで受けた衛星センテンス（同じ識別子が2回来るものは最終センテンスにしない）
+        self._epoch_sat_seen = set()
+
+    def register_handler(self, sentence_id, handler, maxsplit=-1):
+        """
+        センテンス識別子（'TXT' など Talker ID の後ろ3文字）にハンドラを登録する。
+        既存の識別子を渡すと組み込みハンドラを置き換える。
+        handler(parts) はチェックサムを除いたフィールドのリストを受け取り、
+        時刻センテンスなら新しい datetime、それ以外は None を返すこと。
+        maxsplit は必要なフィールド数（-1 で全フィールド）。
+        """
+        key = sentence_id.encode('ascii') if isinstance(sentence_id, str) else bytes(sentence_id)
+        if len(key) != 3:
+            raise ValueError(f"sentence id must be 3 characters: {sentence_id!r}")
+        self._handlers[key] = (handler, maxsplit)
+        self._stats.setdefault(key, Counter())
 
     def parse(self, nmea_sentence):
-        if not nmea_sentence.startswith('$'):
+        """
+        文字列のセンテンスを解析。RMC/ZDA で秒頭エポックの新しい時刻が得られたら datetime を返す
+        （1Hz 受信機では全エポックが秒頭）
+        """
+        return self.parse_bytes(nmea_sentence.encode('ascii', 'replace'))
+
+    def parse_bytes(self, buf):
+        """
+        シリアルから読んだ bytes / memoryview をそのまま解析する。
+        識別子でハンドラを引いてから、対象センテンスだけを検証・デコード・分割する
+        （VTG/GLL/TXT など未対応のセンテンスはデコードすらしない）。
+        """
+        if len(buf) < 6 or buf[0] != 0x24:  # '$'
+            return None
+        key = bytes(buf[3:6])
+        entry = self._handlers.get(key)
+        if entry is None:
             return None
-        parts = nmea_sentence.split(',')
-        msg_type = parts[0]
 
-        if 'RMC' in msg_type:
-            return self._parse_rmc(parts)
-        elif 'GGA' in msg_type:
-            self._parse_gga(parts)
-        elif 'GSA' in msg_type:
-            self._parse_gsa(parts)
-        elif 'GSV' in msg_type:
-            self._parse_gsv(parts, msg_type)
-        return None
+        stats = self._stats[key]
+        if len(buf) > _MAX_SENTENCE:
+            stats['too_long'] += 1
+            return None
+        line = bytes(buf).rstrip()
+        star = line.rfind(b'*', 6)
+        if star < 0 or len(line) < star + 3:
+            stats['truncated'] += 1
+            return None
+        if _HEX_PAIR.get(line[star + 1:]) != nmea_checksum(line[1:star]):
+            stats['bad_checksum'] += 1
+            return None
+        stats['accepted'] += 1
 
-    def _parse_rmc(self, parts):
+        handler, maxsplit = entry
+        self._current_stats = stats
+        return handler(line[:star].decode('ascii', 'replace').split(',', maxsplit))
+
+    def feed(self, chunk):
+        """
+        ポートから読んだ任意長の bytes を受け取り、行に切り出して解析する。
+        行がチャンクをまたいでも次回の feed() でつなぐ。
+        このチャンクで発生したイベントのリストを返す。
+        """
+        # 各行の位置をストリーム上の通算バイト数で追う（TimeFixEvent.offset / epoch_bytes 用）
+        self._chunk_pos = self._fed
+        self._fed += len(chunk)
+        pos = self._chunk_pos - len(self._partial)
+        lines = (self._partial + chunk).split(b'\n')
+        partial = lines.pop()
+        self._partial = partial if len(partial) <= _MAX_PARTIAL else b''
+
+        events = self._events = []
         try:
-            if len(parts) < 10 or parts[2] != 'A':
+            for line in lines:
+                line_pos = pos
+                pos += len(line) + 1
+                if line[:1] != b'$':
+                    # 行頭のゴミ（ノイズや途中から読み始めた断片）を読み飛ばす
+                    start = line.find(b'$')
+                    if start < 0:
+                        continue
+                    line = line[start:]
+                    line_pos += start
+                self._line_pos = line_pos
+                self.parse_bytes(line)
+        finally:
+            self._events = None
+            self._line_pos = None
+        return events
+
+    def _emit(self, event):
+        if self._events is not None:
+            self._events.append(event)
+
+    def _emit_position(self):
+        if self.decimate_updates and not self._epoch_top:
+            return
+        if self._events is not None:
+            self._events.append(PositionEvent(self.latitude, self.longitude, self.altitude, self.grid_locator))
+
+    def _mark_epoch(self, time_field):
+        """RMC/GGA の時刻フィールドが変わったら、前エポックの衛星情報を確定させる"""
+        if time_field == self._epoch_tag:
+            return
+        if self._epoch_dirty:
+            # まだ確定していない＝このエポックの最後の衛星センテンスを学習する
+            # （学習できるものがなければ、これまで通り次の時刻フィールドで確定する）
+            if self._last_sat_sentence is not None:
+                self._cycle_ender = self._last_sat_sentence
+            self._end_epoch()
+        elif self._cycle_ender is None and self._epoch_tag is not None \
+                and (self._epoch_top or not self.decimate_updates):
+            # GSA/GSV を出さない受信機：位置だけのエポックとして公開する
+            self._publish()
+        self._epoch_tag = time_field
+        self._epoch_top = _frac_ns(time_field) < self._top_window_ns
+        self._epoch_sat_seen.clear()
+        self._epoch_pos = self._line_pos
+
+    def _sat_sentence_done(self, sentence):
+        """GSA、または GSV 一式の最終行を受けた。学習済みの最終センテンスならエポック確定"""
+        # GNGSA は系統ごとに1行ずつ来るので、エポック内で繰り返すものは最終センテンスとして学習しない
+        # （GSV を間引いた受信機で、最初の GNGSA がエポックを閉じてしまうのを防ぐ）
+        repeated = sentence in self._epoch_sat_seen
+        self._epoch_sat_seen.add(sentence)
+        self._last_sat_sentence = None if repeated or sentence == 'GNGSA' else sentence
+        if sentence == self._cycle_ender:
+            self._end_epoch()
+
+    def _end_epoch(self):
+        """使用中衛星を差し替え、in_use フラグを付け直し、古い衛星を破棄する"""
+        self._epoch_dirty = False
+        self._epoch_seq += 1
+        in_use = self._pending_in_use
+        self._pending_in_use = set()
+        self.satellites_in_use = in_use
+
+        # in_use の付け直しと同じ1パスで集計も済ませる
+        cutoff = self._clock() - self.satellite_max_age
+        changed = self._sat_changed
+        strong = weak = sbas_used = 0
+        stale = []
+        for key, sat in self._satellites.items():
+            if sat.last_seen < cutoff:
+                stale.append(key)
+                continue
+            used = key in in_use
+            if sat.in_use is not used:
+                sat.in_use = used
+                changed = True
+            if used:
+                if sat.system_id == 5:
+                    sbas_used += 1
+                elif sat.snr >= SNR_STRONG:
+                    strong += 1
+                elif sat.snr >= SNR_WEAK:
+                    weak += 1
+        for key in stale:
+            sat = self._satellites.pop(key)
+            self._views[SYSTEM_NAMES.get(sat.system_id, 'GPS')].remove(sat)
+            changed = True
+
+        if changed:
+            self._sat_changed = False
+            self.satellite_counts = SatelliteCounts(strong, weak, sbas_used, len(self._satellites))
+            self.satellite_version += 1
+
+        if self._epoch_top or not self.decimate_updates:
+            self._publish()
+            self._emit(SatelliteEpochEvent(len(in_use), len(self._satellites)))
+
+    def _publish(self):
+        """現在の状態から ParserSnapshot を作り、参照の差し替えだけで公開する"""
+        prev = self.snapshot
+        if prev.version == self.satellite_version:
+            # 衛星表に変化なし：前回のタプルをそのまま使い回す
+            satellites = prev.satellites
+        else:
+            satellites = MappingProxyType({
+                name: tuple(
+                    SatelliteView(s.system_id, s.id, s.prn, s.elevation, s.azimuth, s.snr, s.in_use,
+                                  tuple(sorted(s.signals.items())))
+                    for s in view
+                )
+                for name, view in self._views.items()
+            })
+        self.snapshot = ParserSnapshot(
+            last_time=self.last_time,
+            last_time_ns=self.last_time_ns,
+            latitude=self.latitude,
+            longitude=self.longitude,
+            altitude=self.altitude,
+            grid_locator=self.grid_locator,
+            satellites=satellites,
+            satellites_in_use=frozenset(self.satellites_in_use),
+            counts=self.satellite_counts,
+            version=self.satellite_version,
+            error_stats=self.last_error_stats,
+            integrity=self.last_integrity,
+        )
+
+    def get_sentence_stats(self):
+        """
+        センテンス種別ごとの受理・破棄カウンタを返す
+        （例: {'RMC': {'accepted': 10, 'bad_checksum': 0, 'truncated': 0, 'no_fix': 2}}）。
+        accepted はチェックサムまで通った数で、その後フィールド検証で捨てた理由も同じ辞書に入る。
+        """
+        result = {}
+        for key, c in self._stats.items():
+            counts = {'accepted': 0, 'bad_checksum': 0, 'truncated': 0}
+            counts.update(c)
+            result[key.decode('ascii')] = counts
+        return result
+
+    def _reject(self, reason):
+        """解析中のセンテンスを捨てた理由を数える"""
+        self._current_stats[reason] += 1
+
+    def _parse_rmc(self, parts):
+        if len(parts) > 1:
+            self._mark_epoch(parts[1])
+        if len(parts) < 10:
+            self._reject('short')
+            return None
+        self._fix_valid = parts[2] == 'A'
+        if not self._fix_valid:
+            self._reject('no_fix')
+            return None
+        date = parts[9]
+        day = self._days.get(date)
+        if day is None:
+            if len(date) != 6 or not date.isdigit():
+                self._reject('bad_date')
                 return None
-            dt = datetime.strptime(parts[9] + parts[1][:6], "%d%m%y%H%M%S").replace(tzinfo=timezone.utc)
-            if self.last_time_update == dt:
+            yy = int(date[4:6])
+            # strptime の %y と同じく 69-99 を 1900年代とみなす
+            day = self._add_day(date, (2000 if yy < 69 else 1900) + yy, int(date[2:4]), int(date[0:2]))
+            if day is None:
                 return None
-            self.last_time = self.last_time_update = dt
-            if parts[3] and parts[5]:
-                self.latitude = self._parse_coordinate(parts[3], parts[4])
-                self.longitude = self._parse_coordinate(parts[5], parts[6])
-                self._calculate_grid_locator()
-            return dt
-        except BaseException:
-            pass
-        return None
+        is_new = self._set_time(parts[1], day)
+        if is_new is None:
+            return None
+        # ZDA が先に同じエポックの時刻を確定していても、位置は RMC から更新する
+        if parts[3] and parts[5] and self._set_position(parts[3], parts[4], parts[5], parts[6]):
+            self._emit_position()
+        return self._time_fix('RMC') if is_new else None
 
-    def _parse_gga(self, parts):
-        try:
-            if len(parts) > 9 and parts[2] and parts[4]:
-                self.latitude = self._parse_coordinate(parts[2], parts[3])
-                self.longitude = self._parse_coordinate(parts[4], parts[5])
-                self._calculate_grid_locator()
-            if len(parts) > 9 and parts[9]:
-                self.altitude = float(parts[9])
-        except BaseException:
-            pass
+    def _time_fix(self, source):
+        """TimeFixEvent を出し、秒頭エポックなら時刻を返す（それ以外は None）"""
+        top = self.last_time_ns % _NS_PER_SEC < self._top_window_ns
+        if self._events is not None:
+            line_pos = self._line_pos
+            epoch_pos = line_pos if self._epoch_pos is None else self._epoch_pos
+            self._events.append(TimeFixEvent(self.last_time, source, self.last_time_ns, top,
+                                             line_pos - self._chunk_pos, line_pos - epoch_pos))
+        return self.last_time if top else None
 
-    def _parse_gsa(self, parts):
-        """使用中の衛星：Talker IDからシステムを厳密に特定"""
-        try:
-            msg_header = parts[0]
-            if '$GP' in msg_header:
-                sys_id = 1
-            elif '$GL' in msg_header:
-                sys_id = 2
-            elif '$GA' in msg_header:
-                sys_id = 3
-            elif '$GB' in msg_header:
-                sys_id = 4
-            elif '$GQ' in msg_header:
-                sys_id = 6
+    def _add_day(self, key, year, month, day):
+        """日付を検証して日付キャッシュに追加し、(datetime, エポック秒) を返す。不正なら None"""
+        if not (1 <= year <= 9999 and 1 <= month <= 12 and 1 <= day <= _days_in_month(year, month)):
+            self._reject('bad_date')
+            return None
+        day_dt = datetime(year, month, day, tzinfo=timezone.utc)
+        if len(self._days) >= 4:
+            self._days.clear()
+        entry = self._days[key] = (day_dt, (day_dt.toordinal() - _EPOCH_ORDINAL) * 86400)
+        return entry
+
+    def _set_time(self, field, day):
+        """
+        時刻フィールドを復号し、同じエポックの重複でなければ last_time を更新する。
+        新しい時刻なら True、同じエポックの重複なら False、不正なら None を返す
+        """
+        decoded = self._decode_utc(field, day)
+        if decoded is None:
+            self._reject('bad_time')
+            return None
+        dt, ns = decoded
+        if self.last_time_update == dt:
+            return False
+        self.last_time = self.last_time_update = dt
+        self.last_time_ns = ns
+        return True
+
+    def _decode_utc(self, field, day):
+        """
+        hhmmss[.s...] を日付 (その日0時のdatetime, エポック秒) と合わせて
+        (datetime, エポックからの整数ns) に変換。
+        小数部は桁数に関わらずナノ秒まで保持する（datetime 側はマイクロ秒まで）。
+        """
+        if len(field) < 6 or not field[:6].isdigit():
+            return None
+        hh = int(field[0:2])
+        mm = int(field[2:4])
+        ss = int(field[4:6])
+        if hh > 23 or mm > 59 or ss > 60:  # 60 はうるう秒
+            return None
+        frac_ns = 0
+        if len(field) > 7 and field[6] == '.':
+            frac = field[7:16]
+            if not frac.isdigit():
+                return None
+            frac_ns = int(frac) * 10 ** (9 - len(frac))
+        sod = hh * 3600 + mm * 60 + ss
+        day_dt, day_sec = day
+        dt = day_dt + timedelta(seconds=sod, microseconds=frac_ns // 1000)
+        return dt, (day_sec + sod) * _NS_PER_SEC + frac_ns
+
+    def _parse_zda(self, parts):
+        """
+        ZDA：hhmmss.ss,dd,mm,yyyy,zh,zm。4桁年なので世紀の推定が不要。
+        多くの受信機でエポックの先頭に来るため、RMC より早く時刻を確定できる。
+        """
+        if len(parts) < 5:
+            self._reject('short')
+            return None
+        self._mark_epoch(parts[1])
+        if len(parts) > 6 and parts[5] and parts[6]:
+            zh = _to_int(parts[5])
+            zm = _to_int(parts[6])
+            if zh is None or zm is None or not (-13 <= zh <= 13 and 0 <= zm <= 59):
+                self._reject('bad_zone')
             else:
-                # $GNの場合は末尾のSystem IDを見る
-                last_field = parts[-1].split('*')[0]
-                sys_id = int(last_field) if last_field.isdigit() else 1
-
-            for i in range(3, 15):
-                if parts[i]:
-                    self.satellites_in_use.add((sys_id, parts[i].zfill(2)))
-        except BaseException:
-            pass
-
-    def _parse_gsv(self, parts, msg_type):
-        """衛星情報：Talker IDが示すシステムを信じ、番号での上書きをしない"""
-        try:
-            if len(parts) < 8:
-                return
-
-            # Talker IDによる絶対判定
-            if '$GP' in msg_type:
-                sys_id = 1    # GPS
-            elif '$GL' in msg_type:
-                sys_id = 2  # GLONASS
-            elif '$GA' in msg_type:
-                sys_id = 3  # Galileo
-            elif '$GB' in msg_type:
-                sys_id = 4  # BeiDou
-            elif '$GQ' in msg_type:
-                sys_id = 6  # QZSS
+                self.local_zone_offset = timedelta(hours=zh, minutes=-zm if zh < 0 else zm)
+        # 測位前の ZDA は受信機 RTC の時刻なので時計合わせには使わない
+        if not self._fix_valid:
+            self._reject('no_fix')
+            return None
+        date = parts[2] + parts[3] + parts[4]
+        day = self._days.get(date)
+        if day is None:
+            if len(parts[2]) != 2 or len(parts[3]) != 2 or len(parts[4]) != 4 or not date.isdigit():
+                self._reject('bad_date')
+                return None
+            day = self._add_day(date, int(parts[4]), int(parts[3]), int(parts[2]))
+            if day is None:
+                return None
+        if not self._set_time(parts[1], day):
+            return None
+        return self._time_fix('ZDA')
+
+    def _parse_gga(self, parts):
+        if len(parts) > 1:
+            self._mark_epoch(parts[1])
+        if len(parts) < 10:
+            self._reject('short')
+            return
+        self._fix_valid = parts[6] not in ('', '0')
+        has_position = parts[2] and parts[4] and self._set_position(parts[2], parts[3], parts[4], parts[5])
+        if parts[9]:
+            altitude = _to_float(parts[9])
+            if altitude is None:
+                self._reject('bad_number')
             else:
-                sys_id = 1  # 不明はGPSへ
-
-            for i in range(4, len(parts) - 3, 4):
-                if not parts[i]:
-                    continue
-                sat_id = parts[i].zfill(2)
-
-                # SBAS（33-64, 120-158）だけはGPS($GP)の中で例外処理
-                current_sys = sys_id
-                sat_num = int(sat_id)
-                if sys_id == 1 and (33 <= sat_num <= 64 or 120 <= sat_num <= 158):
-                    current_sys = 5
-
-                snr_raw = parts[i + 3].split('*')[0]
-                snr = int(snr_raw) if snr_raw and snr_raw.isdigit() else 0
-
-                # (システム, ID) のペアで保存。他国衛星との衝突を完全回避
-                key = (current_sys, sat_id)
-                self.satellites[key] = {
-                    'id': sat_id,
-                    'elevation': int(parts[i + 1]) if parts[i + 1] else 0,
-                    'azimuth': int(parts[i + 2]) if parts[i + 2] else 0,
-                    'snr': snr,
-                    'system_id': current_sys,
-                    'in_use': key in self.satellites_in_use
-                }
-        except BaseException:
-            pass
+                self.altitude = altitude
+        if has_position:
+            self._emit_position()
 
-    def get_satellites_by_system(self):
-        """保存された system_id をそのまま信じて分類"""
-        res = {'GPS': [], 'SBAS': [], 'GLONASS': [], 'BeiDou': [], 'Galileo': [], 'QZSS': []}
-        mapping = {1: 'GPS', 2: 'GLONASS', 3: 'Galileo', 4: 'BeiDou', 5: 'SBAS', 6: 'QZSS'}
+    def _parse_gns(self, parts):
+        """GNS：複数系統の測位。モード文字（系統ごと、N=未測位）のどれかが測位中なら位置を更新"""
+        if len(parts) > 1:
+            self._mark_epoch(parts[1])
+        if len(parts) < 10:
+            self._reject('short')
+            return
+        self._fix_valid = bool(parts[6].strip('N'))
+        if not self._fix_valid:
+            self._reject('no_fix')
+            return
+        if not parts[2] or not parts[4] or not self._set_position(parts[2], parts[3], parts[4], parts[5]):
+            return
+        altitude = _to_float(parts[9])
+        if altitude is not None:
+            self.altitude = altitude
+        self._emit_position()
 
-        for (sys_id, _), info in self.satellites.items():
-            sys_name = mapping.get(info['system_id'], 'GPS')
-            res[sys_name].append(info)
+    def _parse_gst(self, parts):
+        """GST：hhmmss.ss,rms,長軸,短軸,方位,緯度σ,経度σ,高度σ"""
+        if len(parts) < 9:
+            self._reject('short')
+            return
+        self.last_error_stats = ErrorStatsEvent(
+            _to_float(parts[2]), _to_float(parts[6]), _to_float(parts[7]), _to_float(parts[8]))
+        self._emit(self.last_error_stats)
 
-        for s in res:
-            res[s].sort(key=lambda x: int(x['id']))
-        return res
+    def _parse_gbs(self, parts):
+        """GBS：hhmmss.ss,緯度誤差,経度誤差,高度誤差,異常衛星,未検出確率,バイアス,バイアスσ"""
+        if len(parts) < 9:
+            self._reject('short')
+            return
+        self.last_integrity = IntegrityEvent(
+            _to_float(parts[2]), _to_float(parts[3]), _to_float(parts[4]),
+            parts[5] or None, _to_float(parts[6]), _to_float(parts[7]), _to_float(parts[8]))
+        self._emit(self.last_integrity)
+
+    def _parse_gsa(self, parts):
+        """使用中の衛星：System ID（NMEA 4.10）→ Talker ID → PRN の順で系統を特定"""
+        self._epoch_dirty = True
+        if len(parts) < 15:
+            self._reject('short')
+            return
+        talker_sys = TALKER_SYSTEMS.get(parts[0][1:3], 1)
+        if len(parts) > 18 and parts[18] in NMEA_SYSTEM_IDS:
+            talker_sys = NMEA_SYSTEM_IDS[parts[18]]
+
+        for i in range(3, 15):
+            prn = parts[i]
+            if not prn:
+                continue
+            if not prn.isdigit():
+                self._reject('bad_prn')
+                continue
+            sat_id = prn.zfill(2)
+            self._pending_in_use.add((_system_for_prn(talker_sys, int(sat_id)), sat_id))
+        self._sat_sentence_done(parts[0][1:])
+
+    def _parse_gsv(self, parts):
+        """衛星情報：Talker IDが示すシステムを信じ、信号ID別に SNR を持つ"""
+        self._epoch_dirty = True
+        if len(parts) < 8:
+            self._reject('short')
+            return
+        msg_type = parts[0]
+        talker_sys = TALKER_SYSTEMS.get(msg_type[1:3], 1)  # 不明はGPSへ
+
+        # NMEA 4.10：衛星ブロック（4フィールド×n）の後ろに信号IDが1つ付く
+        signal = parts[-1] if (len(parts) - 4) % 4 == 1 else ''
+
+        now = self._clock()
+        epoch = self._epoch_seq
+        for i in range(4, len(parts) - 3, 4):
+            prn = parts[i]
+            if not prn:
+                continue
+            el_raw = parts[i + 1]
+            az_raw = parts[i + 2]
+            snr_raw = parts[i + 3]
+            if not prn.isdigit() or (el_raw and not el_raw.isdigit()) or (az_raw and not az_raw.isdigit()) \
+                    or (snr_raw and not snr_raw.isdigit()):
+                self._reject('bad_number')
+                continue
+            sat_id = prn.zfill(2)
+
+            # SBAS（33-64, 120-158）と $GN の系統は PRN 表で判定
+            current_sys = _system_for_prn(talker_sys, int(sat_id))
+
+            # (システム, ID) のペアで保存。他国衛星との衝突を完全回避
+            key = (current_sys, sat_id)
+            sat = self._satellites.get(key)
+            if sat is None:
+                sat = self._satellites[key] = Satellite(current_sys, sat_id)
+                sat.in_use = key in self.satellites_in_use
+                insort(self._views[SYSTEM_NAMES.get(current_sys, 'GPS')], sat, key=_prn_key)
+                self._sat_changed = True
+            elevation = int(el_raw) if el_raw else 0
+            azimuth = int(az_raw) if az_raw else 0
+
+            # 信号ごとの SNR（L1 と L5 が互いに上書きしない）。代表値は最大値
+            signals = sat.signals
+            signal_snr = int(snr_raw) if snr_raw else 0
+            signal_changed = signals.get(signal) != signal_snr
+            if sat.signal_epoch != epoch:
+                signals.clear()
+                sat.signal_epoch = epoch
+            signals[signal] = signal_snr
+            snr = max(signals.values())
+
+            if signal_changed or sat.snr != snr or sat.elevation != elevation or sat.azimuth != azimuth:
+                sat.elevation = elevation
+                sat.azimuth = azimuth
+                sat.snr = snr
+                self._sat_changed = True
+            sat.last_seen = now
+        if parts[1] == parts[2]:
+            # 2周波受信機は同じ Talker で信号別に GSV 一式を出すので信号IDまで含めて識別
+            self._sat_sentence_done(msg_type[1:] + signal)
+
+    def get_satellites_by_system(self):
+        """
+        系統名 → prn 順の Satellite タプル。
+        差分更新済みのビューを版番号が変わった時（または未確定の変更がある時）だけタプル化し、
+        それ以外はキャッシュを返す。
+        """
+        if self._views_cache_version != self.satellite_version or self._sat_changed:
+            self._views_cache = {name: tuple(view) for name, view in self._views.items()}
+            self._views_cache_version = self.satellite_version
+        return self._views_cache
 
     def get_satellite_count(self):
         return len(self.satellites_in_use), len(self.satellites)
 
-    def _parse_coordinate(self, s, d):
-        try:
-            dot = s.index('.')
-            dec = int(s[:dot - 2]) + float(s[dot - 2:]) / 60.0
-            return -dec if d in ['S', 'W'] else dec
-        except BaseException:
-            return None
+    def _set_position(self, lat, lat_dir, lon, lon_dir):
+        """緯度経度フィールドを検証して位置とグリッドを更新。不正なら数えて False"""
+        latitude = _parse_coordinate(lat, lat_dir)
+        longitude = _parse_coordinate(lon, lon_dir)
+        if latitude is None or longitude is None or not (-90.0 <= latitude <= 90.0) \
+                or not (-180.0 <= longitude <= 180.0):
+            self._reject('bad_coord')
+            return False
+        self.latitude = latitude
+        self.longitude = longitude
+        self._calculate_grid_locator()
+        return True
 
     def _calculate_grid_locator(self):
         """10桁グリッドロケーター"""
         if self.latitude is None or self.longitude is None:
             return
-        try:
-            lon, lat = self.longitude + 180, self.latitude + 90
-            grid = chr(int(lon / 20) + ord('A')) + chr(int(lat / 10) + ord('A'))
-            grid += str(int((lon % 20) / 2)) + str(int(lat % 10))
-            grid += chr(int((lon % 2) / (2 / 24)) + ord('a')) + chr(int((lat % 1) / (1 / 24)) + ord('a'))
-            grid += str(int((lon % (2 / 24)) / (2 / 240))) + str(int((lat % (1 / 24)) / (1 / 240)))
-            grid += chr(int((lon % (2 / 240)) / (2 / 5760)) + ord('a')) + \
-                chr(int((lat % (1 / 240)) / (1 / 5760)) + ord('a'))
-            self.grid_locator = grid.upper()
-        except BaseException:
-            pass
+        # 北極点・日付変更線ちょうどは最終マスに丸める（範囲外の文字を作らない）
+        lon = min(self.longitude + 180, 359.9999999)
+        lat = min(self.latitude + 90, 179.9999999)
+        grid = chr(int(lon / 20) + ord('A')) + chr(int(lat / 10) + ord('A'))
+        grid += str(int((lon % 20) / 2)) + str(int(lat % 10))
+        grid += chr(int((lon % 2) / (2 / 24)) + ord('a')) + chr(int((lat % 1) / (1 / 24)) + ord('a'))
+        grid += str(int((lon % (2 / 24)) / (2 / 240))) + str(int((lat % (1 / 24)) / (1 / 240)))
+        grid += chr(int((lon % (2 / 240)) / (2 / 5760)) + ord('a')) + \
+            chr(int((lat % (1 / 240)) / (1 / 5760)) + ord('a'))
+        self.grid_locator = grid.upper()
@@ -0,0 +1,226 @@
+"""
+NMEA 入力ソース（シリアル / ser2net / gpsd リレー等）
+- SerialSource : シリアルポートから届いた分をまとめて読む（受信時刻は送信時間を差し引いた先頭バイト）
+- TCPSource : TCP クライアントとして接続し、ストリームを読む
+- UDPSource : UDP ポートで待ち受け、データグラムを読む
+read() は (bytes, 受信時刻 monotonic 秒) を返す。baud_rate はシリアルなら通信速度、ネットワークなら None
+（epoch_arrival でエポック先頭の到着時刻を求める時に使う）。
+Linux ではカーネルの受信タイムスタンプ（SO_TIMESTAMPNS）を使い、
+使えない環境では recv 直後の time.monotonic() で代用する。
+"""
+import socket
+import struct
+import sys
+import time
+
+# Python の socket モジュールは定数を公開していないので Linux の値を直接使う
+SO_TIMESTAMPNS = getattr(socket, 'SO_TIMESTAMPNS', 35 if sys.platform.startswith('linux') else None)
+_TIMESPEC = struct.Struct('@ll')
+_BUFSIZE = 4096
+
+
+def _enable_timestamps(sock):
+    """カーネル受信タイムスタンプを有効にする。成功したら True"""
+    if SO_TIMESTAMPNS is None or not hasattr(sock, 'recvmsg'):
+        return False
+    try:
+        sock.setsockopt(socket.SOL_SOCKET, SO_TIMESTAMPNS, 1)
+    except OSError:
+        return False
+    return True
+
+
+def _recv_stamped(sock, stamped):
+    """
+    1回分を受信し (data, rx_mono) を返す。
+    カーネルの時刻は壁時計なので、いまの壁時計との差だけ monotonic を巻き戻して揃える。
+    """
+    if not stamped:
+        data = sock.recv(_BUFSIZE)
+        return data, time.monotonic()
+
+    data, ancdata, _flags, _addr = sock.recvmsg(_BUFSIZE, socket.CMSG_SPACE(_TIMESPEC.size))
+    mono_ns = time.monotonic_ns()
+    wall_ns = time.time_ns()
+    for level, kind, cdata in ancdata:
+        if level == socket.SOL_SOCKET and kind == SO_TIMESTAMPNS and len(cdata) >= _TIMESPEC.size:
+            sec, nsec = _TIMESPEC.unpack_from(cdata)
+            age_ns = wall_ns - (sec * 1_000_000_000 + nsec)
+            # 壁時計が動いた直後などの異常値は使わない
+            if 0 <= age_ns < 1_000_000_000:
+                mono_ns -= age_ns
+            break
+    return data, mono_ns / 1e9
+
+
+def char_time(baud_rate):
+    """1文字（スタート1 + データ8 + ストップ1 ビット）の送信時間（秒）"""
+    return 10.0 / baud_rate if baud_rate else 0.0
+
+
+def first_byte_time(n_bytes, t_first, t_done, baud_rate):
+    """
+    チャンク先頭バイトの到着（送信開始）時刻の推定。
+    t_first は read(1) が戻った時刻、t_done は全部読み終えた時刻。
+    後者から残りのバイトの送信時間を引いたものも含め、どちらも実際より遅い側の推定なので早い方を採り、
+    さらに先頭バイト自身の1文字分を戻す（バッファに溜まっていた分の読み出し遅れを除く）。
+    """
+    ct = char_time(baud_rate)
+    return min(t_first, t_done - (n_bytes - 1) * ct) - ct
+
+
+def burst_gap(baud_rate):
+    """
+    これ以上バイトの間隔があいたらバーストの切れ目とみなす秒数（read_chunk の inter_byte_timeout）。
+    数文字分を基本に、USB シリアル変換の転送間隔（最大 16ms 程度）でバーストを切らないよう下限を設ける
+    """
+    return max(8 * char_time(baud_rate), 0.02)
+
+
+def read_chunk(ser, max_bytes=_BUFSIZE):
+    """
+    serial.Serial から1バースト分を読む。1バイト目が届くまで待ち、その後は inter_byte_timeout
+    （burst_gap）を使って、バイトの間隔があくまで（または max_bytes / timeout まで）まとめて読む。
+    行ごとに readline() するより read の呼び出しがずっと少なく（1エポック 1〜2 回）、
+    別スレッドから cancel_read() すれば待ちから即座に戻る。
+    (data, rx_mono) を返す。rx_mono はチャンク先頭バイトの推定到着時刻（first_byte_time）。
+    タイムアウト・キャンセルなら (b'', None)。
+    """
+    first = ser.read(1)
+    if not first:
+        return b'', None
+    t_first = time.monotonic()
+    baud_rate = getattr(ser, 'baudrate', None)
+    gap = burst_gap(baud_rate)
+    # ポート設定の変更は OS 呼び出しになるので、値が変わった時だけ設定する
+    if getattr(ser, 'inter_byte_timeout', gap) != gap:
+        ser.inter_byte_timeout = gap
+    data = first + ser.read(max_bytes - 1)
+    return data, first_byte_time(len(data), t_first, time.monotonic(), baud_rate)
+
+
+def epoch_arrival(rx_mono, event, baud_rate, max_burst=1.0):
+    """
+    シリアルで受けた TimeFixEvent の、エポック先頭センテンスの到着時刻を求める。
+    rx_mono はそのイベントを含むチャンクの先頭バイトの到着時刻（read_chunk の戻り値）。
+    時刻センテンスの到着 = rx_mono + offset × 1文字時間、そこからエポック先頭までの送信時間を戻す。
+    受信機は秒頭の直後にセンテンス群を続けて送るので、readline/解析の遅れを含まない受信時刻になる。
+    エポック境界を見失った時などに大きく戻しすぎないよう、戻す量は max_burst 秒（1 / 出力レート）までにする。
+    baud_rate が分からない（ネットワーク入力）なら rx_mono をそのまま返す。
+    """
+    ct = char_time(baud_rate)
+    if not ct:
+        return rx_mono
+    return rx_mono + event.offset * ct - min(event.epoch_bytes * ct, max_burst)
+
+
+def cancel_serial_read(ser):
+    """read_chunk() の待ちを別スレッドから解除する（cancel_read のない環境では何もしない）"""
+    cancel = getattr(ser, 'cancel_read', None)
+    if cancel is not None:
+        try:
+            cancel()
+        except Exception:
+            pass
+
+
+class SerialSource:
+    def __init__(self, port, baud_rate=9600, timeout=1.0):
+        import serial
+        self.port = port
+        self.serial = serial.Serial(port, baud_rate, timeout=timeout)
+
+    @property
+    def baud_rate(self):
+        return self.serial.baudrate
+
+    def read(self):
+        """(data, rx_mono) を返す。rx_mono はチャンク先頭バイトの到着時刻。タイムアウトなら (b'', None)"""
+        return read_chunk(self.serial)
+
+    def cancel(self):
+        cancel_serial_read(self.serial)
+
+    def close(self):
+        try:
+            self.serial.close()
+        except Exception:
+            pass
+
+
+class TCPSource:
+    baud_rate = None
+
+    def __init__(self, host, port, timeout=1.0, connect_timeout=5.0):
+        self.host = host
+        self.port = port
+        self.sock = socket.create_connection((host, port), timeout=connect_timeout)
+        self.sock.settimeout(timeout)
+        self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self._stamped = _enable_timestamps(self.sock)
+
+    def read(self):
+        """(data, rx_mono) を返す。タイムアウトなら (b'', None)、切断なら ConnectionError"""
+        try:
+            data, rx_mono = _recv_stamped(self.sock, self._stamped)
+        except socket.timeout:
+            return b'', None
+        if not data:
+            raise ConnectionError(f"connection closed by {self.host}:{self.port}")
+        return data, rx_mono
+
+    def cancel(self):
+        """recv の待ちを別スレッドから解除する"""
+        try:
+            self.sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+
+    def close(self):
+        try:
+            self.sock.close()
+        except OSError:
+            pass
+
+
+class UDPSource:
+    baud_rate = None
+
+    def __init__(self, port, host='', timeout=1.0):
+        self.host = host
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.sock.bind((host, port))
+        self.sock.settimeout(timeout)
+        # port=0 で開いた場合に実際の番号が分かるように
+        self.port = self.sock.getsockname()[1]
+        self._stamped = _enable_timestamps(self.sock)
+
+    def read(self):
+        """(data, rx_mono) を返す。タイムアウトなら (b'', None)"""
+        try:
+            return _recv_stamped(self.sock, self._stamped)
+        except socket.timeout:
+            return b'', None
+
+    def cancel(self):
+        # 未接続の UDP は shutdown で起こせないので、timeout で抜けるのを待つ
+        pass
+
+    def close(self):
+        try:
+            self.sock.close()
+        except OSError:
+            pass
+
+
+def open_source(kind, host, port, timeout=1.0, baud_rate=9600):
+    """設定値 'serial' / 'tcp' / 'udp' からソースを開く（serial の port は COM ポート名）"""
+    if kind == 'serial':
+        return SerialSource(port, baud_rate, timeout=timeout)
+    if kind == 'tcp':
+        return TCPSource(host, int(port), timeout=timeout)
+    if kind == 'udp':
+        # UDP は待ち受けなので host は使わず全インターフェースで受ける
+        return UDPSource(int(port), timeout=timeout)
+    raise ValueError(f"unknown source type: {kind}")
@@ -0,0 +1,136 @@
+"""
+COM ポート / ボーレート自動検出
+- 候補ポートをそれぞれ別スレッドで開き、よく使われるボーレートを順に試す
+- 読めたデータのうち、チェックサムの合う NMEA 行の数で (ポート, ボーレート) を採点する
+- 1Hz の受信機でも1回分のバーストを拾えるよう、無音なら最大 dwell 秒待つ
+- ボーレートが違えば文字化けしたバイトが届くので、ある程度読んで有効行がなければすぐ次へ移る
+"""
+import threading
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+from nmea_parser import nmea_checksum
+
+# よく使われる順（受信機の既定値 → 設定変更後によくある値）
+BAUD_RATES = (9600, 115200, 38400, 4800, 57600, 19200, 230400)
+
+# これだけ有効行が読めたらそのボーレートで確定
+_GOOD_ENOUGH = 3
+# これだけ読んで有効行がなければボーレート違いとみなす
+_GARBAGE_BYTES = 192
+_HEX = b'0123456789ABCDEFabcdef'
+
+
+@dataclass(frozen=True)
+class ProbeResult:
+    port: str
+    baud_rate: int
+    score: int
+
+
+def count_valid_sentences(data):
+    """bytes の中にある、チェックサムが合う NMEA 行の数"""
+    count = 0
+    for line in data.split(b'\n'):
+        start = line.find(b'$')
+        if start < 0:
+            continue
+        star = line.find(b'*', start)
+        if star < 0 or len(line) < star + 3:
+            continue
+        hh = line[star + 1:star + 3]
+        if hh[0] not in _HEX or hh[1] not in _HEX:
+            continue
+        if nmea_checksum(line[start + 1:star]) == int(hh, 16):
+            count += 1
+    return count
+
+
+def probe_port(port, baud_rates=BAUD_RATES, dwell=1.1, opener=None, clock=time.monotonic, stop=None):
+    """
+    1ポートを試し、最良の ProbeResult を返す（NMEA が読めなければ None）。
+    opener はテスト用（既定は serial.Serial）。
+    """
+    if opener is None:
+        import serial
+        opener = serial.Serial
+    try:
+        ser = opener(port, baud_rates[0], timeout=0.05)
+    except Exception:
+        return None
+
+    best = None
+    try:
+        for i, baud in enumerate(baud_rates):
+            if stop is not None and stop.is_set():
+                break
+            if i:
+                ser.baudrate = baud
+            ser.reset_input_buffer()
+            data = b''
+            score = 0
+            deadline = clock() + dwell
+            while clock() < deadline:
+                if stop is not None and stop.is_set():
+                    break
+                chunk = ser.read(max(1, ser.in_waiting))
+                if not chunk:
+                    continue
+                data += chunk
+                score = count_valid_sentences(data)
+                if score >= _GOOD_ENOUGH or (not score and len(data) >= _GARBAGE_BYTES):
+                    break
+            if i == 0 and not data:
+                # 最初のボーレートで何も届かない＝受信機がつながっていない
+                break
+            if score and (best is None or score > best.score):
+                best = ProbeResult(port, baud, score)
+            if score >= _GOOD_ENOUGH:
+                break
+    except Exception:
+        pass
+    finally:
+        try:
+            ser.close()
+        except Exception:
+            pass
+    return best
+
+
+def list_candidate_ports():
+    import serial.tools.list_ports
+    return [p.device for p in serial.tools.list_ports.comports()]
+
+
+def probe_ports(ports=None, baud_rates=BAUD_RATES, dwell=1.1, timeout=3.0, opener=None) -> Optional[ProbeResult]:
+    """
+    全候補ポートを並列に試し、もっとも点数の高い (ポート, ボーレート) を返す。
+    どれかのポートで十分な有効行が読めた時点で、残りのポートの試行は打ち切る。
+    """
+    if ports is None:
+        ports = list_candidate_ports()
+    results = []
+    lock = threading.Lock()
+    stop = threading.Event()
+
+    def worker(port):
+        result = probe_port(port, baud_rates, dwell, opener, stop=stop)
+        if result is not None:
+            with lock:
+                results.append(result)
+            if result.score >= _GOOD_ENOUGH:
+                stop.set()
+
+    threads = [threading.Thread(target=worker, args=(p,), daemon=True) for p in ports]
+    for t in threads:
+        t.start()
+    deadline = time.monotonic() + timeout
+    for t in threads:
+        t.join(max(0.0, deadline - time.monotonic()))
+    stop.set()
+
+    with lock:
+        if not results:
+            return None
+        return max(results, key=lambda r: r.score)
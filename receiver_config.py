@@ -0,0 +1,129 @@
+"""
+受信機設定ライター
+- 開いている serial.Serial へベンダー独自コマンドを送り、不要なセンテンスを止める
+  - u-blox : UBX-CFG-MSG / UBX-CFG-PRT（ubx_timing なら NAV-PVT / NAV-TIMEUTC の出力も有効にする）
+  - MediaTek : PMTK314 / PMTK251
+  - Airoha : PAIR062 / PAIR864
+- GSV はレート分周（N エポックに1回）で間引く
+- 最後にボーレートを上げ、ポート側も同じレートで開き直す
+9600bps のまま多システムの GSV を全部流すと回線がほぼ埋まり、RMC の到着が揺れる。
+"""
+import struct
+import time
+from dataclasses import dataclass
+
+from nmea_parser import nmea_checksum
+from ubx_parser import ubx_checksum
+
+PROFILES = ('ublox', 'mtk', 'airoha')
+
+# u-blox 標準 NMEA メッセージ（class 0xF0）の ID
+_UBX_NMEA_IDS = {
+    'GGA': 0x00, 'GLL': 0x01, 'GSA': 0x02, 'GSV': 0x03, 'RMC': 0x04, 'VTG': 0x05,
+    'GRS': 0x06, 'GST': 0x07, 'ZDA': 0x08, 'GBS': 0x09, 'DTM': 0x0A, 'GNS': 0x0D,
+    'VLW': 0x0F,
+}
+# PMTK314 のフィールド位置（19フィールド。未記載は 0 = 出力しない）
+_PMTK314_FIELDS = {'GLL': 0, 'RMC': 1, 'VTG': 2, 'GGA': 3, 'GSA': 4, 'GSV': 5, 'GRS': 6, 'GST': 7, 'ZDA': 17}
+# PAIR062 のセンテンス種別
+_PAIR062_TYPES = {'GGA': 0, 'GLL': 1, 'GSA': 2, 'GSV': 3, 'RMC': 4, 'VTG': 5, 'ZDA': 6, 'GRS': 7, 'GST': 8}
+
+# ubx_timing 時に出力させる UBX 航法メッセージ（class 0x01）：NAV-PVT, NAV-TIMEUTC
+_UBX_TIMING_IDS = (0x07, 0x21)
+
+# UBX-CFG-PRT：UART1, 8N1, 入力 UBX+NMEA+RTCM, 出力 UBX+NMEA
+_CFG_PRT = struct.Struct('<BBHIIHHHH')
+_UART_MODE_8N1 = 0x000008D0
+
+
+@dataclass(frozen=True)
+class ReceiverSettings:
+    """
+    keep 以外のセンテンスは止める。GSV だけは gsv_divider エポックに1回。
+    ubx_timing なら u-blox では NAV-PVT / NAV-TIMEUTC も毎エポック出させる（他のプロファイルでは無視）
+    """
+    keep: tuple = ('RMC', 'GGA', 'GSA', 'GSV')
+    gsv_divider: int = 5
+    baud_rate: int = 115200
+    ubx_timing: bool = False
+
+
+def _nmea_command(body):
+    return f"${body}*{nmea_checksum(body.encode('ascii')):02X}\r\n".encode('ascii')
+
+
+def _ubx_command(cls, msg_id, payload):
+    body = bytes((cls, msg_id)) + struct.pack('<H', len(payload)) + payload
+    return b'\xb5\x62' + body + bytes(ubx_checksum(body))
+
+
+def _rate(name, settings):
+    if name not in settings.keep:
+        return 0
+    return max(1, settings.gsv_divider) if name == 'GSV' else 1
+
+
+def build_commands(profile, settings=ReceiverSettings()):
+    """
+    プロファイルに応じたコマンド列（bytes のリスト）を返す。
+    ボーレート変更は必ず最後（送った直後から受信機側のレートが変わるため）。
+    """
+    if profile == 'ublox':
+        cmds = [_ubx_command(0x06, 0x01, bytes((0xF0, msg_id, _rate(name, settings))))
+                for name, msg_id in _UBX_NMEA_IDS.items()]
+        if settings.ubx_timing:
+            cmds.extend(_ubx_command(0x06, 0x01, bytes((0x01, msg_id, 1))) for msg_id in _UBX_TIMING_IDS)
+        cmds.append(_ubx_command(0x06, 0x00, _CFG_PRT.pack(
+            1, 0, 0, _UART_MODE_8N1, settings.baud_rate, 0x0007, 0x0003, 0, 0)))
+    elif profile == 'mtk':
+        fields = [0] * 19
+        for name, idx in _PMTK314_FIELDS.items():
+            fields[idx] = _rate(name, settings)
+        cmds = [_nmea_command('PMTK314,' + ','.join(map(str, fields))),
+                _nmea_command(f'PMTK251,{settings.baud_rate}')]
+    elif profile == 'airoha':
+        cmds = [_nmea_command(f'PAIR062,{t},{_rate(name, settings)}') for name, t in _PAIR062_TYPES.items()]
+        cmds.append(_nmea_command(f'PAIR864,0,0,{settings.baud_rate}'))
+    else:
+        raise ValueError(f"unknown receiver profile: {profile}")
+    return cmds
+
+
+def apply_receiver_config(port, profile, settings=ReceiverSettings(), gap=0.05, settle=0.2, sleep=time.sleep):
+    """
+    開いているポートへ設定を書き込み、ポート自体も新しいボーレートに切り替える。
+    戻り値は切り替え後のボーレート。
+    """
+    cmds = build_commands(profile, settings)
+    for cmd in cmds:
+        port.write(cmd)
+        port.flush()
+        # 受信機のコマンドバッファがあふれないよう少し間を空ける
+        sleep(gap)
+
+    # 最後のボーレート変更コマンドが旧レートで送り切られてから切り替える
+    sleep(settle)
+    if port.baudrate != settings.baud_rate:
+        port.baudrate = settings.baud_rate
+    port.reset_input_buffer()
+    return settings.baud_rate
+
+
+def open_receiver(port, baud_rate, profile=None, settings=ReceiverSettings(), opener=None, timeout=1, **apply_kw):
+    """
+    ポートを baud_rate（受信機の既定レート）で開き、profile があれば設定を書き込む。
+    (開いたポート, 実際のボーレート) を返す。設定に失敗したらポートを閉じて例外を上げる。
+    切断からの再接続でも最初に選んだ baud_rate で呼ぶこと（電源が入り直した受信機は既定レートに戻っている）。
+    opener はテスト用（既定は serial.Serial）。
+    """
+    if opener is None:
+        import serial
+        opener = serial.Serial
+    ser = opener(port, baud_rate, timeout=timeout)
+    if profile is None:
+        return ser, baud_rate
+    try:
+        return ser, apply_receiver_config(ser, profile, settings, **apply_kw)
+    except Exception:
+        ser.close()
+        raise
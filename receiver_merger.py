@@ -0,0 +1,74 @@
+"""
+複数受信機の時刻サンプル統合
+- 受信機ごとに「GPS 時刻 − 受信時刻(monotonic)」の位相を持ち、多数決で食い違う受信機を検出する
+- 食い違いのない受信機のうち、もっとも健全なもの（使用衛星数が多い）を選んで1エポック1件だけ流す
+- 2台で食い違った場合はどちらが正しいか決められないので、どちらも使わない
+受信機が1台しかなければ、そのままサンプルを素通しする。
+"""
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+
+_NS_PER_SEC = 1_000_000_000
+
+
+@dataclass(frozen=True)
+class MergedSample:
+    """統合後のサンプル。name は採用した受信機、disagreeing は食い違っている受信機名"""
+    name: str
+    time: datetime
+    ns: int
+    rx_mono: float
+    disagreeing: frozenset
+
+
+@dataclass
+class _ReceiverState:
+    phase_ns: int
+    rx_mono: float
+    quality: int
+
+
+class ReceiverMerger:
+    def __init__(self, tolerance_sec=0.1, stale_after=3.0):
+        """
+        tolerance_sec: 位相の差がこれ以内なら「一致」とみなす（受信遅延のばらつき分）
+        stale_after: この秒数サンプルのない受信機は判定から外す
+        """
+        self.tolerance_ns = int(tolerance_sec * _NS_PER_SEC)
+        self.stale_after = stale_after
+        self._receivers = {}
+        self.selected = None
+        self.disagreeing = frozenset()
+        self._last_second = None
+
+    def add(self, name, gps_time, gps_ns, rx_mono, quality=0) -> Optional[MergedSample]:
+        """
+        1受信機の秒頭サンプルを追加する。
+        選ばれた受信機の新しい秒のサンプルなら MergedSample を、それ以外は None を返す。
+        """
+        rx_ns = int(rx_mono * _NS_PER_SEC)
+        self._receivers[name] = _ReceiverState(gps_ns - rx_ns, rx_mono, quality)
+
+        fresh = {n: r for n, r in self._receivers.items() if rx_mono - r.rx_mono <= self.stale_after}
+        agreeing = set()
+        for n, r in fresh.items():
+            votes = sum(1 for o in fresh.values() if abs(o.phase_ns - r.phase_ns) <= self.tolerance_ns)
+            if votes * 2 > len(fresh):
+                agreeing.add(n)
+        self.disagreeing = frozenset(fresh.keys() - agreeing)
+
+        if not agreeing:
+            self.selected = None
+            return None
+        # 衛星数が同じなら今の受信機を使い続ける（頻繁に切り替えない）
+        self.selected = max(agreeing, key=lambda n: (fresh[n].quality, n == self.selected, n))
+        if name != self.selected:
+            return None
+
+        second = gps_ns // _NS_PER_SEC
+        if self._last_second is not None and second <= self._last_second:
+            return None
+        self._last_second = second
+        return MergedSample(name, gps_time, gps_ns, rx_mono, self.disagreeing)
+
@@ -0,0 +1,112 @@
+"""
+受信機の読み取りループ（切断検出・再接続）
+- 読み取り中に I/O 例外（OSError。pyserial の SerialException や ConnectionError も含む）が出たら
+  「ポート喪失」とみなしてポートを閉じる
+- それ以外の例外（解析・統合などの不具合）はポートを開いたまま on_error へ知らせて読み続ける
+- 指数バックオフ＋ジッタで開き直しを繰り返し、デバイスが戻ったら読み取りを再開する
+- 状態が変わった時だけ on_state(state, detail) を呼ぶ（GUI では ui_queue へ流す）
+例外のたびにログを出して即ループする（CPU を1コア使い切る）ことがないようにする。
+"""
+import random
+import time
+
+CONNECTED = 'connected'
+LOST = 'lost'
+RECONNECTING = 'reconnecting'
+STOPPED = 'stopped'
+
+
+class Backoff:
+    """initial 秒から factor 倍ずつ maximum 秒まで延ばす。jitter は ±割合"""
+
+    def __init__(self, initial=0.5, maximum=30.0, factor=2.0, jitter=0.2, rng=None):
+        self.initial = initial
+        self.maximum = maximum
+        self.factor = factor
+        self.jitter = jitter
+        self._rng = rng or random.Random()
+        self._next = initial
+
+    def next_delay(self):
+        base = self._next
+        self._next = min(self.maximum, self._next * self.factor)
+        # 複数台が同時に切れても再接続がそろわないようにずらす
+        return max(0.0, base * (1.0 + self._rng.uniform(-self.jitter, self.jitter)))
+
+    def reset(self):
+        self._next = self.initial
+
+
+class ReconnectingReader:
+    def __init__(self, open_port, read_once, close_port, on_state=None, backoff=None, wait=time.sleep,
+                 on_error=None, port_errors=(OSError,)):
+        """
+        open_port(): ポートを開く（失敗なら例外）
+        read_once(): 1回分読んで処理する（ポート喪失なら port_errors の例外）
+        close_port(): ポートを閉じる（例外は無視される）
+        wait(秒): バックオフ中の待ち。threading.Event.wait を渡せば停止時にすぐ抜けられる
+        on_error(例外): port_errors 以外の例外。同じ内容が続く間は最初の1回だけ呼ぶ
+        """
+        self.open_port = open_port
+        self.read_once = read_once
+        self.close_port = close_port
+        self.on_state = on_state
+        self.backoff = backoff or Backoff()
+        self.wait = wait
+        self.on_error = on_error
+        self.port_errors = port_errors
+        self.state = None
+        self.errors = 0  # ポート喪失以外の例外の回数
+        self._last_error = None
+
+    def _set_state(self, state, detail=None):
+        if state != self.state:
+            self.state = state
+            if self.on_state is not None:
+                self.on_state(state, detail)
+
+    def _close(self):
+        try:
+            self.close_port()
+        except Exception:
+            pass
+
+    def run(self, is_running, connected=True):
+        """is_running() が False になるまで読み続ける。connected=False なら開くところから始める"""
+        if connected:
+            self.state = CONNECTED
+        while is_running():
+            if not connected:
+                try:
+                    self.open_port()
+                except Exception as e:
+                    self._set_state(RECONNECTING, str(e))
+                    self.wait(self.backoff.next_delay())
+                    continue
+                if not is_running():
+                    self._close()
+                    break
+                connected = True
+                self.backoff.reset()
+                self._set_state(CONNECTED)
+
+            try:
+                self.read_once()
+            except self.port_errors as e:
+                if not is_running():
+                    break
+                connected = False
+                self._close()
+                self._set_state(LOST, str(e))
+                self.wait(self.backoff.next_delay())
+            except Exception as e:
+                # 解析などの不具合でポートを閉じ直しても直らないので、知らせるだけで読み続ける
+                self.errors += 1
+                detail = f"{type(e).__name__}: {e}"
+                if detail != self._last_error:
+                    self._last_error = detail
+                    if self.on_error is not None:
+                        self.on_error(e)
+            else:
+                self._last_error = None
+        self.state = STOPPED
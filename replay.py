@@ -0,0 +1,199 @@
+"""
+リプレイエンジン（キャプチャファイル / .nmea テキストを再生して解析・同期ロジックを動かす）
+- シリアルポートも Windows API も使わず、Linux 上でもヘッドレスで動く
+- システム時計は SimulatedClock で模擬し、TimeSynchronizer の時刻設定はその補正量に反映する
+- speed=0 なら最速、1 なら実時間、N なら N 倍速で再生する
+
+使い方:
+    python replay.py capture.cap --mode interval --interval 60 --speed 0
+    python replay.py field.nmea --mode instant --clock-offset 0.8
+"""
+import argparse
+import sys
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Iterator, List, Optional, Tuple
+
+from capture import MAGIC, read_capture
+from nmea_parser import NMEAParser, TimeFixEvent
+from time_sync import TimeSynchronizer
+
+_NS_PER_SEC = 1_000_000_000
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+class SimulatedClock:
+    """
+    再生用のシステム時計。
+    monotonic は記録された到着時刻、壁時計は「最初の壁時計 + 経過 + オフセット + 同期による補正」。
+    """
+
+    def __init__(self, offset_sec=0.0):
+        self.offset_ns = int(offset_sec * _NS_PER_SEC)
+        self.mono_ns = 0
+        self.correction_ns = 0
+        self._base_mono = None
+        self._base_wall = 0
+        # 時刻設定の履歴：(monotonic_ns, 補正量ns)
+        self.steps = []
+
+    def advance_to(self, mono_ns, wall_ns):
+        """記録の到着時刻まで進める。最初の呼び出しで壁時計の基準を決める"""
+        if self._base_mono is None:
+            self._base_mono = mono_ns
+            self._base_wall = wall_ns + self.offset_ns
+        if mono_ns > self.mono_ns:
+            self.mono_ns = mono_ns
+
+    def monotonic(self):
+        return self.mono_ns / 1e9
+
+    def wall_ns(self):
+        return self._base_wall + (self.mono_ns - (self._base_mono or 0)) + self.correction_ns
+
+    def now(self):
+        ns = self.wall_ns()
+        return _EPOCH + timedelta(seconds=ns // _NS_PER_SEC, microseconds=ns % _NS_PER_SEC // 1000)
+
+    def set_system_time(self, dt_utc):
+        """TimeSynchronizer からの時刻設定。差分を補正量に足す"""
+        target_ns = int((dt_utc - _EPOCH) / timedelta(microseconds=1)) * 1000
+        step = target_ns - self.wall_ns()
+        self.correction_ns += step
+        self.steps.append((self.mono_ns, step))
+        return 1
+
+
+@dataclass
+class ReplayResult:
+    chunks: int = 0
+    samples: int = 0
+    syncs: int = 0
+    # (GPS 時刻, 同期前の誤差秒) ※誤差 = GPS 時刻 − 模擬システム時刻
+    errors: List[Tuple[datetime, float]] = field(default_factory=list)
+    messages: List[str] = field(default_factory=list)
+
+
+def iter_records(path) -> Iterator[Tuple[bytes, Optional[int], Optional[int]]]:
+    """
+    (data, mono_ns, wall_ns) を順に返す。
+    キャプチャファイルなら記録時刻、.nmea テキストなら時刻は None（再生側で GPS 時刻から決める）。
+    """
+    with open(path, 'rb') as f:
+        head = f.read(len(MAGIC))
+    if head == MAGIC or head[:2] == b'\x1f\x8b' or head[:6] == b'\xfd7zXZ\x00':
+        for rec in read_capture(path):
+            yield rec.data, rec.mono_ns, rec.wall_ns
+        return
+    with open(path, 'rb') as f:
+        for line in f:
+            yield line, None, None
+
+
+class Replayer:
+    def __init__(self, mode='instant', interval_sec=60.0, speed=0.0, clock_offset=0.0, latency_sec=0.0,
+                 output_rate_hz=1, sleep=time.sleep, realtime=time.monotonic, log=None):
+        """
+        mode: 'instant'（毎秒 sync_time）/ 'interval'（毎秒 add_sample、interval_sec ごとに sync_time_weak）/ 'none'
+        latency_sec: テキスト入力時、秒頭から到着までの仮定遅延
+        """
+        self.mode = mode
+        self.interval_ns = int(interval_sec * _NS_PER_SEC)
+        self.speed = speed
+        self.latency_ns = int(latency_sec * _NS_PER_SEC)
+        self.clock = SimulatedClock(clock_offset)
+        self.parser = NMEAParser(clock=self.clock.monotonic, output_rate_hz=output_rate_hz)
+        self.sync = TimeSynchronizer(now=self.clock.now, set_system_time=self.clock.set_system_time,
+                                     is_admin=True)
+        self._sleep = sleep
+        self._realtime = realtime
+        self._log = log
+        self._next_sync_ns = None
+        self._pace_base = None  # (最初の記録の時刻ns, その時の実時間)
+
+    def run(self, records) -> ReplayResult:
+        result = ReplayResult()
+        self._pace_base = None
+        for data, mono_ns, wall_ns in records:
+            result.chunks += 1
+            if mono_ns is not None:
+                self.clock.advance_to(mono_ns, wall_ns)
+                self._pace(mono_ns)
+            for event in self.parser.feed(data):
+                if not isinstance(event, TimeFixEvent):
+                    continue
+                if mono_ns is None:
+                    # テキスト入力は記録時刻がないので GPS 時刻で再生速度を合わせる
+                    self._pace(event.ns)
+                if event.top_of_second:
+                    if mono_ns is None:
+                        # テキスト入力：到着時刻 = GPS 時刻 + 仮定遅延
+                        self.clock.advance_to(event.ns + self.latency_ns, event.ns + self.latency_ns)
+                    self._on_time(event, result)
+        return result
+
+    def _pace(self, t_ns):
+        """speed > 0 なら、最初の記録からの経過 t_ns を実時間の 1/speed になるまで待つ"""
+        if self.speed <= 0:
+            return
+        if self._pace_base is None:
+            self._pace_base = (t_ns, self._realtime())
+            return
+        base_ns, base_real = self._pace_base
+        wait = (t_ns - base_ns) / _NS_PER_SEC / self.speed - (self._realtime() - base_real)
+        if wait > 0:
+            self._sleep(wait)
+
+    def _on_time(self, event, result):
+        result.samples += 1
+        result.errors.append((event.time, (event.ns - self.clock.wall_ns()) / _NS_PER_SEC))
+        if self.mode == 'instant':
+            success, msg = self.sync.sync_time(event.time)
+        elif self.mode == 'interval':
+            self.sync.add_sample(event.time)
+            if self._next_sync_ns is None:
+                self._next_sync_ns = self.clock.mono_ns
+            if self.clock.mono_ns < self._next_sync_ns:
+                return
+            self._next_sync_ns = self.clock.mono_ns + self.interval_ns
+            success, msg = self.sync.sync_time_weak(event.time, append_sample=False)
+        else:
+            return
+        result.syncs += 1
+        line = f"{event.time:%Y-%m-%d %H:%M:%S} {'OK' if success else 'NG'} {msg}"
+        result.messages.append(line)
+        if self._log:
+            self._log(line)
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="ChronoGPS capture / NMEA replay")
+    ap.add_argument('path', help="キャプチャファイル（.cap, gzip/lzma 可）または NMEA テキスト")
+    ap.add_argument('--mode', choices=('instant', 'interval', 'none'), default='interval')
+    ap.add_argument('--interval', type=float, default=60.0, help="interval モードの同期間隔（秒）")
+    ap.add_argument('--speed', type=float, default=0.0, help="再生速度（0=最速, 1=実時間）")
+    ap.add_argument('--clock-offset', type=float, default=0.0, help="模擬システム時計の初期ずれ（秒）")
+    ap.add_argument('--latency', type=float, default=0.0, help="テキスト入力時の仮定到着遅延（秒）")
+    ap.add_argument('--rate', type=int, default=1, help="受信機の出力レート（Hz）")
+    ap.add_argument('-q', '--quiet', action='store_true', help="同期ごとのログを出さない")
+    args = ap.parse_args(argv)
+
+    replayer = Replayer(mode=args.mode, interval_sec=args.interval, speed=args.speed,
+                        clock_offset=args.clock_offset, latency_sec=args.latency,
+                        output_rate_hz=args.rate, log=None if args.quiet else print)
+    started = time.perf_counter()
+    result = replayer.run(iter_records(args.path))
+    elapsed = time.perf_counter() - started
+
+    print(f"chunks={result.chunks} samples={result.samples} syncs={result.syncs} "
+          f"steps={len(replayer.clock.steps)} elapsed={elapsed:.2f}s")
+    if result.errors:
+        last = result.errors[-1][1]
+        print(f"final error={last:+.6f}s correction={replayer.clock.correction_ns / _NS_PER_SEC:+.6f}s")
+    print(f"parser stats: {dict(replayer.parser.get_sentence_stats())}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,273 @@
+"""
+パーサー / パイプラインのスループット計測
+
+計測項目:
+- parse.<種別>          : NMEAParser.parse() 1センテンスあたりの時間と確保メモリ
+                          （合成エポック列を順に解析し、時刻が毎回進む通常の経路を測る）
+- satellites.cached     : get_satellites_by_system()（キャッシュが効く場合）
+- satellites.rebuild    : get_satellites_by_system()（ビューを作り直す場合）
+- grid.latlon_to_grid   : grid_locator.latlon_to_grid()
+- grid.parser           : NMEAParser._calculate_grid_locator()
+- pipeline.synthetic    : 合成ストリームの bytes → feed() → 時刻サンプル（エンドツーエンド）
+- pipeline.capture:<名> : キャプチャファイル（--capture）を同じ経路で再生
+
+使い方:
+    python scripts/benchmark.py -o bench.json
+    python scripts/benchmark.py --baseline bench.json --threshold 0.15
+    python scripts/benchmark.py --capture field.cap --quick
+
+--baseline を渡すと、ops_per_sec が threshold 以上落ちた項目と、alloc_blocks_per_op が
+threshold 以上増えた項目を表示して終了コード 1 を返す。
+alloc_peak_bytes は1回の呼び出しで一時的に確保された最大量（tracemalloc）、
+alloc_blocks_per_op は GC を止めて数えた1回あたりの確保ブロック数の差（GC 負荷の目安）、
+retained_blocks_per_op は GC 後も残ったメモリブロック数（リーク検出用）。
+"""
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from functools import partial
+from itertools import cycle
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from capture import read_capture  # noqa: E402
+from grid_locator import latlon_to_grid  # noqa: E402
+from nmea_generator import NMEAGenerator, sentence  # noqa: E402
+from nmea_parser import NMEAParser, TimeFixEvent  # noqa: E402
+
+# 合成ストリームに含まれない種別
+_EXTRA_SENTENCES = {
+    'GNS': "GNGNS,000000.00,3540.8742,N,13946.0275,E,AANN,24,0.8,40.0,39.4,,,V",
+    'GST': "GNGST,000000.00,1.2,0.8,0.6,45.0,0.9,0.7,1.5",
+    'GBS': "GNGBS,000000.00,0.8,0.7,1.5,,,,",
+}
+
+
+def _sample_sentences(epochs=200):
+    """
+    種別 → 時刻が1エポックずつ進む行（str）のリスト。
+    同じ1行を繰り返すと2回目以降は重複時刻の早期リターンしか通らないので、エポック列を用意する。
+    """
+    samples = {}
+    for true_ns, data in NMEAGenerator(dual_band=True).epochs(epochs):
+        for line in data.decode('ascii').splitlines(keepends=True):
+            samples.setdefault(line[3:6], []).append(line)
+        hhmmss = time.strftime('%H%M%S', time.gmtime(true_ns // 1_000_000_000))
+        for kind, body in _EXTRA_SENTENCES.items():
+            samples.setdefault(kind, []).append(sentence(body.replace('000000', hhmmss, 1)).decode('ascii'))
+    return samples
+
+
+def _time_op(fn, iterations, repeat):
+    """fn を iterations 回呼ぶ計測を repeat 回行い、最良の ns/回 を返す"""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter_ns()
+        for _ in range(iterations):
+            fn()
+        elapsed = time.perf_counter_ns() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best / iterations
+
+
+def _alloc_op(fn, samples=200):
+    """
+    1回あたりの一時確保ピーク（bytes）、確保ブロック数、残ったブロック数の平均。
+    確保ブロック数は GC を止めて呼び出し前後の sys.getallocatedblocks() を比べた差
+    （参照カウントで即解放された一時オブジェクトは相殺されるが、循環参照で GC 待ちになる分は数える）。
+    残ったブロック数は最後に GC を回してから数える（リーク検出用）。
+    """
+    fn()  # キャッシュ等を温める
+    gc.collect()
+    gc.disable()
+    tracemalloc.start()
+    try:
+        peak = 0
+        allocated = 0
+        blocks_before = sys.getallocatedblocks()
+        for _ in range(samples):
+            current, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            before = sys.getallocatedblocks()
+            fn()
+            allocated += sys.getallocatedblocks() - before
+            _, p = tracemalloc.get_traced_memory()
+            peak = max(peak, p - current)
+        gc.collect()
+        retained = (sys.getallocatedblocks() - blocks_before) / samples
+    finally:
+        tracemalloc.stop()
+        gc.enable()
+    return peak, allocated / samples, retained
+
+
+def _measure(fn, iterations, repeat, units_per_op=1):
+    ns = _time_op(fn, iterations, repeat)
+    peak, allocated, retained = _alloc_op(fn)
+    return {
+        'ns_per_op': round(ns, 1),
+        'ops_per_sec': round(1e9 / ns * units_per_op, 1),
+        'alloc_peak_bytes': peak,
+        'alloc_blocks_per_op': round(allocated, 3),
+        'retained_blocks_per_op': round(retained, 3),
+    }
+
+
+def bench_parse(iterations, repeat):
+    results = {}
+    samples = _sample_sentences()
+    for kind, lines in sorted(samples.items()):
+        p = NMEAParser()
+        # 測位中にしておく（ZDA は測位前だと no_fix で捨てられる）
+        p.parse(samples['RMC'][0])
+        # 1回の呼び出しで1行ずつ順に解析する（時刻が毎回進むので位置・グリッド・イベント生成まで通る）
+        results[f'parse.{kind}'] = _measure(partial(_parse_next, p.parse, cycle(lines)), iterations, repeat)
+    return results
+
+
+def _parse_next(parse, lines):
+    return parse(next(lines))
+
+
+def bench_satellites(iterations, repeat):
+    p = NMEAParser()
+    for _, data in NMEAGenerator(dual_band=True).epochs(2):
+        p.feed(data)
+
+    def rebuild():
+        # 版番号を外してキャッシュを無効化する
+        p._views_cache_version = None
+        p.get_satellites_by_system()
+
+    return {
+        'satellites.cached': _measure(p.get_satellites_by_system, iterations, repeat),
+        'satellites.rebuild': _measure(rebuild, iterations // 10 or 1, repeat),
+    }
+
+
+def bench_grid(iterations, repeat):
+    p = NMEAParser()
+    p.latitude, p.longitude = 35.681236, 139.767125
+    return {
+        'grid.latlon_to_grid': _measure(lambda: latlon_to_grid(35.681236, 139.767125), iterations, repeat),
+        'grid.parser': _measure(p._calculate_grid_locator, iterations, repeat),
+    }
+
+
+def _pipeline(chunks):
+    """bytes チャンク列 → feed() → 秒頭の時刻サンプル。サンプル数を返す"""
+    p = NMEAParser(output_rate_hz=10)
+    samples = 0
+    for chunk in chunks:
+        for event in p.feed(chunk):
+            if isinstance(event, TimeFixEvent) and event.top_of_second:
+                samples += 1
+    return samples
+
+
+def _chunked(epochs, size=64):
+    data = b''.join(d for _, d in epochs)
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+def bench_pipeline(repeat, seconds, captures):
+    results = {}
+    chunks = _chunked(NMEAGenerator(rate_hz=10, dual_band=True).epochs(seconds * 10))
+    sources = [('pipeline.synthetic', chunks)]
+    for path in captures:
+        sources.append((f'pipeline.capture:{Path(path).name}', [r.data for r in read_capture(path)]))
+
+    for name, chunk_list in sources:
+        total = sum(len(c) for c in chunk_list)
+        ns = _time_op(lambda: _pipeline(chunk_list), 1, repeat)
+        results[name] = {
+            'ns_per_op': round(ns, 1),
+            'bytes_per_sec': round(total / ns * 1e9, 1),
+            'ops_per_sec': round(_pipeline(chunk_list) / ns * 1e9, 1),  # 時刻サンプル/秒
+            'chunks': len(chunk_list),
+        }
+    return results
+
+
+def run(iterations=20000, repeat=5, seconds=60, captures=()):
+    results = {}
+    results.update(bench_parse(iterations, repeat))
+    results.update(bench_satellites(iterations, repeat))
+    results.update(bench_grid(iterations, repeat))
+    results.update(bench_pipeline(repeat, seconds, captures))
+    return {
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'machine': platform.machine(),
+        'iterations': iterations,
+        'results': results,
+    }
+
+
+def compare(current, baseline, threshold):
+    """
+    基準から悪化した項目を (名前, 指標, 基準, 今回, 変化率) で返す。
+    - ops_per_sec が threshold（割合）以上落ちた
+    - alloc_blocks_per_op が threshold 以上、かつ1ブロック以上増えた
+    """
+    regressions = []
+    for name, base in baseline.get('results', {}).items():
+        now = current['results'].get(name)
+        if not now:
+            continue
+        if base.get('ops_per_sec'):
+            change = now['ops_per_sec'] / base['ops_per_sec'] - 1.0
+            if change < -threshold:
+                regressions.append((name, 'ops_per_sec', base['ops_per_sec'], now['ops_per_sec'], change))
+        base_alloc = base.get('alloc_blocks_per_op')
+        now_alloc = now.get('alloc_blocks_per_op')
+        if base_alloc is not None and now_alloc is not None and now_alloc - base_alloc >= 1.0 \
+                and now_alloc > base_alloc * (1.0 + threshold):
+            change = now_alloc / base_alloc - 1.0 if base_alloc > 0 else float('inf')
+            regressions.append((name, 'alloc_blocks_per_op', base_alloc, now_alloc, change))
+    return regressions
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="ChronoGPS parser / pipeline benchmark")
+    ap.add_argument('-o', '--output', help="結果 JSON の出力先（省略時は標準出力）")
+    ap.add_argument('--baseline', help="比較する基準 JSON")
+    ap.add_argument('--threshold', type=float, default=0.15, help="回帰とみなす低下率（既定 0.15 = 15%%）")
+    ap.add_argument('--capture', action='append', default=[], help="再生するキャプチャファイル（複数可）")
+    ap.add_argument('--iterations', type=int, default=20000)
+    ap.add_argument('--repeat', type=int, default=5)
+    ap.add_argument('--quick', action='store_true', help="回数を減らして短時間で回す")
+    args = ap.parse_args(argv)
+
+    iterations, repeat, seconds = args.iterations, args.repeat, 60
+    if args.quick:
+        iterations, repeat, seconds = max(1, iterations // 20), 2, 5
+    current = run(iterations, repeat, seconds, args.capture)
+
+    text = json.dumps(current, indent=2, sort_keys=True)
+    if args.output:
+        Path(args.output).write_text(text + "\n", encoding='utf-8')
+    else:
+        print(text)
+
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text(encoding='utf-8'))
+        regressions = compare(current, baseline, args.threshold)
+        for name, metric, base, now, change in regressions:
+            print(f"REGRESSION: {name}: {metric} {base:.1f} → {now:.1f} ({change:+.1%})", file=sys.stderr)
+        if regressions:
+            return 1
+        print(f"OK: 基準から {args.threshold:.0%} 以上遅くなった項目はありません", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
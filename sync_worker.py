@@ -0,0 +1,93 @@
+"""
+時刻同期ワーカー（SetSystemTime を読み取りスレッドから切り離す）
+- 読み取りスレッドは受信時刻を付けて解析し、最新サンプルを mailbox に置くだけ
+- mailbox は1枠だけで、取り出される前に次が来たら古い方を捨てる（常に最新を使う）
+- 時刻設定・ログ出力はワーカースレッドが行うので、その間もシリアル読み取りは止まらない
+"""
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+
+@dataclass(frozen=True)
+class SyncSample:
+    time: datetime   # GPS 時刻（秒頭, UTC）
+    rx_mono: float   # その時刻に対応する受信時刻（monotonic 秒）
+
+    def at(self, mono):
+        """mono 時点での GPS 時刻（受信からの経過分だけ進める）"""
+        return self.time + timedelta(seconds=mono - self.rx_mono)
+
+
+class LatestMailbox:
+    """1枠だけの受け渡し口。put は待たずに上書きし、get は届くまで待つ"""
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._item = None
+        self._closed = False
+        self.dropped = 0  # 取り出される前に上書きされた件数
+
+    def put(self, item):
+        with self._cond:
+            if self._item is not None:
+                self.dropped += 1
+            self._item = item
+            self._cond.notify()
+
+    def get(self, timeout=None):
+        """最新の1件を取り出す。timeout か close() なら None"""
+        with self._cond:
+            if self._item is None and not self._closed:
+                self._cond.wait(timeout)
+            item, self._item = self._item, None
+            return item
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    @property
+    def closed(self):
+        return self._closed
+
+
+class SyncWorker:
+    def __init__(self, apply, clock=time.monotonic, on_error=None):
+        """
+        apply(sample, now_mono): 同期方針を適用する（ワーカースレッドで呼ばれる）
+        on_error(例外): apply が例外を出した時（省略時は無視してワーカーは続行）
+        """
+        self.apply = apply
+        self.mailbox = LatestMailbox()
+        self._clock = clock
+        self._on_error = on_error
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def submit(self, gps_time, rx_mono):
+        """読み取りスレッドから呼ぶ。待たずに戻る"""
+        self.mailbox.put(SyncSample(gps_time, rx_mono))
+
+    def _run(self):
+        while not self.mailbox.closed:
+            sample = self.mailbox.get(timeout=1.0)
+            if sample is None:
+                continue
+            try:
+                self.apply(sample, self._clock())
+            except Exception as e:
+                if self._on_error is not None:
+                    self._on_error(e)
+
+    def stop(self, timeout=1.0):
+        self.mailbox.close()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+        self._thread = None
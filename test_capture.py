@@ -0,0 +1,55 @@
+# test_capture.py
+import pytest
+
+from capture import CaptureWriter, read_capture
+
+
+@pytest.mark.parametrize('compression', [None, 'gzip', 'lzma'])
+def test_round_trip_and_append(tmp_path, compression):
+    path = tmp_path / 'rx.cap'
+    with CaptureWriter(str(path), compression) as w:
+        w.write(b'$GPRMC,1*00\r\n', mono_ns=10, wall_ns=-5)
+        w.write(b'', mono_ns=20, wall_ns=20)
+    # 再度開いたら追記になる
+    with CaptureWriter(str(path), compression) as w:
+        w.write(b'\xb5\x62\x01\x07', mono_ns=30, wall_ns=40)
+
+    records = list(read_capture(str(path)))
+    assert [(r.mono_ns, r.wall_ns, r.data) for r in records] == [
+        (10, -5, b'$GPRMC,1*00\r\n'), (20, 20, b''), (30, 40, b'\xb5\x62\x01\x07')]
+
+
+def test_truncated_tail_is_ignored(tmp_path):
+    path = tmp_path / 'rx.cap'
+    with CaptureWriter(str(path)) as w:
+        w.write(b'abc', 1, 2)
+        w.write(b'defgh', 3, 4)
+    path.write_bytes(path.read_bytes()[:-2])
+
+    assert [r.data for r in read_capture(str(path))] == [b'abc']
+
+
+@pytest.mark.parametrize('compression', [None, 'gzip', 'lzma'])
+def test_records_reach_disk_on_flush_interval_without_close(tmp_path, compression):
+    path = tmp_path / 'rx.cap'
+    now = [0.0]
+    w = CaptureWriter(str(path), compression, flush_interval=1.0, clock=lambda: now[0])
+    w.write(b'first', mono_ns=1, wall_ns=1)
+    now[0] = 1.5
+    w.write(b'second', mono_ns=2, wall_ns=2)
+    # close() していなくても（異常終了しても）ここまでは読める
+    assert [r.data for r in read_capture(str(path))] == [b'first', b'second']
+    w.write(b'third', mono_ns=3, wall_ns=3)
+    w.close()
+    assert [r.data for r in read_capture(str(path))] == [b'first', b'second', b'third']
+
+
+def test_wall_time_follows_given_arrival_time(tmp_path):
+    import time
+
+    path = tmp_path / 'rx.cap'
+    with CaptureWriter(str(path)) as w:
+        w.write(b'x', mono_ns=time.monotonic_ns() - 500_000_000)
+    rec = next(read_capture(str(path)))
+    # 到着時刻（0.5秒前）に合わせて壁時計も戻っている
+    assert abs((time.time_ns() - rec.wall_ns) / 1e9 - 0.5) < 0.1
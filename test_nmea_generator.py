@@ -0,0 +1,73 @@
+# test_nmea_generator.py
+from nmea_generator import NMEATCPServer, NMEAGenerator, PseudoSerial
+from nmea_parser import NMEAParser, TimeFixEvent
+from nmea_source import TCPSource
+
+import pytest
+
+
+def test_generated_stream_parses_cleanly_at_high_rate():
+    gen = NMEAGenerator(rate_hz=10, dual_band=True, clock_offset=0.3)
+    p = NMEAParser(output_rate_hz=10)
+    events = []
+    for _, data in gen.epochs(30):
+        events.extend(p.feed(data))
+
+    fixes = [e for e in events if isinstance(e, TimeFixEvent)]
+    assert len(fixes) >= 30
+    # 時刻オフセット 0.3 秒 → 秒頭エポックは 10 エポックに1回（7, 17, 27 番目）
+    assert sum(e.top_of_second for e in fixes) == 3
+    stats = p.get_sentence_stats()
+    assert stats['RMC']['accepted'] == 30 and stats['GSV']['accepted'] > 0
+    assert all(c['bad_checksum'] == c['truncated'] == 0 for c in stats.values() if isinstance(c, dict))
+    by_system = p.get_satellites_by_system()
+    assert {name: len(sats) for name, sats in by_system.items() if sats} == \
+        {'GPS': 10, 'GLONASS': 6, 'Galileo': 6, 'BeiDou': 6}
+    assert all(len(s.signals) == 2 for sats in by_system.values() for s in sats)
+
+
+def test_injected_errors_are_rejected_not_raised():
+    gen = NMEAGenerator(checksum_error_rate=0.1, truncation_rate=0.1, seed=3)
+    p = NMEAParser()
+    for _, data in gen.epochs(20):
+        p.feed(data)
+    stats = p.get_sentence_stats()
+    assert sum(c['bad_checksum'] for c in stats.values() if isinstance(c, dict)) > 0
+    assert p.last_time is not None
+
+
+def test_pseudo_serial_limits_byte_rate():
+    now = [0.0]
+    gen = NMEAGenerator(constellations={'GP': 12})
+    port = PseudoSerial(gen.epochs(3), baudrate=9600, clock=lambda: now[0],
+                        sleep=lambda s: now.__setitem__(0, now[0] + s))
+
+    line = port.readline()
+    assert line.startswith(b'$GPRMC') and line.endswith(b'\r\n')
+    # 9600bps = 960 バイト/秒
+    assert now[0] == pytest.approx(len(line) / 960.0, abs=1 / 960.0)
+
+    epoch0 = next(NMEAGenerator(constellations={'GP': 12}).epochs(1))[1]
+    rest = port.read(len(epoch0) - len(line))
+    assert line + rest == epoch0
+    # 次のエポックは1秒後から届く
+    assert port.in_waiting == 0
+    port.read(1)
+    assert now[0] == pytest.approx(1.0 + 1 / 960.0, abs=1e-3)
+
+
+def test_tcp_server_feeds_tcp_source():
+    gen = NMEAGenerator(constellations={'GP': 4})
+    server = NMEATCPServer(gen.epochs(5), realtime=False).start()
+    src = TCPSource(server.host, server.port, timeout=2.0)
+    p = NMEAParser()
+    fixes = 0
+    try:
+        with pytest.raises(ConnectionError):
+            while True:
+                data, _ = src.read()
+                fixes += sum(isinstance(e, TimeFixEvent) for e in p.feed(data))
+    finally:
+        src.close()
+        server.join(2.0)
+    assert fixes == 5
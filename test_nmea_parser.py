@@ -5,7 +5,7 @@ def test_parse_gga_updates_position_and_altitude():
     p = NMEAParser()
 
     # 代表的なGGA（緯度経度・高度を含む）
-    line = "$GPGGA,092750.000,5321.6802,N,00630.3372,W,1,08,1.03,61.7,M,55.2,M,,*76"
+    line = "$GPGGA,092750.000,5321.6802,N,00630.3372,W,1,08,1.03,61.7,M,55.2,M,,*46"
     p.parse(line)
 
     # 53°21.6802' N = 53 + 21.6802/60
@@ -18,4 +18,333 @@ def test_parse_gga_updates_position_and_altitude():
 
     # altitude: 61.7m
     # （属性名が違う可能性があるので、まずは存在チェックを入れる）
-    assert hasattr(p, "altitude") or hasattr(p, "altitude_m") or hasattr(p, "altitude_meters")
\ No newline at end of file
+    assert hasattr(p, "altitude") or hasattr(p, "altitude_m") or hasattr(p, "altitude_meters")
+
+def test_parse_bytes_rmc_returns_time_and_position():
+    p = NMEAParser()
+
+    line = b"$GPRMC,123519.00,A,4807.038,N,01131.000,E,022.4,084.4,230394,003.1,W*44\r\n"
+    dt = p.parse_bytes(memoryview(line))
+
+    assert dt is not None
+    assert (dt.year, dt.month, dt.day, dt.hour, dt.minute, dt.second) == (1994, 3, 23, 12, 35, 19)
+    assert abs(p.latitude - (48 + 7.038 / 60)) < 1e-6
+    assert abs(p.longitude - (11 + 31.0 / 60)) < 1e-6
+
+
+def test_parse_bytes_ignores_unhandled_sentences():
+    p = NMEAParser()
+
+    assert p.parse_bytes(b"$GPVTG,054.7,T,034.4,M,005.5,N,010.2,K*48\r\n") is None
+    assert p.parse_bytes(b"garbage\r\n") is None
+    assert p.latitude is None
+
+
+def test_checksum_rejects_corrupted_and_truncated_sentences():
+    p = NMEAParser()
+
+    good = b"$GPRMC,123519.00,A,4807.038,N,01131.000,E,022.4,084.4,230394,003.1,W*44\r\n"
+    corrupted = good.replace(b"230394", b"230395")
+    truncated = good[:40]
+
+    assert p.parse_bytes(corrupted) is None
+    assert p.parse_bytes(truncated) is None
+    assert p.last_time is None
+
+    assert p.parse_bytes(good) is not None
+    stats = p.get_sentence_stats()['RMC']
+    assert stats == {'accepted': 1, 'bad_checksum': 1, 'truncated': 1}
+
+
+def test_nmea_checksum_matches_bytewise_xor():
+    from functools import reduce
+    from nmea_parser import nmea_checksum
+
+    for body in (b"", b"G", b"GPGGA", b"GPGSV,3,1,11,03,03,111,00,04,15,270,00,06,01,010,00,13,06,292,00"):
+        assert nmea_checksum(body) == reduce(lambda a, b: a ^ b, body, 0)
+
+
+def _nmea(body):
+    """チェックサム付きのセンテンス（CRLF付き bytes）を組み立てる"""
+    from nmea_parser import nmea_checksum
+    data = body.encode('ascii')
+    return b"$" + data + b"*%02X\r\n" % nmea_checksum(data)
+
+
+def test_feed_reassembles_lines_split_across_chunks():
+    from nmea_parser import PositionEvent, SatelliteEpochEvent, TimeFixEvent
+
+    p = NMEAParser()
+    epoch1 = (
+        _nmea("GPRMC,120000.00,A,3539.5148,N,13944.7260,E,0.0,0.0,010125,,,A")
+        + _nmea("GPGSA,A,3,05,12,,,,,,,,,,,1.5,0.9,1.2")
+        + _nmea("GPGSV,1,1,02,05,45,120,40,12,30,200,35")
+    )
+    epoch2 = _nmea("GPRMC,120001.00,A,3539.5148,N,13944.7260,E,0.0,0.0,010125,,,A")
+    stream = epoch1 + epoch2
+
+    events = []
+    for i in range(0, len(stream), 7):
+        events.extend(p.feed(stream[i:i + 7]))
+
+    times = [e for e in events if isinstance(e, TimeFixEvent)]
+    assert [t.time.second for t in times] == [0, 1]
+    assert any(isinstance(e, PositionEvent) for e in events)
+
+    epochs = [e for e in events if isinstance(e, SatelliteEpochEvent)]
+    assert epochs == [SatelliteEpochEvent(in_use=2, visible=2)]
+
+
+def test_feed_skips_leading_garbage():
+    p = NMEAParser()
+    events = p.feed(b"\x00\xff" + _nmea("GPRMC,120000.00,A,3539.5148,N,13944.7260,E,0.0,0.0,010125,,,A"))
+    assert len(events) == 2
+    assert p.last_time is not None
+
+
+def test_overlong_line_is_dropped_without_raising():
+    from functools import reduce
+    from nmea_parser import nmea_checksum
+
+    body = b"1" * 70000
+    assert nmea_checksum(body) == reduce(lambda a, b: a ^ b, body, 0)
+
+    p = NMEAParser()
+    assert p.feed(b"$GPRMC," + b"1" * 5000 + b"*00\r\n") == []
+    assert p.get_sentence_stats()['RMC']['too_long'] == 1
+    # 後続の正常な行は読める
+    assert p.feed(_nmea("GPRMC,120000.00,A,3539.5148,N,13944.7260,E,0.0,0.0,010125,,,A"))
+
+
+def test_satellite_epochs_replace_in_use_and_expire_old_satellites():
+    from nmea_parser import SatelliteEpochEvent
+
+    now = [1000.0]
+    p = NMEAParser(satellite_max_age=10.0, clock=lambda: now[0])
+
+    def epoch(sec, in_use, gsv):
+        return (
+            _nmea(f"GPRMC,1200{sec:02d}.00,A,3539.5148,N,13944.7260,E,0.0,0.0,010125,,,A")
+            + _nmea("GPGSA,A,3," + ",".join(in_use + [""] * (12 - len(in_use))) + ",1.5,0.9,1.2")
+            + _nmea(gsv)
+        )
+
+    p.feed(epoch(0, ["05", "12"], "GPGSV,1,1,02,05,45,120,40,12,30,200,35"))
+    now[0] += 1
+    # 2エポック目：05 は使用中から外れ、12 は GSV から消えた
+    events = p.feed(epoch(1, ["07"], "GPGSV,1,1,02,05,45,120,40,07,20,080,30"))
+    # 1エポック目で最終センテンス（GPGSV）を学習済みなので、2エポック目は即確定する
+    assert events[-1] == SatelliteEpochEvent(in_use=1, visible=3)
+    assert p.satellites_in_use == {(1, '07')}
+    assert p.satellites[(1, '05')].in_use is False
+
+    now[0] += 20
+    p.feed(epoch(2, ["07"], "GPGSV,1,1,01,07,20,080,30"))
+    assert set(p.satellites) == {(1, '07')}
+
+
+def test_gngsa_per_system_does_not_close_epoch_when_gsv_is_divided():
+    p = NMEAParser()
+    in_use = []
+    for sec in range(12):
+        stream = (
+            _nmea(f"GNRMC,1200{sec:02d}.00,A,3539.5148,N,13944.7260,E,0.0,0.0,010125,,,A")
+            + _nmea(f"GNGGA,1200{sec:02d}.00,3539.5148,N,13944.7260,E,1,08,0.9,40.0,M,39.4,M,,")
+            + _nmea("GNGSA,A,3,05,12,,,,,,,,,,,1.5,0.9,1.2,1")
+            + _nmea("GNGSA,A,3,65,66,,,,,,,,,,,1.5,0.9,1.2,2")
+        )
+        if sec % 5 == 0:
+            # receiver_config の gsv_divider=5 相当：GSV は5エポックに1回
+            stream += _nmea("GPGSV,1,1,02,05,45,120,40,12,30,200,35")
+            stream += _nmea("GLGSV,1,1,02,65,40,090,38,66,20,300,33")
+        p.feed(stream)
+        in_use.append(set(p.satellites_in_use))
+    both = {(1, '05'), (1, '12'), (2, '65'), (2, '66')}
+    # 各エポックは次の時刻フィールド（または学習した GLGSV）で確定し、両系統とも残る
+    assert all(epoch == both for epoch in in_use[1:])
+    assert p._cycle_ender == 'GLGSV'
+
+
+def test_gsv_updates_satellite_records_in_place():
+    import pytest
+
+    p = NMEAParser()
+    p.parse_bytes(_nmea("GPGSV,1,1,01,05,45,120,40"))
+    sat = p.satellites[(1, '05')]
+    p.parse_bytes(_nmea("GPGSV,1,1,01,05,46,121,42"))
+
+    assert p.satellites[(1, '05')] is sat
+    assert (sat.elevation, sat.azimuth, sat.snr) == (46, 121, 42)
+    with pytest.raises(TypeError):
+        p.satellites[(1, '06')] = sat
+
+
+def test_rmc_keeps_fractional_seconds_and_nanoseconds():
+    from datetime import datetime, timezone
+
+    p = NMEAParser()
+    dt = p.parse_bytes(_nmea("GPRMC,235959.95,A,3539.5148,N,13944.7260,E,0.0,0.0,311224,,,A"))
+
+    assert dt == datetime(2024, 12, 31, 23, 59, 59, 950000, tzinfo=timezone.utc)
+    assert p.last_time_ns == int(datetime(2024, 12, 31, 23, 59, 59, tzinfo=timezone.utc).timestamp()) * 10**9 + 950_000_000
+
+    # 10Hz：同じ秒の中でも小数部が違えば別の時刻として扱う
+    assert p.parse_bytes(_nmea("GPRMC,000000.05,A,3539.5148,N,13944.7260,E,0.0,0.0,010125,,,A")) == \
+        datetime(2025, 1, 1, 0, 0, 0, 50000, tzinfo=timezone.utc)
+
+
+def test_rmc_rejects_invalid_time_fields():
+    p = NMEAParser()
+    assert p.parse_bytes(_nmea("GPRMC,2599xx.00,A,3539.5148,N,13944.7260,E,0.0,0.0,010125,,,A")) is None
+    assert p.parse_bytes(_nmea("GPRMC,120000.00,A,3539.5148,N,13944.7260,E,0.0,0.0,320125,,,A")) is None
+    assert p.last_time is None
+
+
+def test_satellite_views_counts_and_version_update_incrementally():
+    from nmea_parser import SatelliteCounts
+
+    def burst(sec):
+        return (
+            _nmea(f"GPRMC,1200{sec:02d}.00,A,3539.5148,N,13944.7260,E,0.0,0.0,010125,,,A")
+            + _nmea("GPGSA,A,3,12,05,07,,,,,,,,,,1.5,0.9,1.2")
+            + _nmea("GPGSV,1,1,03,12,30,200,35,05,45,120,15,07,10,050,05")
+        )
+
+    p = NMEAParser()
+    p.feed(burst(0) + burst(1))
+
+    version = p.satellite_version
+    assert version > 0
+    assert [s.id for s in p.get_satellites_by_system()['GPS']] == ['05', '07', '12']
+    assert p.satellite_counts == SatelliteCounts(strong=1, weak=1, sbas_used=0, total=3)
+
+    # 同じ内容のエポックでは版番号が進まない
+    p.feed(burst(2) + burst(3))
+    assert p.satellite_version == version
+
+
+def test_snapshot_is_published_per_epoch_and_immutable():
+    import dataclasses
+    import pytest
+
+    p = NMEAParser()
+    first = p.snapshot
+    p.feed(
+        _nmea("GPRMC,120000.00,A,3539.5148,N,13944.7260,E,0.0,0.0,010125,,,A")
+        + _nmea("GPGSA,A,3,05,,,,,,,,,,,,1.5,0.9,1.2")
+        + _nmea("GPGSV,1,1,01,05,45,120,40")
+        + _nmea("GPRMC,120001.00,A,3539.5148,N,13944.7260,E,0.0,0.0,010125,,,A")
+    )
+    snap = p.snapshot
+
+    assert snap is not first
+    assert snap.latitude is not None and snap.grid_locator
+    assert snap.satellites['GPS'][0].in_use is True
+    assert snap.satellites_in_use == frozenset({(1, '05')})
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        snap.latitude = 0.0
+    with pytest.raises(TypeError):
+        snap.satellites['GPS'] = ()
+
+    # 以降の GSV 更新は公開済みスナップショットに影響しない
+    p.feed(_nmea("GPGSV,1,1,01,05,45,120,10"))
+    assert snap.satellites['GPS'][0].snr == 40
+
+
+def test_dual_band_gsv_keeps_snr_per_signal_and_gn_talker_uses_system_ids():
+    p = NMEAParser()
+    # NMEA 4.10：末尾の信号ID（1=L1 C/A, 8=L5）
+    p.parse_bytes(_nmea("GPGSV,1,1,01,05,45,120,40,1"))
+    p.parse_bytes(_nmea("GPGSV,1,1,01,05,45,120,33,8"))
+    sat = p.satellites[(1, '05')]
+    assert sat.signals == {'1': 40, '8': 33}
+    assert sat.snr == 40
+
+    # $GN GSA：System ID 5 は QZSS、SBAS の PRN は SBAS として扱う
+    p.parse_bytes(_nmea("GNGSA,A,3,193,,,,,,,,,,,,1.5,0.9,1.2,5"))
+    p.parse_bytes(_nmea("GNGSA,A,3,05,42,,,,,,,,,,,1.5,0.9,1.2,1"))
+    assert p._pending_in_use == {(6, '193'), (1, '05'), (5, '42')}
+
+    # System ID なしの $GN GSV は PRN の拡張番号から系統を推定する
+    p.parse_bytes(_nmea("GNGSV,1,1,02,70,20,100,30,305,50,200,41"))
+    assert (2, '70') in p.satellites
+    assert (3, '305') in p.satellites
+
+
+def test_zda_gives_time_after_fix_and_gst_gbs_are_exposed():
+    from datetime import datetime, timedelta, timezone
+    from nmea_parser import ErrorStatsEvent, IntegrityEvent, TimeFixEvent
+
+    p = NMEAParser()
+    # 測位前の ZDA（受信機RTC時刻）は使わない
+    assert p.parse_bytes(_nmea("GPZDA,120000.00,01,01,2025,09,00")) is None
+
+    p.parse_bytes(_nmea("GNGNS,120000.00,3539.5148,N,13944.7260,E,AAN,12,0.9,40.5,39.0,,,V"))
+    assert p.altitude == 40.5
+    events = p.feed(
+        _nmea("GPZDA,120001.50,01,01,2025,-03,30")
+        + _nmea("GPRMC,120001.50,A,3540.0000,N,13944.7260,E,0.0,0.0,010125,,,A")
+        + _nmea("GPGST,120001.50,1.2,2.0,1.0,45.0,1.5,1.1,2.7")
+        + _nmea("GPGBS,120001.50,1.6,1.2,3.1,07,0.01,-21.4,3.8")
+    )
+
+    times = [e for e in events if isinstance(e, TimeFixEvent)]
+    # ZDA が先に時刻を確定し、同じエポックの RMC は重複として捨てる
+    assert [(t.source, t.time) for t in times] == [
+        ('ZDA', datetime(2025, 1, 1, 12, 0, 1, 500000, tzinfo=timezone.utc))]
+    # 時刻は重複でも、RMC の位置は反映される
+    assert abs(p.latitude - 35.0 - 40.0 / 60) < 1e-9
+    assert p.local_zone_offset == -timedelta(hours=3, minutes=30)
+    assert ErrorStatsEvent(1.2, 1.5, 1.1, 2.7) in events
+    assert IntegrityEvent(1.6, 1.2, 3.1, '07', 0.01, -21.4, 3.8) in events
+
+
+def test_register_handler_adds_custom_sentence():
+    p = NMEAParser()
+    seen = []
+    p.register_handler('TXT', seen.append)
+
+    p.parse_bytes(_nmea("GPTXT,01,01,02,ANTENNA OK"))
+    assert seen == [['$GPTXT', '01', '01', '02', 'ANTENNA OK']]
+    assert p.get_sentence_stats()['TXT']['accepted'] == 1
+
+
+def test_malformed_fields_are_counted_by_reason_without_raising():
+    p = NMEAParser()
+    p.parse_bytes(_nmea("GPRMC,120000.00,V,,,,,,,010125,,,N"))
+    p.parse_bytes(_nmea("GPRMC,120001.00,A,35x9.5148,N,13944.7260,E,0.0,0.0,010125,,,A"))
+    p.parse_bytes(_nmea("GPGGA,120002.00,3539.5148,N,13944.7260,E,1,08,1.0,4O.5,M,39.0,M,,"))
+    p.parse_bytes(_nmea("GPGSV,1,1,02,05,4x,120,40,12,30,200,35"))
+    p.parse_bytes(_nmea("GPGSA,A,3"))
+
+    stats = p.get_sentence_stats()
+    assert stats['RMC']['no_fix'] == 1
+    assert stats['RMC']['bad_coord'] == 1
+    assert stats['GGA']['bad_number'] == 1
+    assert stats['GSV']['bad_number'] == 1
+    assert stats['GSA']['short'] == 1
+
+    # 不正な位置は捨てても、時刻と正しいフィールドは使う
+    assert p.last_time is not None
+    assert p.altitude is None
+    assert abs(p.latitude - (35 + 39.5148 / 60)) < 1e-6
+    assert set(p.satellites) == {(1, '12')}
+
+
+def test_high_rate_receiver_uses_only_top_of_second_epochs():
+    from nmea_parser import PositionEvent, TimeFixEvent
+
+    p = NMEAParser(output_rate_hz=10, decimate_updates=True)
+    stream = b"".join(
+        _nmea(f"GPRMC,12000{sec}.{tenth}0,A,3539.5148,N,13944.7260,E,0.0,0.0,010125,,,A")
+        for sec in range(2) for tenth in range(10)
+    )
+    returned = [p.parse_bytes(line + b"\n") for line in stream.split(b"\n") if line]
+    assert [t.second for t in returned if t is not None] == [0, 1]
+
+    p = NMEAParser(output_rate_hz=10, decimate_updates=True)
+    events = p.feed(stream)
+    fixes = [e for e in events if isinstance(e, TimeFixEvent)]
+    assert len(fixes) == 20
+    assert [f.time.second for f in fixes if f.top_of_second] == [0, 1]
+    assert len([e for e in events if isinstance(e, PositionEvent)]) == 2
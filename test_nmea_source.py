@@ -0,0 +1,174 @@
+# test_nmea_source.py
+import socket
+import threading
+import time
+
+import pytest
+
+from nmea_parser import NMEAParser, TimeFixEvent
+from nmea_source import TCPSource, UDPSource
+
+RMC = b"$GPRMC,123519.00,A,4807.038,N,01131.000,E,022.4,084.4,230394,003.1,W*44\r\n"
+
+
+def test_tcp_source_reads_from_loopback_server():
+    server = socket.create_server(('127.0.0.1', 0))
+    port = server.getsockname()[1]
+
+    def serve():
+        conn, _ = server.accept()
+        with conn:
+            conn.sendall(RMC[:30])
+            time.sleep(0.05)
+            conn.sendall(RMC[30:])
+        server.close()
+
+    threading.Thread(target=serve, daemon=True).start()
+    src = TCPSource('127.0.0.1', port, timeout=2.0)
+    parser = NMEAParser()
+    events = []
+    try:
+        with pytest.raises(ConnectionError):
+            while True:
+                data, rx_mono = src.read()
+                if data:
+                    assert rx_mono <= time.monotonic()
+                    events.extend(parser.feed(data))
+    finally:
+        src.close()
+
+    assert [type(e) for e in events if isinstance(e, TimeFixEvent)] == [TimeFixEvent]
+
+
+def test_udp_source_stamps_datagrams():
+    src = UDPSource(0, host='127.0.0.1', timeout=2.0)
+    try:
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as tx:
+            sent = time.monotonic()
+            tx.sendto(RMC, ('127.0.0.1', src.port))
+        data, rx_mono = src.read()
+    finally:
+        src.close()
+
+    assert data == RMC
+    # 受信時刻は送信直後〜読み出し時点の間（カーネル時刻と monotonic の換算誤差を少し許す）
+    assert sent - 0.01 <= rx_mono <= time.monotonic()
+
+
+def test_read_chunk_drains_burst_and_wakes_on_cancel():
+    from nmea_generator import NMEAGenerator, PseudoSerial
+    from nmea_source import read_chunk
+
+    epochs = list(NMEAGenerator().epochs(2))
+    ser = PseudoSerial(epochs, baudrate=10_000_000, timeout=5.0)
+    time.sleep(0.05)
+    # 届いているバースト全体が1回で読める
+    data, rx_mono = read_chunk(ser)
+    assert data == epochs[0][1]
+    assert rx_mono is not None
+    events = [e for e in NMEAParser().feed(data) if isinstance(e, TimeFixEvent)]
+    assert events and events[0].ns == epochs[0][0]
+
+    # 次のエポック（1秒後）を待っている間でも、cancel_read で timeout を待たずに戻る
+    threading.Timer(0.1, ser.cancel_read).start()
+    started = time.monotonic()
+    assert read_chunk(ser) == (b'', None)
+    assert time.monotonic() - started < 0.8
+
+
+def test_read_chunk_gathers_whole_burst_at_low_baud_rate():
+    from nmea_generator import NMEAGenerator, PseudoSerial
+    from nmea_source import read_chunk
+
+    # 16衛星のエポック（約 600 バイト）は 9600bps で 0.6 秒かけて届く
+    epochs = list(NMEAGenerator(constellations={'GP': 8, 'GL': 8}).epochs(1))
+    ser = PseudoSerial(epochs, baudrate=9600, timeout=2.0)
+    started = time.monotonic()
+    data, rx_mono = read_chunk(ser)
+
+    # バイトの間隔があくまで待ってから1回で返す（read は先頭1バイト + 残り の2回）
+    assert data == epochs[0][1]
+    assert ser.reads == 2
+    assert abs(rx_mono - started) < 0.01
+
+
+def test_first_byte_time_subtracts_transmission_time():
+    from nmea_source import char_time, first_byte_time
+
+    ct = char_time(9600)
+    assert ct == pytest.approx(10 / 9600)
+    # 100 バイト溜まっていたのを t=1.0 に読み終えた → 先頭は 100 文字分前に届き始めた
+    assert first_byte_time(100, 0.99, 1.0, 9600) == pytest.approx(1.0 - 100 * ct)
+    # 待っていて1バイトだけ届いた → read(1) が戻った時刻から1文字分前
+    assert first_byte_time(1, 0.5, 0.5001, 9600) == pytest.approx(0.5 - ct)
+
+
+def _nmea(body):
+    from nmea_parser import nmea_checksum
+    data = body.encode('ascii')
+    return b"$" + data + b"*%02X\r\n" % nmea_checksum(data)
+
+
+def test_epoch_arrival_is_anchored_to_the_epoch_not_the_chunk():
+    from nmea_source import char_time, epoch_arrival
+
+    ct = char_time(9600)
+    gsv = _nmea("GPGSV,1,1,02,05,45,120,40,12,30,200,35")
+    zda = _nmea("GPZDA,120001.00,01,01,2025,00,00")
+    p = NMEAParser()
+    p.feed(_nmea("GPRMC,120000.00,A,3539.5148,N,13944.7260,E,0.0,0.0,010125,,,A"))
+
+    # 読み取りが止まり、前のエポックの末尾と次のエポックの先頭が1チャンクにまとまった
+    events = [e for e in p.feed(gsv + zda) if isinstance(e, TimeFixEvent)]
+    assert [(e.source, e.offset, e.epoch_bytes) for e in events] == [('ZDA', len(gsv), 0)]
+    assert epoch_arrival(10.0, events[0], 9600) == pytest.approx(10.0 + len(gsv) * ct)
+
+    # エポックの先頭（GGA）が前のチャンクから始まっている時は、その分まで戻す
+    gga = _nmea("GPGGA,120002.00,3539.5148,N,13944.7260,E,1,08,0.9,40.0,M,39.4,M,,")
+    rmc = _nmea("GPRMC,120002.00,A,3539.5148,N,13944.7260,E,0.0,0.0,010125,,,A")
+    p.feed(gga[:10])
+    event = [e for e in p.feed(gga[10:] + rmc) if isinstance(e, TimeFixEvent)][0]
+    assert (event.source, event.offset, event.epoch_bytes) == ('RMC', len(gga) - 10, len(gga))
+    assert epoch_arrival(20.0, event, 9600) == pytest.approx(20.0 - 10 * ct)
+    # 戻す量は max_burst まで
+    later = TimeFixEvent(event.time, 'RMC', event.ns, True, offset=0, epoch_bytes=5000)
+    assert epoch_arrival(20.0, later, 9600, max_burst=0.1) == pytest.approx(19.9)
+    # ネットワーク入力（ボーレート不明）は受信時刻のまま
+    assert epoch_arrival(20.0, later, None) == 20.0
+
+
+def test_saturated_link_timestamps_follow_each_epoch():
+    from nmea_generator import NMEAGenerator, PseudoSerial
+    from nmea_source import char_time, epoch_arrival, read_chunk
+
+    # 10Hz・2周波・多系統を 19200bps で：平均 3000 B/s 超に対し回線は 1920 B/s で、無音の切れ目が来ない
+    epochs = list(NMEAGenerator(rate_hz=10, dual_band=True,
+                                constellations={'GP': 12, 'GL': 8, 'GA': 8, 'GB': 10}).epochs(10))
+    baud = 19200
+    ct = char_time(baud)
+    ser = PseudoSerial(epochs, baudrate=baud, timeout=2.0)
+    # PseudoSerial の送信スケジュール：各エポックは予定時刻か回線が空いた時の遅い方から送られる
+    expected = {}
+    line_free = ser._t0
+    for ns, data in epochs:
+        start = max(ser._t0 + (ns - epochs[0][0]) / 1e9, line_free)
+        expected[ns] = start
+        line_free = start + len(data) * ct
+
+    p = NMEAParser(output_rate_hz=10)
+    total = sum(len(d) for _, d in epochs)
+    received = 0
+    stamps = {}
+    while received < total:
+        data, rx_mono = read_chunk(ser)
+        assert data
+        received += len(data)
+        for event in p.feed(data):
+            if isinstance(event, TimeFixEvent):
+                stamps[event.ns] = epoch_arrival(rx_mono, event, baud, max_burst=0.1)
+
+    assert set(stamps) == set(expected)
+    # 後ろのエポックほど送信待ちで遅れるが、受信時刻は各エポックの送信開始に追従する
+    assert expected[epochs[-1][0]] - ser._t0 > 1.0
+    for ns, start in expected.items():
+        assert abs(stamps[ns] - start) < 0.02
@@ -0,0 +1,53 @@
+# test_port_probe.py
+from nmea_generator import NMEAGenerator, PseudoSerial
+from port_probe import ProbeResult, count_valid_sentences, probe_ports
+
+
+class _FakeReceiver(PseudoSerial):
+    """true_baud で送ってくる受信機。ポート側のボーレートが違えば文字化けしたバイトになる"""
+
+    def __init__(self, true_baud):
+        super().__init__(NMEAGenerator(constellations={'GP': 8}).epochs(), baudrate=true_baud, timeout=0.05)
+        self.true_baud = true_baud
+
+    @property
+    def _bytes_per_sec(self):
+        return self.true_baud / 10.0
+
+    def read(self, size=1):
+        data = super().read(size)
+        if self.baudrate != self.true_baud:
+            data = bytes((b * 7 + 0x80) & 0xFF for b in data)
+        return data
+
+
+class _SilentPort(PseudoSerial):
+    def __init__(self):
+        super().__init__(iter(()), timeout=0.05)
+
+
+def test_count_valid_sentences_ignores_bad_checksums():
+    good = b"$GPRMC,123519.00,A,4807.038,N,01131.000,E,022.4,084.4,230394,003.1,W*44\r\n"
+    bad = good.replace(b'*44', b'*45')
+    assert count_valid_sentences(b"noise" + good + bad + good[:20]) == 1
+
+
+def test_probe_finds_port_and_baud_in_parallel():
+    def opener(port, baud, timeout):
+        if port == 'COM7':
+            port_obj = _FakeReceiver(38400)
+        elif port == 'COM3':
+            port_obj = _SilentPort()
+        else:
+            raise OSError("access denied")
+        port_obj.baudrate = baud
+        return port_obj
+
+    result = probe_ports(['COM1', 'COM3', 'COM7'], baud_rates=(9600, 115200, 38400), dwell=0.5, opener=opener)
+    assert isinstance(result, ProbeResult)
+    assert (result.port, result.baud_rate) == ('COM7', 38400)
+    assert result.score >= 3
+
+
+def test_probe_returns_none_without_nmea():
+    assert probe_ports(['COM3'], dwell=0.1, opener=lambda p, b, timeout: _SilentPort()) is None
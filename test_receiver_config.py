@@ -0,0 +1,81 @@
+# test_receiver_config.py
+from receiver_config import ReceiverSettings, apply_receiver_config, build_commands, open_receiver
+from ubx_parser import UBXParser
+
+
+class _FakePort:
+    def __init__(self, baudrate=9600):
+        self.baudrate = baudrate
+        self.written = []
+        self.flushed = 0
+
+    def write(self, data):
+        self.written.append((self.baudrate, data))
+
+    def flush(self):
+        self.flushed += 1
+
+    def reset_input_buffer(self):
+        pass
+
+
+def test_mtk_commands_match_known_checksums():
+    cmds = build_commands('mtk')
+    assert cmds == [
+        b"$PMTK314,0,1,0,1,1,5,0,0,0,0,0,0,0,0,0,0,0,0,0*2C\r\n",
+        b"$PMTK251,115200*1F\r\n",
+    ]
+
+
+def test_ublox_commands_are_valid_frames():
+    settings = ReceiverSettings(keep=('RMC', 'GSV'), gsv_divider=4, baud_rate=38400)
+    cmds = build_commands('ublox', settings)
+
+    p = UBXParser()
+    for cmd in cmds:
+        p.feed(cmd)
+    # CFG-* は復号しないが、フレームとしては正しい
+    assert p.stats['accepted'] == len(cmds)
+    rates = {cmd[7]: cmd[8] for cmd in cmds[:-1]}
+    assert rates[0x04] == 1 and rates[0x03] == 4 and rates[0x00] == 0
+    assert int.from_bytes(cmds[-1][14:18], 'little') == 38400
+
+
+def test_apply_switches_port_after_last_command():
+    port = _FakePort()
+    baud = apply_receiver_config(port, 'airoha', sleep=lambda s: None)
+
+    assert baud == 115200 and port.baudrate == 115200
+    # 全コマンドは旧レートで送られ、ボーレート変更が最後
+    assert all(rate == 9600 for rate, _ in port.written)
+    assert port.written[-1][1].startswith(b"$PAIR864,0,0,115200*")
+
+
+def test_reopen_after_power_cycle_configures_at_default_baud():
+    opened = []
+
+    class _Receiver(_FakePort):
+        """抜き差しで電源が入り直し、既定の 9600bps に戻る受信機"""
+        def __init__(self, port, baudrate, timeout=None):
+            super().__init__(baudrate)
+            opened.append(self)
+
+        def close(self):
+            pass
+
+    chosen = 9600
+    for _ in range(2):
+        ser, baud = open_receiver('COM3', chosen, 'mtk', opener=_Receiver, sleep=lambda s: None)
+        assert baud == 115200 and ser.baudrate == 115200
+
+    # 再接続でも最初に選んだ 9600bps で開き、設定コマンドはそのレートで送る
+    assert len(opened) == 2
+    assert all(rate == 9600 for rate, _ in opened[1].written)
+
+
+def test_ublox_ubx_timing_enables_nav_messages_before_baud_change():
+    cmds = build_commands('ublox', ReceiverSettings(ubx_timing=True))
+    nav = [(cmd[6], cmd[7], cmd[8]) for cmd in cmds if cmd[3] == 0x01 and cmd[6] == 0x01]
+    assert nav == [(0x01, 0x07, 1), (0x01, 0x21, 1)]
+    assert cmds[-1][3] == 0x00  # CFG-PRT が最後
+    assert len(build_commands('ublox')) == len(cmds) - 2
@@ -0,0 +1,46 @@
+# test_receiver_merger.py
+from datetime import datetime, timedelta, timezone
+
+from receiver_merger import ReceiverMerger
+
+NS = 1_000_000_000
+T0 = datetime(2024, 3, 15, 12, 0, 0, tzinfo=timezone.utc)
+T0_NS = int(T0.timestamp()) * NS
+
+
+def _add(m, name, sec, rx_mono, quality=8, step=0):
+    """sec 秒目のサンプル。step は受信機の時刻ずれ（秒）"""
+    t = T0 + timedelta(seconds=sec + step)
+    return m.add(name, t, T0_NS + (sec + step) * NS, rx_mono, quality)
+
+
+def test_single_receiver_passes_through_once_per_second():
+    m = ReceiverMerger()
+    assert _add(m, 'a', 0, 100.05).name == 'a'
+    assert _add(m, 'a', 1, 101.05).time == T0 + timedelta(seconds=1)
+    # 同じ秒の重複は流さない
+    assert _add(m, 'a', 1, 101.06) is None
+
+
+def test_picks_healthiest_and_outvotes_bad_receiver():
+    m = ReceiverMerger()
+    _add(m, 'a', 0, 100.05, quality=6)
+    _add(m, 'b', 0, 100.06, quality=10)
+    _add(m, 'c', 0, 100.07, quality=12, step=1)  # 1秒ずれた受信機
+
+    assert m.disagreeing == frozenset({'c'})
+    assert m.selected == 'b'
+    assert _add(m, 'a', 1, 101.05, quality=6) is None
+    merged = _add(m, 'b', 1, 101.06, quality=10)
+    assert merged.name == 'b' and merged.disagreeing == frozenset({'c'})
+
+
+def test_two_receivers_that_disagree_are_both_held_back():
+    m = ReceiverMerger()
+    _add(m, 'a', 0, 100.05)
+    assert _add(m, 'b', 0, 100.05, step=1) is None
+    assert m.disagreeing == frozenset({'a', 'b'}) and m.selected is None
+
+    # b が止まって古くなれば a だけで続行する
+    assert _add(m, 'a', 5, 105.05).name == 'a'
+    assert m.disagreeing == frozenset()
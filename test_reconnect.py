@@ -0,0 +1,60 @@
+# test_reconnect.py
+import random
+
+from reconnect import CONNECTED, LOST, RECONNECTING, STOPPED, Backoff, ReconnectingReader
+
+
+def test_backoff_grows_to_maximum_with_jitter():
+    b = Backoff(initial=0.5, maximum=4.0, factor=2.0, jitter=0.2, rng=random.Random(1))
+    delays = [b.next_delay() for _ in range(6)]
+    for d, base in zip(delays, [0.5, 1.0, 2.0, 4.0, 4.0, 4.0]):
+        assert base * 0.8 <= d <= base * 1.2
+    b.reset()
+    assert b.next_delay() <= 0.6
+
+
+def test_reader_recovers_after_unplug_without_spinning():
+    log = []
+    waits = []
+    state = {'reads': 0, 'opens': 0}
+
+    def read_once():
+        state['reads'] += 1
+        if state['reads'] == 3:
+            raise OSError("device disconnected")
+
+    def open_port():
+        state['opens'] += 1
+        if state['opens'] < 3:
+            raise OSError("port not found")
+
+    reader = ReconnectingReader(
+        open_port=open_port, read_once=read_once, close_port=lambda: log.append('close'),
+        on_state=lambda s, d: log.append(s), backoff=Backoff(jitter=0.0), wait=waits.append)
+    reader.run(lambda: state['reads'] < 6)
+
+    # 喪失 → 開けない間は RECONNECTING のまま（ログは1回）→ 復帰
+    assert log == ['close', LOST, RECONNECTING, CONNECTED]
+    assert waits == [0.5, 1.0, 2.0]
+    assert reader.state == STOPPED and state['reads'] == 6
+
+
+def test_non_io_errors_are_reported_without_reconnecting():
+    log = []
+    errors = []
+    state = {'reads': 0}
+
+    def read_once():
+        state['reads'] += 1
+        if state['reads'] <= 3:
+            raise ValueError("bad sentence")
+
+    reader = ReconnectingReader(
+        open_port=lambda: log.append('open'), read_once=read_once, close_port=lambda: log.append('close'),
+        on_state=lambda s, d: log.append(s), wait=lambda _: log.append('wait'), on_error=errors.append)
+    reader.run(lambda: state['reads'] < 5)
+
+    # ポートは閉じず、同じ例外の連続は1回だけ知らせる
+    assert log == []
+    assert [str(e) for e in errors] == ["bad sentence"]
+    assert reader.errors == 3
@@ -0,0 +1,59 @@
+# test_replay.py
+from datetime import datetime, timedelta, timezone
+
+from capture import CaptureWriter
+from nmea_parser import nmea_checksum
+from replay import Replayer, iter_records
+
+NS = 1_000_000_000
+T0 = datetime(2024, 3, 15, 12, 0, 0, tzinfo=timezone.utc)
+
+
+def _rmc(t):
+    body = f"GPRMC,{t:%H%M%S}.00,A,4807.038,N,01131.000,E,022.4,084.4,{t:%d%m%y},003.1,W".encode()
+    return b"$" + body + b"*%02X\r\n" % nmea_checksum(body)
+
+
+def test_text_replay_instant_mode_corrects_offset(tmp_path):
+    path = tmp_path / 'field.nmea'
+    path.write_bytes(b''.join(_rmc(T0 + timedelta(seconds=i)) for i in range(5)))
+
+    r = Replayer(mode='instant', clock_offset=0.8, latency_sec=0.05)
+    result = r.run(iter_records(str(path)))
+
+    assert result.samples == 5 and result.syncs == 5
+    errors = [e for _, e in result.errors]
+    assert abs(errors[0] + 0.85) < 1e-3
+    # 1回目の設定で補正され、以降は遅延分だけの誤差になる
+    assert all(abs(e) < 1e-3 for e in errors[1:])
+    assert abs(r.clock.steps[0][1] / NS + 0.85) < 1e-3
+
+
+def test_capture_replay_interval_mode_and_speed(tmp_path):
+    path = tmp_path / 'rx.cap'
+    t0_ns = int(T0.timestamp()) * NS
+    with CaptureWriter(str(path), 'gzip') as w:
+        for i in range(60):
+            # システム時計は GPS より 0.5 秒遅れている（wall = GPS - 0.5s + 到着遅延 0.1s）
+            w.write(_rmc(T0 + timedelta(seconds=i)), mono_ns=5 * NS + i * NS, wall_ns=t0_ns + i * NS - 4 * NS // 10)
+
+    slept = []
+    r = Replayer(mode='interval', interval_sec=10, speed=100.0, sleep=slept.append, realtime=lambda: 0.0)
+    result = r.run(iter_records(str(path)))
+
+    assert result.samples == 60 and result.syncs == 6
+    # 30 サンプルたまってから、2回連続で同じ向きを確認して（40秒目）補正される
+    assert len(r.clock.steps) == 1 and abs(r.clock.steps[0][1] / NS - 0.4) < 1e-3
+    assert abs(result.errors[-1][1]) < 1e-3
+    assert abs(slept[-1] - 0.59) < 1e-9
+
+
+def test_text_replay_is_paced_by_gps_time(tmp_path):
+    path = tmp_path / 'field.nmea'
+    path.write_bytes(b''.join(_rmc(T0 + timedelta(seconds=i)) for i in range(5)))
+
+    slept = []
+    r = Replayer(mode='none', speed=2.0, sleep=slept.append, realtime=lambda: 0.0)
+    r.run(iter_records(str(path)))
+    # GPS 時刻で1秒ずつ進むので、2倍速なら 0.5 秒刻みで待つ
+    assert slept == [0.5, 1.0, 1.5, 2.0]
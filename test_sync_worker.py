@@ -0,0 +1,49 @@
+# test_sync_worker.py
+import threading
+from datetime import datetime, timedelta, timezone
+
+from sync_worker import LatestMailbox, SyncSample, SyncWorker
+
+T0 = datetime(2024, 1, 1, 0, 0, 0, tzinfo=timezone.utc)
+
+
+def test_mailbox_keeps_only_newest():
+    box = LatestMailbox()
+    for i in range(3):
+        box.put(i)
+    assert box.get(timeout=0) == 2
+    assert box.dropped == 2
+    assert box.get(timeout=0) is None
+    box.close()
+    assert box.get() is None
+
+
+def test_sample_is_advanced_by_its_age():
+    sample = SyncSample(T0, rx_mono=100.0)
+    assert sample.at(100.25) == T0 + timedelta(seconds=0.25)
+
+
+def test_worker_applies_latest_sample_while_busy():
+    release = threading.Event()
+    applied = []
+    done = threading.Event()
+
+    def apply(sample, now_mono):
+        applied.append((sample.time, now_mono))
+        if len(applied) == 1:
+            release.wait(2.0)  # 1件目の処理中に次のサンプルが3件届く
+        else:
+            done.set()
+
+    worker = SyncWorker(apply, clock=lambda: 42.0).start()
+    worker.submit(T0, 41.0)
+    while not applied:
+        threading.Event().wait(0.005)
+    for i in range(1, 4):
+        worker.submit(T0 + timedelta(seconds=i), 41.0 + i)
+    release.set()
+    assert done.wait(2.0)
+    worker.stop()
+    assert [t for t, _ in applied] == [T0, T0 + timedelta(seconds=3)]
+    assert applied[0][1] == 42.0
+    assert worker.mailbox.dropped == 2
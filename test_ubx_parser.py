@@ -0,0 +1,80 @@
+# test_ubx_parser.py
+import struct
+
+from nmea_parser import NMEAParser, TimeFixEvent
+from ubx_parser import UBXParser, UBXTimeFix, UBXTimePulse, ubx_checksum
+
+
+def _frame(cls, msg_id, payload):
+    body = bytes([cls, msg_id]) + struct.pack('<H', len(payload)) + payload
+    return b'\xb5\x62' + body + bytes(ubx_checksum(body))
+
+
+def _nav_pvt(nano=123_456_789, valid=0x07, t_acc=25):
+    head = struct.pack('<IHBBBBBBIiBBBB', 0, 2024, 3, 15, 12, 34, 56, valid, t_acc, nano, 3, 1, 0, 12)
+    return _frame(0x01, 0x07, head + bytes(92 - len(head)))
+
+
+def test_nav_pvt_gives_nanosecond_time_fix():
+    p = UBXParser()
+    events = p.feed(_nav_pvt())
+
+    assert len(events) == 1
+    fix = events[0]
+    assert isinstance(fix, UBXTimeFix)
+    assert fix.valid and fix.t_acc_ns == 25 and fix.source == 'NAV-PVT'
+    assert (fix.time.hour, fix.time.minute, fix.time.second, fix.time.microsecond) == (12, 34, 56, 123456)
+    assert fix.ns % 1_000_000_000 == 123_456_789
+    assert not fix.top_of_second
+
+    # 日付未確定なら valid=False、負の nano は前の秒に繰り下がる
+    fix = p.feed(_nav_pvt(nano=-2_000, valid=0x02))[0]
+    assert not fix.valid
+    assert fix.time.second == 55 and fix.top_of_second
+
+
+def test_timeutc_and_tim_tp():
+    p = UBXParser()
+    utc = struct.pack('<IIiHBBBBBB', 0, 40, 500, 2024, 3, 15, 0, 0, 1, 0x07)
+    tp = struct.pack('<IIiHBB', 1000, 1 << 31, -1500, 2300, 0x01, 0)
+    events = p.feed(_frame(0x01, 0x21, utc) + _frame(0x0d, 0x01, tp))
+
+    fix, pulse = events
+    assert fix.valid and fix.source == 'NAV-TIMEUTC' and fix.t_acc_ns == 40
+    assert isinstance(pulse, UBXTimePulse)
+    assert pulse.q_err_ps == -1500 and pulse.utc
+    # GPS 週 2300 + 1.0005 秒（towSubMS = 0.5ms）
+    assert pulse.ns % 1_000_000_000 == 500_000
+
+
+def test_mixed_stream_split_across_chunks_forwards_nmea():
+    nmea = NMEAParser()
+    p = UBXParser(nmea)
+    rmc = b"$GPRMC,123519.00,A,4807.038,N,01131.000,E,022.4,084.4,230394,003.1,W*44\r\n"
+    stream = rmc[:20] + _nav_pvt() + rmc[20:] + _frame(0x01, 0x07, b'\x00' * 10)
+
+    events = []
+    for i in range(0, len(stream), 7):
+        events.extend(p.feed(stream[i:i + 7]))
+
+    assert [type(e) for e in events if isinstance(e, (UBXTimeFix, TimeFixEvent))] == [UBXTimeFix, TimeFixEvent]
+    assert p.stats['accepted'] == 2 and p.stats['short'] == 1
+
+    # 壊れたチェックサムは捨てる
+    bad = bytearray(_nav_pvt())
+    bad[-1] ^= 0xFF
+    assert p.feed(bytes(bad)) == []
+    assert p.stats['bad_checksum'] == 1
+
+
+def test_pvt_and_timeutc_in_same_second_give_one_top_of_second_fix():
+    p = UBXParser()
+    pvt = _nav_pvt(nano=-2_000)
+    utc = _frame(0x01, 0x21, struct.pack('<IIiHBBBBBB', 0, 40, 0, 2024, 3, 15, 12, 34, 56, 0x07))
+    fixes = p.feed(pvt + utc)
+    assert [f.source for f in fixes] == ['NAV-PVT', 'NAV-TIMEUTC']
+    assert [f.top_of_second for f in fixes] == [True, False]
+
+    # 次の秒はまた秒頭になる
+    nxt = _frame(0x01, 0x21, struct.pack('<IIiHBBBBBB', 0, 40, 0, 2024, 3, 15, 12, 34, 57, 0x07))
+    assert p.feed(nxt)[0].top_of_second
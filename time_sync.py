@@ -24,13 +24,27 @@ class SYSTEMTIME(ctypes.Structure):
     ]
 
 
+def _utc_now():
+    return datetime.now(timezone.utc)
+
+
 class TimeSynchronizer:
-    def __init__(self, localization=None):
+    def __init__(self, localization=None, now=None, set_system_time=None, is_admin=None):
+        """
+        now / set_system_time を渡すとシステム時計の代わりに使う（リプレイ・テスト用）。
+        set_system_time は UTC の datetime を受け取り、成功で1、失敗で0を返す。
+        """
         # 管理者判定（Windows API）
-        try:
-            self.is_admin = ctypes.windll.shell32.IsUserAnAdmin() != 0
-        except Exception:
-            self.is_admin = False
+        if is_admin is not None:
+            self.is_admin = bool(is_admin)
+        else:
+            try:
+                self.is_admin = ctypes.windll.shell32.IsUserAnAdmin() != 0
+            except Exception:
+                self.is_admin = False
+
+        self._now = now or _utc_now
+        self._set_time = set_system_time
 
         self.time_offset = 0.0  # FT8時刻オフセット（秒）
         self.loc = localization  # 多言語対応
@@ -52,6 +66,8 @@ class TimeSynchronizer:
 
     def _set_system_time_utc(self, dt_utc):
         """UTCのdatetimeをWindowsへ絶対設定。成功で1、失敗で0を返す"""
+        if self._set_time is not None:
+            return self._set_time(dt_utc)
         st = self._datetime_to_systemtime(dt_utc)
         return ctypes.windll.kernel32.SetSystemTime(ctypes.byref(st))
 
@@ -75,7 +91,7 @@ class TimeSynchronizer:
             adjusted_time = target_utc + timedelta(seconds=self.time_offset)
 
             # 現在のシステム時刻（UTC）との差分
-            system_time = datetime.now(timezone.utc)
+            system_time = self._now()
             diff = (adjusted_time - system_time).total_seconds()
 
             # 時刻設定
@@ -106,7 +122,7 @@ class TimeSynchronizer:
         try:
             target_utc = self._normalize_target_utc(target_time)
             adjusted_time = target_utc + timedelta(seconds=self.time_offset)
-            system_time = datetime.now(timezone.utc)
+            system_time = self._now()
             diff = (adjusted_time - system_time).total_seconds()
             self._weak_diffs.append(diff)
         except Exception as e:
@@ -150,7 +166,7 @@ class TimeSynchronizer:
 
             target_utc = self._normalize_target_utc(target_time)
             adjusted_time = target_utc + timedelta(seconds=self.time_offset)
-            system_time = datetime.now(timezone.utc)
+            system_time = self._now()
             diff = (adjusted_time - system_time).total_seconds()
 
             # accumulate（add_sample()で追加済みの場合はスキップして二重追加を防ぐ）
@@ -208,7 +224,7 @@ class TimeSynchronizer:
             return False, self._loc_get('admin_required', "管理者権限が必要です")
 
         try:
-            current_time = datetime.now(timezone.utc)
+            current_time = self._now()
             adjusted_time = current_time + timedelta(seconds=offset_seconds)
 
             if self._set_system_time_utc(adjusted_time) == 0:
@@ -0,0 +1,230 @@
+"""
+u-blox UBX バイナリプロトコルパーサー
+- NMEA と同じシリアルストリームから UBX フレーム（0xB5 0x62 ...）を切り出す
+- UBX 以外のバイトは NMEAParser.feed() へそのまま渡す（混在ストリーム対応）
+- NAV-PVT / NAV-TIMEUTC / TIM-TP を復号し、ナノ秒・有効フラグ・qErr 付きの時刻を返す
+"""
+import struct
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from operator import mul
+
+_SYNC = b'\xb5\x62'
+# これを超える長さのフレームは同期語の誤検出とみなす
+_MAX_PAYLOAD = 4096
+
+_NS_PER_SEC = 1_000_000_000
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+# GPS 週番号の起点（TIM-TP の週・TOW → 時刻）
+_GPS_EPOCH_SEC = int((datetime(1980, 1, 6, tzinfo=timezone.utc) - _EPOCH).total_seconds())
+
+_NAV_PVT = struct.Struct('<IHBBBBBBIiBBBB')       # 先頭 24 バイト
+_NAV_TIMEUTC = struct.Struct('<IIiHBBBBBB')       # 20 バイト
+_TIM_TP = struct.Struct('<IIiHBB')                # 16 バイト
+
+# NAV-PVT valid ビット
+PVT_VALID_DATE = 0x01
+PVT_VALID_TIME = 0x02
+PVT_FULLY_RESOLVED = 0x04
+# NAV-TIMEUTC valid ビット
+TIMEUTC_VALID_TOW = 0x01
+TIMEUTC_VALID_WKN = 0x02
+TIMEUTC_VALID_UTC = 0x04
+
+
+@dataclass(frozen=True)
+class UBXTimeFix:
+    """
+    NAV-PVT / NAV-TIMEUTC の時刻。
+    ns は 1970-01-01 UTC からの整数ナノ秒、t_acc_ns は受信機が推定した時刻精度。
+    valid は日付・時刻がそろって確定している時だけ True。
+    top_of_second は秒頭のエポックか。NAV-PVT と NAV-TIMEUTC が同じ秒に両方届いた時は、
+    先に届いた有効な方だけを秒頭とする（時計合わせに使うのは1秒につき1件）。
+    """
+    time: datetime
+    source: str
+    ns: int
+    valid: bool
+    t_acc_ns: int
+    valid_flags: int
+    top_of_second: bool = True
+
+
+@dataclass(frozen=True)
+class UBXTimePulse:
+    """
+    TIM-TP：次のタイムパルスの時刻と量子化誤差。
+    ns はパルス時刻（utc=True なら UTC、False なら GNSS 時刻系）の 1970 起点ナノ秒。
+    q_err_ps はパルスの量子化誤差（ピコ秒）で、パルス時刻の補正に使う。
+    """
+    week: int
+    tow_ms: int
+    tow_sub_ms: int
+    q_err_ps: int
+    flags: int
+    ref_info: int
+    ns: int
+    utc: bool
+
+
+def ubx_checksum(data):
+    """class〜payload の 8bit Fletcher チェックサム (CK_A, CK_B)"""
+    n = len(data)
+    ck_a = sum(data) & 0xFF
+    # CK_B = Σ (n - i) * data[i]（1バイトずつの Python ループを避ける）
+    ck_b = sum(map(mul, data, range(n, 0, -1))) & 0xFF
+    return ck_a, ck_b
+
+
+def _utc_ns(year, month, day, hour, minute, sec, nano):
+    """UTC の各フィールド → (datetime, 1970 起点の整数ns)。範囲外なら None"""
+    if not (1 <= month <= 12 and 1 <= day <= 31 and hour <= 23 and minute <= 59 and sec <= 60):
+        return None
+    if year < 1980 or year > 9999:
+        return None
+    base = datetime(year, month, 1, tzinfo=timezone.utc) + timedelta(
+        days=day - 1, hours=hour, minutes=minute, seconds=sec)
+    ns = int((base - _EPOCH).total_seconds()) * _NS_PER_SEC + nano
+    return base + timedelta(microseconds=nano // 1000), ns
+
+
+class UBXParser:
+    # (class, id) → (ハンドラ名, 必要な最小ペイロード長)
+    MESSAGE_TABLE = {
+        b'\x01\x07': ('_decode_nav_pvt', 92),
+        b'\x01\x21': ('_decode_nav_timeutc', 20),
+        b'\x0d\x01': ('_decode_tim_tp', 16),
+    }
+
+    def __init__(self, nmea_parser=None):
+        """nmea_parser を渡すと UBX 以外のバイトをその feed() へ流し、イベントも合わせて返す"""
+        self.nmea = nmea_parser
+        self._buf = b''
+        self._handlers = {
+            key: (getattr(self, name), min_len)
+            for key, (name, min_len) in self.MESSAGE_TABLE.items()
+        }
+        # accepted / bad_checksum / short / unknown
+        self.stats = Counter()
+        self.last_time_fix = None
+        self.last_time_pulse = None
+        # 最後に秒頭として出した有効な時刻の秒（NMEA 側の last_time_update に相当）
+        self._last_top_second = None
+
+    def feed(self, chunk):
+        """
+        任意長の bytes を受け取り、完成した UBX フレームを復号する。
+        フレームがチャンクをまたいだら次回の feed() でつなぐ。
+        このチャンクで得られたイベント（NMEA 側のイベントを含む）のリストを返す。
+        """
+        buf = self._buf + chunk
+        events = []
+        text = []
+        i = 0
+        n = len(buf)
+        while True:
+            j = buf.find(_SYNC, i)
+            if j < 0:
+                # 末尾の 0xB5 は次チャンクの 0x62 と組になるかもしれないので残す
+                if buf.endswith(b'\xb5'):
+                    text.append(buf[i:n - 1])
+                    i = n - 1
+                else:
+                    text.append(buf[i:])
+                    i = n
+                break
+            text.append(buf[i:j])
+            if n - j < 8:
+                i = j
+                break
+            length = buf[j + 4] | (buf[j + 5] << 8)
+            if length > _MAX_PAYLOAD:
+                i = j + 1
+                continue
+            end = j + 8 + length
+            if n < end:
+                i = j
+                break
+            body = buf[j + 2:end - 2]
+            if ubx_checksum(body) != (buf[end - 2], buf[end - 1]):
+                self.stats['bad_checksum'] += 1
+                i = j + 1
+                continue
+            self.stats['accepted'] += 1
+            self._dispatch(body, events)
+            i = end
+
+        rest = buf[i:]
+        self._buf = rest if len(rest) <= _MAX_PAYLOAD + 8 else b''
+
+        if self.nmea is not None:
+            data = b''.join(text)
+            if data:
+                events.extend(self.nmea.feed(data))
+        return events
+
+    def _dispatch(self, body, events):
+        entry = self._handlers.get(body[0:2])
+        if entry is None:
+            self.stats['unknown'] += 1
+            return
+        handler, min_len = entry
+        if len(body) - 4 < min_len:
+            self.stats['short'] += 1
+            return
+        event = handler(body[4:])
+        if event is not None:
+            events.append(event)
+
+    def _decode_nav_pvt(self, payload):
+        (_itow, year, month, day, hour, minute, sec, valid, t_acc, nano,
+         _fix_type, _flags, _flags2, _num_sv) = _NAV_PVT.unpack_from(payload)
+        decoded = _utc_ns(year, month, day, hour, minute, sec, nano)
+        if decoded is None:
+            self.stats['bad_time'] += 1
+            return None
+        dt, ns = decoded
+        ok = valid & (PVT_VALID_DATE | PVT_VALID_TIME | PVT_FULLY_RESOLVED) == \
+            (PVT_VALID_DATE | PVT_VALID_TIME | PVT_FULLY_RESOLVED)
+        return self._time_fix(dt, 'NAV-PVT', ns, ok, t_acc, valid)
+
+    def _decode_nav_timeutc(self, payload):
+        (_itow, t_acc, nano, year, month, day, hour, minute, sec,
+         valid) = _NAV_TIMEUTC.unpack_from(payload)
+        decoded = _utc_ns(year, month, day, hour, minute, sec, nano)
+        if decoded is None:
+            self.stats['bad_time'] += 1
+            return None
+        dt, ns = decoded
+        ok = bool(valid & TIMEUTC_VALID_UTC)
+        return self._time_fix(dt, 'NAV-TIMEUTC', ns, ok, t_acc, valid)
+
+    def _time_fix(self, dt, source, ns, ok, t_acc, valid):
+        """UBXTimeFix を作る。同じ秒の2件目の有効な秒頭時刻は秒頭扱いにしない"""
+        top = _is_top_of_second(ns)
+        if top and ok:
+            # nano は負にもなるので、秒頭 ±50ms を同じ秒にまとめる
+            second = (ns + _NS_PER_SEC // 2) // _NS_PER_SEC
+            if second == self._last_top_second:
+                top = False
+            else:
+                self._last_top_second = second
+        self.last_time_fix = UBXTimeFix(dt, source, ns, ok, t_acc, valid, top)
+        return self.last_time_fix
+
+    def _decode_tim_tp(self, payload):
+        tow_ms, tow_sub_ms, q_err, week, flags, ref_info = _TIM_TP.unpack_from(payload)
+        # towSubMS は ms の 2^-32 単位
+        sub_ns = (tow_sub_ms * 1_000_000) >> 32
+        ns = (_GPS_EPOCH_SEC + week * 604800) * _NS_PER_SEC + tow_ms * 1_000_000 + sub_ns
+        self.last_time_pulse = UBXTimePulse(week, tow_ms, tow_sub_ms, q_err, flags, ref_info, ns,
+                                            bool(flags & 0x01))
+        return self.last_time_pulse
+
+
+def _is_top_of_second(ns, window_ns=_NS_PER_SEC // 20):
+    """秒頭 ±50ms 以内のエポックか（NAV-PVT の nano は負にもなる）"""
+    frac = ns % _NS_PER_SEC
+    return frac < window_ns or frac > _NS_PER_SEC - window_ns
+